@@ -5,4 +5,5 @@ class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
     def ready(self):
-        import api.models  # Đảm bảo rằng mô hình được tải khi ứng dụng được khởi động
\ No newline at end of file
+        import api.models  # Đảm bảo rằng mô hình được tải khi ứng dụng được khởi động
+        import api.signals  # Đăng ký các signal handler
@@ -2,12 +2,16 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from django.contrib.auth import get_user_model
 from rest_framework.exceptions import AuthenticationFailed
-from api.models.user import User
+from api.services import auth_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 class CustomJWTAuthentication(JWTAuthentication):
+    def get_validated_token(self, raw_token):
+        # Token đã kiểm tra chữ ký được cache tới khi hết hạn (tối đa AUTH_CACHE_TTL)
+        return auth_cache.get_validated_token(raw_token, super().get_validated_token)
+
     def get_user(self, validated_token):
         """
         Attempt to find and return a user using the given validated token.
@@ -19,11 +23,10 @@ class CustomJWTAuthentication(JWTAuthentication):
             logger.error("No user_id found in token")
             raise AuthenticationFailed('No user_id found in token')
 
-        try:
-            # Try to get our custom User directly first
-            user = User.objects.get(user_id=user_id)
-            logger.debug(f"Found custom user: {user}")
-            return user
-        except User.DoesNotExist:
+        # Snapshot user trong cache (LRU + TTL, xóa khi User thay đổi), không truy vấn mỗi request
+        user = auth_cache.get_user(user_id)
+        if user is None:
             logger.error(f"Custom user not found with ID: {user_id}")
             raise AuthenticationFailed('User not found')
+        logger.debug(f"Found custom user: {user}")
+        return user
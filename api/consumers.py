@@ -1,17 +1,81 @@
-import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from .models import ChatRoom, Message, User, ChatRoomParticipant
-from django.db.models import Q
+from .models import ChatRoom
+from .services.chat_membership import MEMBER, NO_ROOM, cached_room_access, get_room_access, normalize_chatroom_id
+from .services.chat_messages import MessageWriter, get_message_buffer
+from .services.chat_read_cursor import mark_read
+from .services.message_history import get_message_history, parse_limit
+from .services.outbound_queue import OutboundQueue
+from .services.realtime import chat_group, has_project_access, participant_group, project_group, user_group
+from .services.typing_state import get_typing_tracker
+from .services.ws_encoding import decode, encode, encode_all, negotiate
 
-class ChatConsumer(AsyncWebsocketConsumer):
+class ChatRoomMixin:
+    """Phần dùng chung của ChatConsumer và UserConsumer: kiểm tra quyền vào phòng, lưu tin nhắn."""
+
+    async def get_room_access(self, user_id, chatroom_id):
+        access = cached_room_access(user_id, chatroom_id)
+        if access is not None:
+            # Cache hit: không cần sang thread pool của database_sync_to_async
+            return access
+        return await database_sync_to_async(get_room_access)(user_id, chatroom_id, use_cache=False)
+
+    async def can_join_room(self, chatroom_id):
+        access = await self.get_room_access(self.user.user_id, chatroom_id)
+        if access == NO_ROOM:
+            return False
+        return access == MEMBER or getattr(self.user, 'role', '') == 'Admin'
+
+    def open_outbound_queue(self):
+        # Hàng đợi gửi có giới hạn, đóng socket nếu client đọc quá chậm (services/outbound_queue.py)
+        self.outbound = OutboundQueue(lambda message: self.send(**message), self.close)
+
+    async def send_frame(self, frame, frames=None, low_priority=False):
+        # frames: bản mã hóa sẵn từ group_send (mã hóa một lần cho cả phòng)
+        if frames and self.encoding in frames:
+            message = frames[self.encoding]
+        else:
+            message = encode(frame, self.encoding)
+        self.outbound.put(message, low_priority)
+
+    async def broadcast_chat_message(self, chatroom_id, message):
+        frame = {
+            'type': 'chat_message',
+            'room': chatroom_id,
+            'message': message
+        }
+        await self.channel_layer.group_send(chat_group(chatroom_id), {
+            'type': 'chat_message',
+            'message': message,
+            'frames': encode_all(frame)
+        })
+
+    async def store_message(self, writer, data):
+        receiver_id = data.get('receiver_id')
+        if self.message_buffer is None:
+            # Phòng và người gửi đã kiểm tra lúc connect / subscribe: chỉ còn 1 câu INSERT
+            return await database_sync_to_async(writer.save)(data.get('content'), receiver_id)
+
+        # Ghi trễ: gán ID + sent_at, broadcast ngay, MessageBuffer sẽ bulk_create sau
+        if not writer.is_warm(receiver_id):
+            await database_sync_to_async(writer.warm)(receiver_id)
+        message, payload = writer.build(data.get('content'), receiver_id)
+        self.message_buffer.add(message)
+        return payload
+
+
+class ChatConsumer(ChatRoomMixin, AsyncWebsocketConsumer):
     async def connect(self):
         # Lấy user từ scope (đã được thêm bởi middleware)
         self.user = self.scope['user']
         
         # Khởi tạo room_name và room_group_name
         self.room_name = self.scope['url_route']['kwargs']['room_name']
-        self.room_group_name = f'chat_{self.room_name}'
+        # Lấy chatroom_id từ room_name, xử lý cả 2 dạng "chat_XXX" và "chat-XXX"
+        chatroom_id = normalize_chatroom_id(self.room_name)
+        self.chatroom_id = chatroom_id
+        # Group theo chatroom_id chuẩn để /ws/chat/ và /ws/user/ nhận chung sự kiện
+        self.room_group_name = chat_group(chatroom_id)
 
         # Debug để xác định các giá trị
         print(f"DEBUG: User: {self.user}, Room Name: {self.room_name}")
@@ -22,27 +86,18 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.close(code=4003)
             return
 
-        # Xử lý ID phòng chat từ URL
-        # Lấy chatroom_id từ room_name, xử lý cả 2 dạng "chat_XXX" và "chat-XXX"
-        if self.room_name.startswith('chat_'):
-            chatroom_id = self.room_name.replace('chat_', 'chat-')
-        elif self.room_name.startswith('chat-'):
-            chatroom_id = self.room_name
-        else:
-            chatroom_id = f'chat-{self.room_name}'
-        
         print(f"DEBUG: Looking for chatroom_id: {chatroom_id}")
         
         try:
-            # Lấy thông tin phòng chat
-            chatroom = await self.get_chatroom(chatroom_id)
-            if not chatroom:
+            # Kiểm tra phòng tồn tại và quyền thành viên (có cache, xem services/chat_membership.py)
+            access = await self.get_room_access(self.user.user_id, chatroom_id)
+            if access == NO_ROOM:
                 print(f"⚠️ WebSocket connection denied: Chatroom {chatroom_id} not found")
                 await self.close(code=4004)
                 return
                 
             # Kiểm tra người dùng có phải là thành viên của phòng hoặc là admin
-            is_member = await self.is_user_in_chatroom(self.user.user_id, chatroom_id)
+            is_member = access == MEMBER
             is_admin = getattr(self.user, 'role', '') == 'Admin'
             
             print(f"DEBUG: User {self.user.user_id} is_member: {is_member}, is_admin: {is_admin}")
@@ -52,52 +107,64 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 await self.close(code=4003)
                 return
                 
+            self.message_writer = MessageWriter(chatroom_id, self.user)
+            # None nếu không bật chế độ ghi trễ (settings.CHAT_WRITE_BEHIND)
+            self.message_buffer = get_message_buffer()
+            self.typing_tracker = get_typing_tracker(self.channel_layer)
+            self.encoding, subprotocol = negotiate(self.scope)
+            
             # Tham gia vào nhóm WebSocket
             await self.channel_layer.group_add(
                 self.room_group_name,
                 self.channel_name
             )
+            # Group riêng của user trong phòng: nhận tín hiệu WebRTC gửi đích danh
+            self.participant_group_name = participant_group(chatroom_id, self.user.user_id)
+            await self.channel_layer.group_add(
+                self.participant_group_name,
+                self.channel_name
+            )
             
-            # Chấp nhận kết nối WebSocket
-            await self.accept()
+            # Chấp nhận kết nối WebSocket (JSON hoặc compact, xem services/ws_encoding.py)
+            await self.accept(subprotocol)
+            self.open_outbound_queue()
             
             print(f"WebSocket connection accepted for user: {self.user.user_id} to room: {chatroom_id}")
             
             # Gửi tin nhắn chào mừng hoặc thông báo trạng thái - SỬA LỖI Ở ĐÂY
-            await self.send(text_data=json.dumps({
+            await self.send_frame({
                 'type': 'connection_established',
                 'message': f'Connected to chat room {chatroom_id}'
-            }))
+            })
             
         except Exception as e:
             print(f"⚠️ Error in connect: {str(e)}")
             await self.close(code=4500)
 
-    @database_sync_to_async
-    def get_chatroom(self, chatroom_id):
-        try:
-            return ChatRoom.objects.get(chatroom_id=chatroom_id)
-        except ChatRoom.DoesNotExist:
-            return None
-            
-    @database_sync_to_async
-    def is_user_in_chatroom(self, user_id, chatroom_id):
-        # Kiểm tra xem người dùng có phải là thành viên của phòng chat hay không
-        return ChatRoomParticipant.objects.filter(
-            user_id=user_id,
-            chatroom_id=chatroom_id
-        ).exists()
-        
     async def disconnect(self, close_code):
+        # Ghi trễ: đảm bảo tin nhắn của socket này đã vào DB trước khi đóng
+        message_buffer = getattr(self, 'message_buffer', None)
+        if message_buffer is not None:
+            await message_buffer.flush()
+        if hasattr(self, 'typing_tracker'):
+            await self.typing_tracker.stop(self.chatroom_id, self.user.user_id)
+        if hasattr(self, 'outbound'):
+            self.outbound.stop()
+        
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
+        if hasattr(self, 'participant_group_name'):
+            await self.channel_layer.group_discard(
+                self.participant_group_name,
+                self.channel_name
+            )
     
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
         try:
-            data = json.loads(text_data)
+            data = decode(text_data, bytes_data)
             message_type = data.get('type')
             if message_type == 'chat_message':
                 await self.handle_chat_message(data)
@@ -105,6 +172,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 await self.handle_mark_read(data)
             elif message_type == 'typing':
                 await self.handle_typing_indicator(data)
+            elif message_type == 'load_history':
+                await self.handle_load_history(data)
             # WebRTC signaling message handling
             elif message_type == 'call_offer':
                 await self.handle_call_offer(data)
@@ -114,49 +183,61 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 await self.handle_ice_candidate(data)
             elif message_type == 'call_end':
                 await self.handle_call_end(data)
-        except json.JSONDecodeError:
+        except ValueError:
             pass
     
     async def handle_chat_message(self, data):
         # Process and save the message
-        message = await self.save_message(data)
+        message = await self.store_message(self.message_writer, data)
+        await self.typing_tracker.stop(self.chatroom_id, self.user.user_id)
         
         # Log for debugging with more information
         print(f"📨 Message saved and broadcasting: {message['message_id']}, content: {message['content']}, to room: {self.room_group_name}, sender: {message['sent_by']}")
         
-        # Send message to room group
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'chat_message',
-                'message': message
-            }
-        )
+        # Send message to room group (frame được mã hóa sẵn một lần cho mọi socket trong phòng)
+        await self.broadcast_chat_message(self.chatroom_id, message)
     
     async def handle_mark_read(self, data):
-        # Mark messages as read
-        await self.mark_messages_read(data)
+        # Dời con trỏ đã đọc của user (1 UPDATE, không phụ thuộc số tin nhắn)
+        last_read_at, last_read_message_id = await self.mark_messages_read(data)
         
         # Send update to room group
         await self.channel_layer.group_send(
             self.room_group_name,
             {
                 'type': 'messages_read',
+                'chatroom_id': self.chatroom_id,
                 'message_ids': data.get('message_ids', []),
-                'user_id': data.get('user_id')
+                'user_id': self.user.user_id,
+                'last_read_at': last_read_at.isoformat(),
+                'last_read_message_id': last_read_message_id
             }
         )
     
+    async def handle_load_history(self, data):
+        # Trả một trang lịch sử tin nhắn cho riêng socket này (cuộn lên để tải thêm)
+        try:
+            page = await self.get_history_page(data)
+        except ValueError as e:
+            await self.send_frame({
+                'type': 'error',
+                'message': str(e)
+            })
+            return
+        
+        await self.send_frame({
+            'type': 'message_history',
+            'request_id': data.get('request_id'),
+            **page
+        })
+    
     async def handle_typing_indicator(self, data):
-        # Send typing indicator to room group
-        await self.channel_layer.group_send(
-            self.room_group_name,
-            {
-                'type': 'typing_indicator',
-                'user_id': data.get('user_id'),
-                'username': data.get('username', 'User'),
-                'is_typing': data.get('is_typing', False)
-            }
+        # Chỉ broadcast khi bắt đầu / dừng gõ, bỏ các sự kiện lặp (xem services/typing_state.py)
+        await self.typing_tracker.update(
+            self.chatroom_id,
+            self.user.user_id,
+            self.user.full_name,
+            data.get('is_typing', False)
         )
 
     # WebRTC Signaling Handlers
@@ -168,9 +249,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         if target_participant_id:
             print(f"📞 Call offer is for specific participant: {target_participant_id}")
-            # Forward the offer only to the specific participant
+            # Gửi thẳng tới socket của participant đó (group riêng), không broadcast cả phòng
             await self.channel_layer.group_send(
-                self.room_group_name,
+                participant_group(self.chatroom_id, target_participant_id),
                 {
                     'type': 'webrtc_offer',
                     'data': data,
@@ -196,9 +277,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         if target_participant_id:
             print(f"📞 Call answer is for specific participant: {target_participant_id}")
-            # Forward the answer only to the specific participant
+            # Gửi thẳng tới socket của participant đó (group riêng), không broadcast cả phòng
             await self.channel_layer.group_send(
-                self.room_group_name,
+                participant_group(self.chatroom_id, target_participant_id),
                 {
                     'type': 'webrtc_answer',
                     'data': data,
@@ -224,9 +305,9 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         if target_participant_id:
             print(f"🧊 ICE candidate is for specific participant: {target_participant_id}")
-            # Forward the ICE candidate only to the specific participant
+            # Gửi thẳng tới socket của participant đó (group riêng), không broadcast cả phòng
             await self.channel_layer.group_send(
-                self.room_group_name,
+                participant_group(self.chatroom_id, target_participant_id),
                 {
                     'type': 'webrtc_ice_candidate',
                     'data': data,
@@ -268,13 +349,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
         
         # Send the offer to the client
         print(f"Sending call offer to user {self.user.user_id}")
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'webrtc_signal',
             'signal_type': 'call_offer',
             'sdp': data.get('sdp'),
             'userId': data.get('userId'),
             'isAudioOnly': data.get('isAudioOnly', False)
-        }))
+        })
 
     async def webrtc_answer(self, event):
         data = event['data']
@@ -287,12 +368,12 @@ class ChatConsumer(AsyncWebsocketConsumer):
             
         # Send the answer to the client
         print(f"Sending call answer to user {self.user.user_id}")
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'webrtc_signal',
             'signal_type': 'call_answer',
             'sdp': data.get('sdp'),
             'userId': data.get('userId')
-        }))
+        })
 
     async def webrtc_ice_candidate(self, event):
         data = event['data']
@@ -305,48 +386,51 @@ class ChatConsumer(AsyncWebsocketConsumer):
             
         # Send the ICE candidate to the client
         print(f"Sending ICE candidate to user {self.user.user_id}")
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'webrtc_signal',
             'signal_type': 'ice_candidate',
             'candidate': data.get('candidate'),
             'userId': data.get('userId')
-        }))
+        })
 
     async def webrtc_call_end(self, event):
         data = event['data']
         
         # Send the call end to all clients
         print(f"Sending call end to user {self.user.user_id}")
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'webrtc_signal',
             'signal_type': 'call_end',
             'userId': data.get('userId')
-        }))
+        })
     
     async def chat_message(self, event):
         print(f"🔔 Sending chat message to client: {event['message'].get('message_id', 'unknown')}")
-        # Send message to WebSocket
-        await self.send(text_data=json.dumps({
+        # Send message to WebSocket (dùng frame đã mã hóa sẵn nếu có)
+        await self.send_frame({
             'type': 'chat_message',
+            'room': event['message'].get('chatroom'),
             'message': event['message']
-        }))
+        }, event.get('frames'))
     
     async def messages_read(self, event):
         # Send message to WebSocket
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'messages_read',
             'message_ids': event['message_ids'],
-            'user_id': event['user_id']
-        }))
+            'user_id': event['user_id'],
+            'last_read_at': event.get('last_read_at'),
+            'last_read_message_id': event.get('last_read_message_id')
+        })
     
     async def typing_indicator(self, event):
         # Send message to WebSocket
-        await self.send(text_data=json.dumps({
+        await self.send_frame({
             'type': 'typing',
             'user_id': event['user_id'],
             'username': event['username'],
             'is_typing': event['is_typing']
-        }))
+        }, low_priority=True)
     
     @database_sync_to_async
     def is_participant(self, chatroom_id, user_id):
@@ -357,49 +441,224 @@ class ChatConsumer(AsyncWebsocketConsumer):
             return False
             
     @database_sync_to_async
-    def save_message(self, data):
-        # Create a new message
-        import uuid
-        message_id = f"msg-{str(uuid.uuid4())[:8]}"
-        
-        # Xử lý chatroom_id từ nhiều nguồn khác nhau
-        chatroom_id = data.get('chatroom_id') or data.get('chatroom') or self.room_name
-        
-        # Nếu chatroom_id bắt đầu bằng 'chat_', chuyển thành 'chat-'
-        if chatroom_id and chatroom_id.startswith('chat_'):
-            chatroom_id = chatroom_id.replace('chat_', 'chat-')
-        elif chatroom_id and not (chatroom_id.startswith('chat_') or chatroom_id.startswith('chat-')):
-            chatroom_id = f"chat-{chatroom_id}"
-        
-        print(f"DEBUG: Saving message to chatroom_id: {chatroom_id}")
-        chatroom = ChatRoom.objects.get(chatroom_id=chatroom_id)
-        
-        # Lấy sender_id từ data hoặc sử dụng người dùng hiện tại
-        sender_id = data.get('sender_id') or self.user.user_id
-        sender = User.objects.get(user_id=sender_id)
-        
-        receiver = None
-        if data.get('receiver_id'):
-            try:
-                receiver = User.objects.get(user_id=data.get('receiver_id'))
-            except User.DoesNotExist:
-                pass
-        
-        message = Message.objects.create(
-            message_id=message_id,
-            content=data.get('content'),
-            chatroom=chatroom,
-            sent_by=sender,
-            receiver=receiver
+    def get_history_page(self, data):
+        return get_message_history(
+            self.chatroom_id,
+            before=data.get('before'),
+            after=data.get('after'),
+            limit=parse_limit(data.get('limit'))
         )
-        
-        # Manually serialize the message
-        from api.serializers.message_serializer import MessageSerializer
-        serializer = MessageSerializer(message)
-        return serializer.data
     
     @database_sync_to_async
     def mark_messages_read(self, data):
-        message_ids = data.get('message_ids', [])
-        if message_ids:
-            Message.objects.filter(message_id__in=message_ids).update(is_read=True)
\ No newline at end of file
+        # Client mới gửi last_read_message_id; client cũ chỉ gửi message_ids -> đánh dấu đọc tới hiện tại
+        return mark_read(self.chatroom_id, self.user.user_id, data.get('last_read_message_id'))
+
+class UserConsumer(ChatRoomMixin, AsyncWebsocketConsumer):
+    """
+    Một WebSocket cho mỗi user (/ws/user/?token=...): xác thực một lần, subscribe nhiều
+    phòng chat / project trên cùng kết nối, nhận thông báo và sự kiện task.
+
+    Client gửi:
+        {"type": "subscribe", "rooms": ["chat-1", ...], "projects": ["prj-1", ...]}
+        {"type": "unsubscribe", "rooms": [...], "projects": [...]}
+        {"type": "chat_message", "room": "chat-1", "content": "...", "receiver_id": null}
+        {"type": "mark_read", "room": "chat-1", "last_read_message_id": "msg-..."}
+        {"type": "typing", "room": "chat-1", "is_typing": true}
+    Server gửi: các frame giống /ws/chat/ kèm "room", cùng với "notification" và "task_event".
+    Gọi video (WebRTC) vẫn dùng /ws/chat/<room>/.
+    """
+
+    async def connect(self):
+        self.user = self.scope['user']
+        if not self.user or hasattr(self.user, 'is_anonymous') and self.user.is_anonymous:
+            print("⚠️ WebSocket connection denied: Anonymous user")
+            await self.close(code=4003)
+            return
+
+        # chatroom_id -> MessageWriter của các phòng đang subscribe
+        self.rooms = {}
+        self.projects = set()
+        self.message_buffer = get_message_buffer()
+        self.typing_tracker = get_typing_tracker(self.channel_layer)
+        self.encoding, subprotocol = negotiate(self.scope)
+        self.user_group_name = user_group(self.user.user_id)
+
+        await self.channel_layer.group_add(self.user_group_name, self.channel_name)
+        await self.accept(subprotocol)
+        self.open_outbound_queue()
+        await self.send_frame({
+            'type': 'connection_established',
+            'user_id': self.user.user_id
+        })
+
+    async def disconnect(self, close_code):
+        if not hasattr(self, 'user_group_name'):
+            return
+        if hasattr(self, 'outbound'):
+            self.outbound.stop()
+        if self.message_buffer is not None:
+            await self.message_buffer.flush()
+        for chatroom_id in self.rooms:
+            await self.typing_tracker.stop(chatroom_id, self.user.user_id)
+
+        groups = [self.user_group_name]
+        groups += [chat_group(chatroom_id) for chatroom_id in self.rooms]
+        groups += [project_group(project_id) for project_id in self.projects]
+        for group in groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
+
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = decode(text_data, bytes_data)
+        except ValueError:
+            return
+
+        message_type = data.get('type')
+        if message_type == 'subscribe':
+            await self.handle_subscribe(data)
+        elif message_type == 'unsubscribe':
+            await self.handle_unsubscribe(data)
+        elif message_type in ('chat_message', 'mark_read', 'typing'):
+            chatroom_id = normalize_chatroom_id(str(data.get('room', '')))
+            if chatroom_id not in self.rooms:
+                await self.send_frame({
+                    'type': 'error',
+                    'room': chatroom_id,
+                    'message': f'Not subscribed to {chatroom_id}'
+                })
+                return
+            if message_type == 'chat_message':
+                await self.handle_chat_message(chatroom_id, data)
+            elif message_type == 'mark_read':
+                await self.handle_mark_read(chatroom_id, data)
+            else:
+                await self.handle_typing(chatroom_id, data)
+
+    async def handle_subscribe(self, data):
+        rooms, projects, denied_rooms, denied_projects = [], [], [], []
+
+        for room in data.get('rooms') or []:
+            chatroom_id = normalize_chatroom_id(str(room))
+            if chatroom_id in self.rooms or await self.can_join_room(chatroom_id):
+                if chatroom_id not in self.rooms:
+                    self.rooms[chatroom_id] = MessageWriter(chatroom_id, self.user)
+                    await self.channel_layer.group_add(chat_group(chatroom_id), self.channel_name)
+                rooms.append(chatroom_id)
+            else:
+                denied_rooms.append(chatroom_id)
+
+        for project_id in data.get('projects') or []:
+            project_id = str(project_id)
+            if project_id in self.projects or await database_sync_to_async(has_project_access)(self.user, project_id):
+                if project_id not in self.projects:
+                    self.projects.add(project_id)
+                    await self.channel_layer.group_add(project_group(project_id), self.channel_name)
+                projects.append(project_id)
+            else:
+                denied_projects.append(project_id)
+
+        await self.send_frame({
+            'type': 'subscribed',
+            'rooms': rooms,
+            'projects': projects,
+            'denied': {'rooms': denied_rooms, 'projects': denied_projects}
+        })
+
+    async def handle_unsubscribe(self, data):
+        rooms, projects = [], []
+        for room in data.get('rooms') or []:
+            chatroom_id = normalize_chatroom_id(str(room))
+            if self.rooms.pop(chatroom_id, None) is not None:
+                await self.typing_tracker.stop(chatroom_id, self.user.user_id)
+                await self.channel_layer.group_discard(chat_group(chatroom_id), self.channel_name)
+                rooms.append(chatroom_id)
+        for project_id in data.get('projects') or []:
+            project_id = str(project_id)
+            if project_id in self.projects:
+                self.projects.discard(project_id)
+                await self.channel_layer.group_discard(project_group(project_id), self.channel_name)
+                projects.append(project_id)
+
+        await self.send_frame({'type': 'unsubscribed', 'rooms': rooms, 'projects': projects})
+
+    async def handle_chat_message(self, chatroom_id, data):
+        message = await self.store_message(self.rooms[chatroom_id], data)
+        await self.broadcast_chat_message(chatroom_id, message)
+        await self.typing_tracker.stop(chatroom_id, self.user.user_id)
+
+    async def handle_mark_read(self, chatroom_id, data):
+        last_read_at, last_read_message_id = await database_sync_to_async(mark_read)(
+            chatroom_id, self.user.user_id, data.get('last_read_message_id')
+        )
+        await self.channel_layer.group_send(chat_group(chatroom_id), {
+            'type': 'messages_read',
+            'chatroom_id': chatroom_id,
+            'message_ids': data.get('message_ids', []),
+            'user_id': self.user.user_id,
+            'last_read_at': last_read_at.isoformat(),
+            'last_read_message_id': last_read_message_id
+        })
+
+    async def handle_typing(self, chatroom_id, data):
+        await self.typing_tracker.update(
+            chatroom_id,
+            self.user.user_id,
+            self.user.full_name,
+            data.get('is_typing', False)
+        )
+
+    # Sự kiện từ group chat_<id>
+    async def chat_message(self, event):
+        await self.send_frame({
+            'type': 'chat_message',
+            'room': event['message'].get('chatroom'),
+            'message': event['message']
+        }, event.get('frames'))
+
+    async def messages_read(self, event):
+        await self.send_frame({
+            'type': 'messages_read',
+            'room': event.get('chatroom_id'),
+            'message_ids': event['message_ids'],
+            'user_id': event['user_id'],
+            'last_read_at': event.get('last_read_at'),
+            'last_read_message_id': event.get('last_read_message_id')
+        })
+
+    async def typing_indicator(self, event):
+        await self.send_frame({
+            'type': 'typing',
+            'room': event.get('chatroom_id'),
+            'user_id': event['user_id'],
+            'username': event['username'],
+            'is_typing': event['is_typing']
+        }, low_priority=True)
+
+    # Tín hiệu gọi video chỉ dành cho /ws/chat/<room>/
+    async def webrtc_offer(self, event):
+        pass
+
+    async def webrtc_answer(self, event):
+        pass
+
+    async def webrtc_ice_candidate(self, event):
+        pass
+
+    async def webrtc_call_end(self, event):
+        pass
+
+    # Sự kiện từ group user_<id> / project_<id>
+    async def notification(self, event):
+        await self.send_frame({
+            'type': 'notification',
+            'notification': event['notification']
+        })
+
+    async def task_event(self, event):
+        await self.send_frame({
+            'type': 'task_event',
+            'action': event['action'],
+            'project_id': event['project_id'],
+            'task': event['task']
+        })
@@ -0,0 +1,167 @@
+# api/local_channel_server.py
+"""
+Server nói giao thức Redis (RESP) tối giản, chạy trong process, dùng thay Redis thật
+khi test / load test channel layer nhiều worker (channels_redis.pubsub.RedisPubSubChannelLayer).
+
+Chỉ hỗ trợ những lệnh mà pubsub channel layer cần: HELLO, PING, ECHO, SELECT, AUTH, CLIENT,
+PUBLISH, SUBSCRIBE, UNSUBSCRIBE, FLUSHDB/FLUSHALL, QUIT. Không lưu dữ liệu.
+Hiểu cả RESP2 và RESP3 (redis-py mới mặc định gửi HELLO 3).
+
+Chạy: python manage.py run_local_channel_server --port 6390
+rồi đặt CHANNEL_LAYER_URL=redis://127.0.0.1:6390/0
+"""
+import asyncio
+
+
+def _encode(value, push=False):
+    """Mã hoá RESP; push=True dùng kiểu push '>' của RESP3 cho frame pub/sub."""
+    if value is None:
+        return b'$-1\r\n'
+    if isinstance(value, int):
+        return b':%d\r\n' % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b'$%d\r\n%s\r\n' % (len(value), value)
+    if isinstance(value, dict):
+        return b'%%%d\r\n' % len(value) + b''.join(
+            _encode(key) + _encode(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        prefix = b'>' if push else b'*'
+        return prefix + b'%d\r\n' % len(value) + b''.join(_encode(item) for item in value)
+    raise TypeError(f'Cannot encode {type(value)!r}')
+
+
+OK = b'+OK\r\n'
+
+
+class LocalChannelServer:
+    def __init__(self, host='127.0.0.1', port=6390):
+        self.host = host
+        self.port = port
+        self._server = None
+        # channel (bytes) -> set các writer đang subscribe
+        self._subscribers = {}
+        # writer -> phiên bản giao thức (2 hoặc 3) của kết nối
+        self._protocols = {}
+        self.published = 0
+        self.delivered = 0
+
+    @property
+    def url(self):
+        return f'redis://{self.host}:{self.port}/0'
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        if not self.port:
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _read_command(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Lệnh inline, ví dụ "PING\r\n" từ redis-cli / telnet
+            return line.strip().split()
+
+        args = []
+        for _ in range(int(line[1:])):
+            header = await reader.readline()
+            length = int(header[1:])
+            data = await reader.readexactly(length + 2)
+            args.append(data[:-2])
+        return args
+
+    async def _handle_client(self, reader, writer):
+        subscriptions = set()
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                if not args:
+                    continue
+                command = args[0].upper()
+                if command == b'QUIT':
+                    writer.write(OK)
+                    break
+                writer.write(self._dispatch(command, args[1:], writer, subscriptions))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscriptions:
+                self._unsubscribe(channel, writer)
+            self._protocols.pop(writer, None)
+            writer.close()
+
+    def _dispatch(self, command, args, writer, subscriptions):
+        push = self._protocols.get(writer) == 3
+        if command == b'HELLO':
+            protocol = int(args[0]) if args else 2
+            if protocol not in (2, 3):
+                return b'-NOPROTO unsupported protocol version\r\n'
+            self._protocols[writer] = protocol
+            info = {'server': 'redis', 'version': '7.0.0', 'proto': protocol, 'mode': 'standalone'}
+            if protocol == 2:
+                return _encode([item for pair in info.items() for item in pair])
+            return _encode(info)
+        if command == b'PING':
+            if subscriptions:
+                return _encode([b'pong', args[0] if args else b''], push)
+            return _encode(args[0]) if args else b'+PONG\r\n'
+        if command == b'ECHO':
+            return _encode(args[0])
+        if command in (b'SELECT', b'AUTH', b'CLIENT', b'FLUSHDB', b'FLUSHALL'):
+            return OK
+        if command == b'PUBLISH':
+            return _encode(self._publish(args[0], args[1]))
+        if command == b'SUBSCRIBE':
+            replies = []
+            for channel in args:
+                subscriptions.add(channel)
+                self._subscribers.setdefault(channel, set()).add(writer)
+                replies.append(_encode([b'subscribe', channel, len(subscriptions)], push))
+            return b''.join(replies)
+        if command == b'UNSUBSCRIBE':
+            channels = args or list(subscriptions)
+            replies = []
+            for channel in channels:
+                subscriptions.discard(channel)
+                self._unsubscribe(channel, writer)
+                replies.append(_encode([b'unsubscribe', channel, len(subscriptions)], push))
+            return b''.join(replies) or _encode([b'unsubscribe', None, 0], push)
+        return b'-ERR unknown command \'%s\'\r\n' % command
+
+    def _publish(self, channel, payload):
+        self.published += 1
+        receivers = list(self._subscribers.get(channel, ()))
+        frames = {}
+        for receiver in receivers:
+            push = self._protocols.get(receiver) == 3
+            if push not in frames:
+                frames[push] = _encode([b'message', channel, payload], push)
+            receiver.write(frames[push])
+        self.delivered += len(receivers)
+        return len(receivers)
+
+    def _unsubscribe(self, channel, writer):
+        receivers = self._subscribers.get(channel)
+        if receivers is not None:
+            receivers.discard(writer)
+            if not receivers:
+                del self._subscribers[channel]
@@ -0,0 +1,98 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.models.chatroom import ChatRoom, ChatRoomParticipant
+from api.models.enterprise import Enterprise
+from api.models.message import Message
+from api.models.user import User
+from api.serializers.message_serializer import MessageSerializer
+from api.services.chat_messages import MessageWriter, new_message_id
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _save_with_lookups(chatroom_id, sender_id, receiver_id, content):
+    """Cách cũ của ChatConsumer.save_message: lấy lại phòng / user rồi serialize, để so sánh."""
+    chatroom = ChatRoom.objects.get(chatroom_id=chatroom_id)
+    sender = User.objects.get(user_id=sender_id)
+    receiver = User.objects.get(user_id=receiver_id)
+    message = Message.objects.create(
+        message_id=new_message_id(), content=content, chatroom=chatroom, sent_by=sender, receiver=receiver
+    )
+    return MessageSerializer(message).data
+
+
+class Command(BaseCommand):
+    help = 'Count queries and time per chat message saved by the WebSocket consumer (data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        try:
+            with transaction.atomic():
+                sender, receiver, chatroom = self._create_room()
+                # Như lúc connect: user đến từ middleware (đã select_related enterprise)
+                sender = User.objects.select_related('enterprise').get(user_id=sender.user_id)
+
+                old_queries, old_elapsed = self._measure(
+                    lambda i: _save_with_lookups(chatroom.chatroom_id, sender.user_id, receiver.user_id, f'old {i}'),
+                    count
+                )
+                writer = MessageWriter(chatroom.chatroom_id, sender)
+                writer.save('warm up', receiver.user_id)
+                new_queries, new_elapsed = self._measure(
+                    lambda i: writer.save(f'new {i}', receiver.user_id), count
+                )
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        for label, queries, elapsed in (
+            ('lookups + serializer', old_queries, old_elapsed),
+            ('MessageWriter', new_queries, new_elapsed),
+        ):
+            self.stdout.write(
+                f'{label:>22}: {queries / count:.2f} queries/message, {elapsed / count * 1e6:.0f} us/message'
+            )
+
+        if new_queries != count:
+            raise CommandError(f'Expected 1 query per message, got {new_queries} for {count} messages')
+        self.stdout.write(self.style.SUCCESS('1 INSERT per message'))
+
+    def _create_room(self):
+        enterprise = Enterprise.objects.create(
+            name='bench', address='-', phone_number='-', email='bench@example.com'
+        )
+        users = []
+        for name in ('sender', 'receiver'):
+            user = User(
+                full_name=f'bench {name}',
+                email=f'bench-{name}-{uuid.uuid4().hex[:8]}@example.com',
+                enterprise=enterprise
+            )
+            user.password = '-'
+            user.save()
+            users.append(user)
+
+        chatroom = ChatRoom.objects.create(
+            chatroom_id=f'chat-{uuid.uuid4().hex[:12]}', name='bench', type='Private', created_by=users[0]
+        )
+        for user in users:
+            ChatRoomParticipant.objects.create(id=f'part-{uuid.uuid4().hex[:12]}', chatroom=chatroom, user=user)
+        return users[0], users[1], chatroom
+
+    def _measure(self, save, count):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for i in range(count):
+                save(i)
+            elapsed = time.perf_counter() - started
+        return len(queries), elapsed
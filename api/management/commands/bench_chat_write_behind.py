@@ -0,0 +1,127 @@
+import asyncio
+import time
+import uuid
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+import api.routing
+from api.models.chatroom import ChatRoom, ChatRoomParticipant
+from api.models.enterprise import Enterprise
+from api.models.message import Message
+from api.models.user import User
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = 'Compare chat message latency / throughput with and without write-behind batching (test data is deleted)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sockets', type=int, default=10, help='Sockets sending concurrently in one room')
+        parser.add_argument('--messages', type=int, default=100, help='Messages sent by each socket')
+        parser.add_argument('--flush-ms', type=int, default=50)
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        enterprise, users, chatroom_id = self._create_room(options['sockets'])
+        expected = options['sockets'] * options['messages']
+        # + 1 tin khởi động mỗi socket
+        persisted = expected + options['sockets']
+        try:
+            for label, write_behind in (('direct INSERT', False), ('write-behind', True)):
+                with override_settings(
+                    CHAT_WRITE_BEHIND=write_behind,
+                    CHAT_WRITE_BEHIND_FLUSH_MS=options['flush_ms'],
+                    CHAT_WRITE_BEHIND_BATCH_SIZE=options['batch_size'],
+                ):
+                    latencies, elapsed = asyncio.run(self._run(users, chatroom_id, options['messages']))
+
+                saved = Message.objects.filter(chatroom_id=chatroom_id).count()
+                Message.objects.filter(chatroom_id=chatroom_id).delete()
+                if saved != persisted:
+                    raise CommandError(f'{label}: {saved}/{persisted} messages persisted')
+
+                latencies.sort()
+                self.stdout.write(
+                    f'{label:>14}: {expected / elapsed:.0f} msg/s, latency ms '
+                    f'p50={_percentile(latencies, 50) * 1000:.2f} '
+                    f'p99={_percentile(latencies, 99) * 1000:.2f} '
+                    f'max={latencies[-1] * 1000:.2f}, persisted {saved}/{persisted}'
+                )
+        finally:
+            enterprise.delete()
+
+    def _create_room(self, count):
+        enterprise = Enterprise.objects.create(
+            name='bench', address='-', phone_number='-', email='bench@example.com'
+        )
+        users = []
+        for i in range(count):
+            user = User(
+                full_name=f'bench {i}',
+                email=f'bench-{i}-{uuid.uuid4().hex[:8]}@example.com',
+                enterprise=enterprise
+            )
+            user.password = '-'
+            user.save()
+            users.append(User.objects.select_related('enterprise').get(user_id=user.user_id))
+
+        chatroom = ChatRoom.objects.create(
+            chatroom_id=f'chat-{uuid.uuid4().hex[:12]}', name='bench', type='Group', created_by=users[0]
+        )
+        ChatRoomParticipant.objects.bulk_create([
+            ChatRoomParticipant(id=f'part-{uuid.uuid4().hex[:12]}', chatroom=chatroom, user=user)
+            for user in users
+        ])
+        return enterprise, users, chatroom.chatroom_id
+
+    async def _run(self, users, chatroom_id, messages):
+        application = URLRouter(api.routing.websocket_urlpatterns)
+        sockets = []
+        for user in users:
+            communicator = WebsocketCommunicator(application, f'/ws/chat/{chatroom_id}/')
+            communicator.scope['user'] = user
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError('WebSocket connect failed')
+            await communicator.receive_json_from()  # connection_established
+            sockets.append(communicator)
+
+        async def round_trip(communicator, content):
+            started = time.perf_counter()
+            await communicator.send_json_to({'type': 'chat_message', 'content': content})
+            # Chờ tới khi chính tin này quay về (bỏ qua tin của socket khác)
+            while True:
+                frame = await communicator.receive_json_from(timeout=10)
+                if frame.get('type') == 'chat_message' and frame['message']['content'] == content:
+                    return time.perf_counter() - started
+
+        async def drain(communicator):
+            while not await communicator.receive_nothing(timeout=0.05):
+                await communicator.receive_output()
+
+        # Tin đầu tiên của mỗi socket (dựng payload người gửi) không tính vào kết quả
+        await asyncio.gather(*(round_trip(communicator, f'warm {index}') for index, communicator in enumerate(sockets)))
+        await asyncio.gather(*(drain(communicator) for communicator in sockets))
+
+        latencies = []
+
+        async def send_all(index, communicator):
+            for i in range(messages):
+                latencies.append(await round_trip(communicator, f'{index}:{i}'))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send_all(index, communicator) for index, communicator in enumerate(sockets)))
+        elapsed = time.perf_counter() - started
+
+        for communicator in sockets:
+            await communicator.disconnect()
+        return latencies, elapsed
@@ -0,0 +1,106 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models.chatroom import ChatRoom, ChatRoomParticipant
+from api.models.enterprise import Enterprise
+from api.models.message import Message
+from api.models.user import User
+from api.views.chatroom_views import ChatRoomViewSet
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Check that GET /api/chatrooms/ runs a constant number of queries as the room count grows (data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000', help='Comma separated room counts')
+        parser.add_argument('--messages', type=int, default=3, help='Messages per room')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        results = []
+
+        try:
+            with transaction.atomic():
+                owner, other = self._create_users()
+                created = 0
+                for size in sizes:
+                    self._create_rooms(owner, other, size - created, options['messages'])
+                    created = size
+                    results.append((size, *self._measure(owner)))
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        for size, queries, elapsed in results:
+            self.stdout.write(f'{size:>6} rooms: {queries} queries, {elapsed * 1000:.1f} ms')
+
+        # SQLite chia các danh sách IN (...) lớn thành nhiều truy vấn, không phải N+1
+        max_params = connection.features.max_query_params
+        baseline = results[0][1]
+        for size, queries, _ in results:
+            allowed = baseline + (2 * (size // max_params) if max_params else 0)
+            if queries > allowed:
+                raise CommandError(f'Query count grows with the number of rooms (N+1): {queries} at {size} rooms')
+        self.stdout.write(self.style.SUCCESS('Query count is constant'))
+
+    def _create_users(self):
+        enterprise = Enterprise.objects.create(
+            name='bench', address='-', phone_number='-', email='bench@example.com'
+        )
+        users = []
+        for name in ('owner', 'other'):
+            user = User(
+                full_name=f'bench {name}',
+                email=f'bench-{name}-{uuid.uuid4().hex[:8]}@example.com',
+                enterprise=enterprise
+            )
+            user.password = '-'
+            user.save()
+            users.append(user)
+        return users
+
+    def _create_rooms(self, owner, other, count, messages_per_room):
+        rooms = [
+            ChatRoom(chatroom_id=f'chat-{uuid.uuid4().hex[:12]}', name='bench', type='Private', created_by=owner)
+            for _ in range(count)
+        ]
+        ChatRoom.objects.bulk_create(rooms, batch_size=500)
+
+        participants = []
+        messages = []
+        for room in rooms:
+            for user in (owner, other):
+                participants.append(ChatRoomParticipant(
+                    id=f'part-{uuid.uuid4().hex[:12]}', chatroom=room, user=user
+                ))
+            for i in range(messages_per_room):
+                messages.append(Message(
+                    message_id=f'msg-{uuid.uuid4().hex[:12]}', content=f'message {i}',
+                    chatroom=room, sent_by=other if i % 2 else owner
+                ))
+        ChatRoomParticipant.objects.bulk_create(participants, batch_size=500)
+        Message.objects.bulk_create(messages, batch_size=500)
+
+    def _measure(self, user):
+        view = ChatRoomViewSet.as_view({'get': 'list'})
+        request = APIRequestFactory().get('/api/chatrooms/')
+        force_authenticate(request, user=user)
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = view(request)
+            response.render()
+            elapsed = time.perf_counter() - started
+
+        if response.status_code != 200:
+            raise CommandError(f'Unexpected status {response.status_code}')
+        return len(queries), elapsed
@@ -0,0 +1,94 @@
+import statistics
+import threading
+import time
+import uuid
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from api.models.enterprise import Enterprise
+from api.models.user import User
+from api.services import password_hashing
+from api.views.auth_view import LoginView
+
+
+class Command(BaseCommand):
+    help = 'Login throughput (bcrypt in the password hashing pool) for several pool sizes (bench user is deleted)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', default='1,2,4,8', help='Comma separated PASSWORD_HASH_WORKERS values')
+        parser.add_argument('--requests', type=int, default=64)
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent login requests (request threads)')
+        parser.add_argument('--queue-size', type=int, default=None, help='PASSWORD_HASH_QUEUE_SIZE (default: settings)')
+        parser.add_argument('--rounds', type=int, default=None, help='bcrypt cost (default: PASSWORD_BCRYPT_ROUNDS)')
+
+    def handle(self, *args, **options):
+        rounds = options['rounds'] or settings.PASSWORD_BCRYPT_ROUNDS
+        queue_size = options['queue_size'] or settings.PASSWORD_HASH_QUEUE_SIZE
+        password = 'bench-password'
+
+        with override_settings(PASSWORD_BCRYPT_ROUNDS=rounds):
+            # Các thread request dùng connection riêng nên user phải được commit, xóa ở cuối
+            enterprise = Enterprise.objects.create(
+                name='bench', address='-', phone_number='-', email='bench@example.com'
+            )
+            user = User(full_name='bench login', email=f'bench-{uuid.uuid4().hex[:8]}@example.com', enterprise=enterprise)
+            user.set_password(password)
+            user.save()
+
+            try:
+                self.stdout.write(f'bcrypt cost {rounds}, {options["requests"]} logins, '
+                                  f'{options["concurrency"]} concurrent, queue size {queue_size}')
+                for workers in [int(w) for w in options['workers'].split(',')]:
+                    with override_settings(PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_QUEUE_SIZE=queue_size):
+                        password_hashing.reset_pool()
+                        self._run(workers, user.email, password, options['requests'], options['concurrency'])
+            finally:
+                password_hashing.reset_pool()
+                enterprise.delete()
+
+    def _run(self, workers, email, password, total, concurrency):
+        # LoginView là view async: mỗi thread request chạy nó trong event loop riêng
+        view = async_to_sync(LoginView.as_view())
+        factory = APIRequestFactory()
+        remaining = iter(range(total))
+        lock = threading.Lock()
+        latencies, statuses = [], []
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    request = factory.post('/api/login/', {'email': email, 'password': password}, format='json')
+                    started = time.perf_counter()
+                    response = view(request)
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        ok = statuses.count(200)
+        rejected = statuses.count(429)
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f'{workers:>3} workers: {ok / elapsed:7.1f} logins/s, 429: {rejected}, '
+            f'other: {len(statuses) - ok - rejected}, '
+            f'p50 {statistics.median(latencies) * 1000:.0f} ms, p99 {p99 * 1000:.0f} ms'
+        )
@@ -0,0 +1,213 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User as AuthUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from api.models.calendar import Calendar
+from api.models.chatroom import ChatRoom
+from api.models.enterprise import Enterprise
+from api.models.message import Message
+from api.models.notification import Notification
+from api.models.project import Project
+from api.models.task import Task
+from api.models.task_category import TaskCategory
+from api.models.user import User
+from api.views.task_view import get_user_tasks
+
+PREFIX = 'bench-'
+BATCH_SIZE = 10000
+
+
+def _delete(queryset):
+    # DELETE trực tiếp: delete() của Django sẽ load từng dòng (hàng triệu dòng) để xử lý cascade
+    return queryset._raw_delete(queryset.db)
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with synthetic rows (1M tasks, 10M messages by default) and show EXPLAIN + timing '
+        'for the hot list queries, checking that each one uses its composite index. '
+        'Bench rows are deleted afterwards unless --keep is given (a kept data set is reused by the next run).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument('--messages', type=int, default=10_000_000)
+        parser.add_argument('--notifications', type=int, default=1_000_000)
+        parser.add_argument('--events', type=int, default=1_000_000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--rooms', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query for timing')
+        parser.add_argument('--keep', action='store_true', help='Keep the bench rows for the next run')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(42)
+        if Enterprise.objects.filter(email=f'{PREFIX}plans@example.com').exists():
+            self.stdout.write('Reusing bench rows from a previous --keep run')
+        else:
+            self._fill(options)
+            self._analyze()
+
+        try:
+            missing = self._explain_all(options['repeat'])
+        finally:
+            if not options['keep']:
+                self._cleanup()
+
+        if missing:
+            raise CommandError(f'Index not used by: {", ".join(missing)}')
+        self.stdout.write(self.style.SUCCESS('All queries use their composite index'))
+
+    # ----- dữ liệu giả -----
+
+    def _bulk(self, model, total, build):
+        started = time.perf_counter()
+        for offset in range(0, total, BATCH_SIZE):
+            model.objects.bulk_create([build(i) for i in range(offset, min(offset + BATCH_SIZE, total))])
+            if offset and offset % (BATCH_SIZE * 50) == 0:
+                self.stdout.write(f'  {model.__name__}: {offset:,}/{total:,}')
+        self.stdout.write(f'{model.__name__}: {total:,} rows in {time.perf_counter() - started:.0f}s')
+
+    def _fill(self, options):
+        rng = self.rng
+        today = timezone.now().date()
+        now = timezone.now()
+
+        enterprise = Enterprise.objects.create(
+            name='bench', address='-', phone_number='-', email=f'{PREFIX}plans@example.com'
+        )
+        self._bulk(User, options['users'], lambda i: User(
+            user_id=f'{PREFIX}user-{i}', full_name=f'bench {i}', email=f'{PREFIX}{i}@example.com',
+            password='-', enterprise=enterprise
+        ))
+        # Notification.sent_to trỏ tới django.contrib.auth User
+        self._bulk(AuthUser, options['users'], lambda i: AuthUser(username=f'{PREFIX}{i}'))
+        auth_ids = list(AuthUser.objects.filter(username__startswith=PREFIX).values_list('id', flat=True))
+
+        self._bulk(Project, options['projects'], lambda i: Project(
+            project_id=f'{PREFIX}prj-{i}', project_name=f'bench {i}', start_date=today
+        ))
+        self._bulk(TaskCategory, options['projects'], lambda i: TaskCategory(
+            id=f'{PREFIX}cat-{i}', name='bench', project_id=f'{PREFIX}prj-{i}'
+        ))
+
+        users, projects = options['users'], options['projects']
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+
+        def task(i):
+            project = rng.randrange(projects)
+            return Task(
+                task_id=f'{PREFIX}task-{i}', task_name=f'bench task {i}',
+                status=rng.choice(statuses), priority=rng.choice(priorities),
+                due_date=today + timedelta(days=rng.randint(-60, 60)),
+                project_id=f'{PREFIX}prj-{project}', category_id=f'{PREFIX}cat-{project}',
+                assignee_id=f'{PREFIX}user-{rng.randrange(users)}'
+            )
+        self._bulk(Task, options['tasks'], task)
+
+        rooms = options['rooms']
+        self._bulk(ChatRoom, rooms, lambda i: ChatRoom(
+            chatroom_id=f'{PREFIX}chat-{i}', name='bench', type='Private', created_by_id=f'{PREFIX}user-{i % users}'
+        ))
+        self._bulk(Message, options['messages'], lambda i: Message(
+            message_id=f'{PREFIX}msg-{i}', content='bench', chatroom_id=f'{PREFIX}chat-{rng.randrange(rooms)}',
+            sent_by_id=f'{PREFIX}user-{rng.randrange(users)}',
+            sent_at=now - timedelta(seconds=options['messages'] - i)
+        ))
+        self._bulk(Notification, options['notifications'], lambda i: Notification(
+            title='bench', message='bench', sent_to_id=rng.choice(auth_ids)
+        ))
+        self._bulk(Calendar, options['events'], lambda i: Calendar(
+            event_id=f'{PREFIX}evt-{i}', title='bench', type='MEETING',
+            start=now + timedelta(hours=rng.randint(-24 * 90, 24 * 90)), end=now + timedelta(days=91),
+            user_id=f'{PREFIX}user-{rng.randrange(users)}', project_id=f'{PREFIX}prj-{rng.randrange(projects)}'
+        ))
+
+    def _analyze(self):
+        # Cập nhật thống kê để planner thấy phân bố dữ liệu mới
+        tables = [model._meta.db_table for model in (Task, Message, Notification, Calendar)]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute(f'ANALYZE TABLE {", ".join(tables)}')
+                cursor.fetchall()
+            elif connection.vendor == 'postgresql':
+                for table in tables:
+                    cursor.execute(f'ANALYZE {table}')
+            elif connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    def _cleanup(self):
+        auth_ids = list(AuthUser.objects.filter(username__startswith=PREFIX).values_list('id', flat=True))
+        _delete(Notification.objects.filter(sent_to_id__in=auth_ids))
+        _delete(Message.objects.filter(message_id__startswith=PREFIX))
+        _delete(ChatRoom.objects.filter(chatroom_id__startswith=PREFIX))
+        _delete(Calendar.objects.filter(event_id__startswith=PREFIX))
+        _delete(Task.objects.filter(task_id__startswith=PREFIX))
+        _delete(TaskCategory.objects.filter(id__startswith=PREFIX))
+        _delete(Project.objects.filter(project_id__startswith=PREFIX))
+        _delete(AuthUser.objects.filter(id__in=auth_ids))
+        _delete(User.objects.filter(user_id__startswith=PREFIX))
+        _delete(Enterprise.objects.filter(email=f'{PREFIX}plans@example.com'))
+        self.stdout.write('Bench rows deleted')
+
+    # ----- EXPLAIN + thời gian -----
+
+    def _queries(self):
+        today = timezone.now().date()
+        now = timezone.now()
+        user_id = f'{PREFIX}user-1'
+        project_id = f'{PREFIX}prj-1'
+        auth_id = AuthUser.objects.filter(username=f'{PREFIX}1').values_list('id', flat=True).first()
+        return [
+            # (endpoint, queryset, index cần dùng)
+            ('GET /tasks/?project_id=', Task.objects.filter(project_id=project_id).order_by('-created_at')[:50],
+             'task_project_created_idx'),
+            ('GET /tasks/?project_id=&status=',
+             Task.objects.filter(project_id=project_id, status='In Progress').order_by('-created_at')[:50],
+             'task_project_status_idx'),
+            ('GET /tasks/user/{id}/pending/', get_user_tasks(user_id=user_id, status='Pending'),
+             'task_assignee_status_idx'),
+            ('GET /tasks/user/{id}/overdue/', get_user_tasks(user_id=user_id).filter(due_date__lt=today),
+             'task_assignee_status_idx'),
+            ('GET /notifications/', Notification.objects.filter(sent_to_id=auth_id).order_by('-sent_date')[:50],
+             'notif_sent_to_date_idx'),
+            ('GET /chatrooms/{id}/messages/',
+             Message.objects.filter(chatroom_id=f'{PREFIX}chat-1').order_by('-sent_at', '-message_id')[:50],
+             'msg_room_sent_idx'),
+            ('GET /calendar/events/my-events', Calendar.objects.filter(user_id=user_id).order_by('start'),
+             'cal_user_start_idx'),
+            ('GET /calendar/events/project/{id}', Calendar.objects.filter(project_id=project_id).order_by('start'),
+             'cal_project_start_idx'),
+            ('GET /calendar/events/upcoming',
+             Calendar.objects.filter(start__range=[now, now + timedelta(days=7)]).order_by('start'),
+             'cal_start_idx'),
+        ]
+
+    def _explain_all(self, repeat):
+        missing = []
+        for label, queryset, index in self._queries():
+            plan = queryset.explain()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                rows = len(list(queryset.all()))
+                timings.append((time.perf_counter() - started) * 1000)
+
+            used = index in plan
+            if not used:
+                missing.append(label)
+            mark = self.style.SUCCESS('uses') if used else self.style.ERROR('MISSING')
+            self.stdout.write(
+                f'\n{label}: {rows} rows, median {statistics.median(timings):.2f} ms, '
+                f'max {max(timings):.2f} ms - {mark} {index}'
+            )
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+        return missing
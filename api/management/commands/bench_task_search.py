@@ -0,0 +1,116 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models.project import Project
+from api.models.task import Task
+from api.models.task_category import TaskCategory
+from api.services import task_search
+
+PREFIX = 'bench-search-'
+BATCH_SIZE = 10000
+WORDS = [
+    'thiết', 'kế', 'giao', 'diện', 'kiểm', 'thử', 'triển', 'khai', 'báo', 'cáo', 'đăng', 'nhập',
+    'api', 'database', 'migration', 'frontend', 'backend', 'deploy', 'review', 'refactor', 'bug',
+    'payment', 'invoice', 'dashboard', 'notification', 'calendar', 'upload', 'export', 'import',
+]
+
+
+def _delete(queryset):
+    return queryset._raw_delete(queryset.db)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare ?search= with icontains against the task search index on synthetic tasks (1M by default). '
+        'Bench rows are deleted afterwards unless --keep is given'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=1_000_000)
+        parser.add_argument('--vocabulary', type=int, default=20000, help='Distinct synthetic words')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per query for timing')
+        parser.add_argument('--keep', action='store_true', help='Keep the bench rows for the next run')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(42)
+        self.vocabulary = WORDS + [f'w{i:05d}' for i in range(options['vocabulary'])]
+        project_id = f'{PREFIX}prj'
+
+        if not Project.objects.filter(project_id=project_id).exists():
+            self._fill(project_id, options['tasks'])
+
+        try:
+            self._build_index()
+            self._compare(options['repeat'])
+        finally:
+            if not options['keep']:
+                self._cleanup(project_id)
+            # Xóa bằng SQL trực tiếp không qua signal
+            task_search.reset()
+
+    def _fill(self, project_id, total):
+        rng, vocabulary = self.rng, self.vocabulary
+        Project.objects.create(project_id=project_id, project_name='bench', start_date=timezone.now().date())
+        TaskCategory.objects.create(id=f'{PREFIX}cat', name='bench', project_id=project_id)
+
+        # Phân bố Zipf như văn bản thật: vài từ rất phổ biến, đa số hiếm
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+        def words(count):
+            return ' '.join(rng.choices(vocabulary, cum_weights=cum_weights, k=count))
+
+        started = time.perf_counter()
+        for offset in range(0, total, BATCH_SIZE):
+            Task.objects.bulk_create([
+                Task(task_id=f'{PREFIX}task-{i}', task_name=words(rng.randint(3, 8)), description=words(rng.randint(10, 40)),
+                     project_id=project_id, category_id=f'{PREFIX}cat')
+                for i in range(offset, min(offset + BATCH_SIZE, total))
+            ])
+        self.stdout.write(f'Task: {total:,} rows in {time.perf_counter() - started:.0f}s')
+
+    def _build_index(self):
+        started = time.perf_counter()
+        backend = task_search.backend()
+        if backend == 'mysql':
+            task_search.ensure_fulltext_index()
+        elif backend == 'memory':
+            task_search.memory_index().build()
+        self.stdout.write(f'Backend {backend}: index ready in {time.perf_counter() - started:.1f}s')
+
+    def _cleanup(self, project_id):
+        _delete(Task.objects.filter(project_id=project_id))
+        _delete(TaskCategory.objects.filter(project_id=project_id))
+        _delete(Project.objects.filter(project_id=project_id))
+        self.stdout.write('Bench rows deleted')
+
+    def _time(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = run()
+            timings.append((time.perf_counter() - started) * 1000)
+        return rows, statistics.median(timings)
+
+    def _compare(self, repeat):
+        # Từ cuối được khớp theo tiền tố ('w0123' -> w01230..w01239, 'dash' -> dashboard)
+        queries = ['thiết kế', 'api deploy', 'w00042', 'payment invoice', 'w0123', 'dash', 'notification w00007']
+        tasks = Task.objects.filter(task_id__startswith=PREFIX).order_by('-created_at')
+        self.stdout.write(f'{"query":<24}{"icontains":>14}{"index filter":>16}{"ranked top 20":>16}')
+        for query in queries:
+            # Hành vi cũ: icontains cả chuỗi trên task_name / description
+            scan = tasks.filter(Q(task_name__icontains=query) | Q(description__icontains=query))
+            scan_rows, scan_ms = self._time(repeat, lambda: len(list(scan[:50])))
+            index_rows, index_ms = self._time(
+                repeat, lambda: len(list(task_search.filter_queryset(tasks, query)[:50]))
+            )
+            _, ranked_ms = self._time(repeat, lambda: len(task_search.search(tasks, query, limit=20)))
+            self.stdout.write(
+                f'{query:<24}{scan_ms:>9.1f} ms{"":>2}{index_ms:>11.1f} ms{"":>2}{ranked_ms:>11.1f} ms'
+                f'   ({scan_rows} / {index_rows} rows)'
+            )
@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services import ws_encoding
+from api.services.ws_encoding import COMPACT, JSON, encode, encode_all
+
+
+def _sample_user(index):
+    # Cùng dạng với UserSerializer (kèm enterprise lồng bên trong)
+    return {
+        'user_id': f'user-{index}',
+        'full_name': f'Nguyễn Văn {index}',
+        'email': f'user{index}@example.com',
+        'role': 'Employee',
+        'department': 'Engineering',
+        'gender': 'Male',
+        'birth_date': '1995-04-12',
+        'phone': '0901234567',
+        'province': 'Hồ Chí Minh',
+        'district': 'Quận 1',
+        'address': '123 Lê Lợi',
+        'position': 'Developer',
+        'avatar': f'/media/avatars/user-{index}.png',
+        'created_at': '2025-01-10T08:00:00Z',
+        'enterprise': {
+            'enterprise_id': 'ent-1',
+            'name': 'Công ty ABC',
+            'address': '1 Nguyễn Huệ',
+            'phone_number': '0281234567',
+            'email': 'contact@abc.vn',
+            'industry': 'Software',
+            'created_at': '2024-06-01T00:00:00Z',
+        },
+    }
+
+
+def _sample_frame(content_length):
+    return {
+        'type': 'chat_message',
+        'room': 'chat-1a2b3c4d',
+        'message': {
+            'message_id': 'msg-1a2b3c4d',
+            'content': 'x' * content_length,
+            'attachment_url': None,
+            'attachment_type': None,
+            'is_read': False,
+            'sent_at': '2025-05-20T10:15:30.123456Z',
+            'chatroom': 'chat-1a2b3c4d',
+            'sent_by': _sample_user(1),
+            'receiver': None,
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare bytes on the wire and encode CPU of chat broadcast frames: JSON per socket vs encode-once JSON / compact'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sockets', type=int, default=50, help='Sockets in the room receiving each message')
+        parser.add_argument('--messages', type=int, default=2000)
+        parser.add_argument('--content-length', type=int, default=80)
+
+    def handle(self, *args, **options):
+        if ws_encoding.msgpack is None:
+            raise CommandError('msgpack is not installed (pip install msgpack)')
+
+        frame = _sample_frame(options['content_length'])
+        sockets, messages = options['sockets'], options['messages']
+
+        json_bytes = len(encode(frame, JSON)['text_data'].encode('utf-8'))
+        compact_bytes = len(encode(frame, COMPACT)['bytes_data'])
+        self.stdout.write(f'bytes per frame: json={json_bytes}, compact={compact_bytes} '
+                          f'({compact_bytes / json_bytes:.0%} of json)')
+
+        # Trước đây: mỗi consumer trong phòng tự json.dumps frame của mình
+        started = time.perf_counter()
+        for _ in range(messages):
+            for _ in range(sockets):
+                encode(frame, JSON)
+        per_socket = time.perf_counter() - started
+
+        # Bây giờ: mã hóa một lần (cả JSON và compact) cho mỗi group_send
+        started = time.perf_counter()
+        for _ in range(messages):
+            encode_all(frame)
+        once = time.perf_counter() - started
+
+        self.stdout.write(f'encode CPU for {messages} messages x {sockets} sockets:')
+        self.stdout.write(f'  json per socket:        {per_socket * 1000:.1f} ms '
+                          f'({per_socket / messages * 1e6:.1f} us/message)')
+        self.stdout.write(f'  encode once (json+compact): {once * 1000:.1f} ms '
+                          f'({once / messages * 1e6:.1f} us/message)')
+        self.stdout.write(f'wire bytes per message to the room: json={json_bytes * sockets}, '
+                          f'compact={compact_bytes * sockets}')
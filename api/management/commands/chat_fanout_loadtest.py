@@ -0,0 +1,207 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.local_channel_server import LocalChannelServer
+
+
+def _make_layer(url):
+    """Channel layer cho một process: Redis pub/sub nếu có url, ngược lại dùng cấu hình CHANNEL_LAYERS."""
+    if url:
+        try:
+            from channels_redis.pubsub import RedisPubSubChannelLayer
+        except ImportError:
+            raise CommandError('channels-redis is required for a Redis channel layer (pip install channels-redis)')
+        return RedisPubSubChannelLayer(hosts=[url])
+
+    from channels.layers import get_channel_layer
+    return get_channel_layer()
+
+
+async def _receive_all(layer, groups, expected, timeout, on_ready):
+    """
+    Giả lập các socket: mỗi phần tử của `groups` là một socket tham gia group đó.
+    Trả về (danh sách độ trễ (giây), số message bị mất).
+    """
+    channels = []
+    for group in groups:
+        channel = await layer.new_channel()
+        await layer.group_add(group, channel)
+        channels.append(channel)
+    # Chờ lệnh SUBSCRIBE tới server trước khi báo sẵn sàng
+    await asyncio.sleep(0.2)
+    on_ready()
+
+    latencies = []
+
+    async def consume(channel):
+        received = 0
+        try:
+            while received < expected:
+                message = await asyncio.wait_for(layer.receive(channel), timeout)
+                latencies.append(time.time() - message['sent_at'])
+                received += 1
+        except asyncio.TimeoutError:
+            pass
+        return expected - received
+
+    lost = await asyncio.gather(*(consume(channel) for channel in channels))
+    return latencies, sum(lost)
+
+
+def _worker(url, groups, expected, timeout, ready, results):
+    async def main():
+        layer = _make_layer(url)
+        outcome = await _receive_all(layer, groups, expected, timeout, ready.set)
+        if hasattr(layer, 'flush'):
+            await layer.flush()
+        return outcome
+
+    results.put(asyncio.run(main()))
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = 'Measure chat message fan-out latency through the channel layer across N worker processes and M sockets per room'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Receiver processes (ASGI workers)')
+        parser.add_argument('--rooms', type=int, default=1, help='Number of chat rooms (groups)')
+        parser.add_argument('--sockets', type=int, default=50, help='Connected sockets per room, spread over the workers')
+        parser.add_argument('--messages', type=int, default=100, help='Messages sent to each room')
+        parser.add_argument('--rate', type=float, default=0, help='Messages per second per room (0 = as fast as possible)')
+        parser.add_argument('--timeout', type=float, default=5, help='Seconds a socket waits for the next message')
+        parser.add_argument('--url', help='Redis URL of the channel layer (default: CHANNEL_LAYER_URL)')
+        parser.add_argument('--local-server', action='store_true', help='Start the in-process Redis stand-in and use it')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        url = options['url'] or getattr(settings, 'CHANNEL_LAYER_URL', None)
+
+        server = None
+        if options['local_server']:
+            server, url = self._start_local_server()
+
+        if not url and workers > 1:
+            raise CommandError(
+                'InMemoryChannelLayer cannot fan out across processes: '
+                'set CHANNEL_LAYER_URL, pass --url or use --local-server'
+            )
+
+        groups = [f'chat_loadtest_{room}' for room in range(options['rooms'])]
+        assignments = [[] for _ in range(workers)]
+        for group in groups:
+            for socket in range(options['sockets']):
+                assignments[socket % workers].append(group)
+
+        started = time.perf_counter()
+        if url:
+            latencies, lost = self._run_processes(url, groups, assignments, options)
+        else:
+            latencies, lost = asyncio.run(self._run_in_process(groups, assignments[0], options))
+        elapsed = time.perf_counter() - started
+
+        self._report(latencies, lost, elapsed, url, workers, options)
+        if server is not None:
+            self.stdout.write(f'local server: published={server.published} delivered={server.delivered}')
+
+    def _start_local_server(self):
+        server = LocalChannelServer(port=0)
+        started = threading.Event()
+
+        def run():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(server.start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=run, daemon=True).start()
+        started.wait(5)
+        return server, server.url
+
+    def _run_processes(self, url, groups, assignments, options):
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        ready_events = []
+        processes = []
+        for worker_groups in assignments:
+            ready = context.Event()
+            process = context.Process(
+                target=_worker,
+                args=(url, worker_groups, options['messages'], options['timeout'], ready, results)
+            )
+            process.start()
+            ready_events.append(ready)
+            processes.append(process)
+
+        for ready in ready_events:
+            if not ready.wait(30):
+                raise CommandError('Worker did not become ready in time')
+
+        asyncio.run(self._send(_make_layer(url), groups, options))
+
+        latencies, lost = [], 0
+        for _ in processes:
+            worker_latencies, worker_lost = results.get()
+            latencies.extend(worker_latencies)
+            lost += worker_lost
+        for process in processes:
+            process.join()
+        return latencies, lost
+
+    async def _run_in_process(self, groups, socket_groups, options):
+        layer = _make_layer(None)
+        ready = asyncio.Event()
+        receiver = asyncio.ensure_future(
+            _receive_all(layer, socket_groups, options['messages'], options['timeout'], ready.set)
+        )
+        await ready.wait()
+        await self._send(layer, groups, options)
+        return await receiver
+
+    async def _send(self, layer, groups, options):
+        interval = 1 / options['rate'] if options['rate'] else 0
+        payload = {
+            'message_id': 'msg-loadtest',
+            'content': 'x' * 200,
+            'sent_by': {'user_id': 'user-loadtest', 'full_name': 'Load Test'},
+        }
+        for sequence in range(options['messages']):
+            for group in groups:
+                await layer.group_send(group, {
+                    'type': 'chat_message',
+                    'sequence': sequence,
+                    'sent_at': time.time(),
+                    'message': payload,
+                })
+            if interval:
+                await asyncio.sleep(interval)
+
+    def _report(self, latencies, lost, elapsed, url, workers, options):
+        latencies.sort()
+        expected = options['rooms'] * options['sockets'] * options['messages']
+        to_ms = 1000
+
+        self.stdout.write(f"backend: {'redis pubsub ' + url if url else 'in-memory'}, workers: {workers}")
+        self.stdout.write(
+            f"rooms: {options['rooms']}, sockets/room: {options['sockets']}, messages/room: {options['messages']}"
+        )
+        self.stdout.write(f'deliveries: {len(latencies)}/{expected} (lost {lost}) in {elapsed:.2f}s '
+                          f'= {len(latencies) / elapsed:.0f}/s')
+        self.stdout.write(
+            'latency ms: '
+            f'p50={_percentile(latencies, 50) * to_ms:.2f} '
+            f'p95={_percentile(latencies, 95) * to_ms:.2f} '
+            f'p99={_percentile(latencies, 99) * to_ms:.2f} '
+            f'max={(latencies[-1] if latencies else 0) * to_ms:.2f}'
+        )
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.services.task_sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Delete task tombstones (delta sync) older than TASK_TOMBSTONE_RETENTION_DAYS; run daily from cron'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {deleted} tombstones older than {settings.TASK_TOMBSTONE_RETENTION_DAYS} days'
+        ))
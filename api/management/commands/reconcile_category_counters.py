@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from api.services.task_counters import reconcile_category_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute TaskCategory.tasks_count / completed_tasks_count in one grouped pass and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', dest='project_id', help='Only reconcile categories of this project')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without writing')
+
+    def handle(self, *args, **options):
+        fixes = reconcile_category_counters(
+            project_id=options.get('project_id'),
+            dry_run=options['dry_run']
+        )
+
+        for fix in fixes:
+            self.stdout.write(
+                f"{fix['id']}: tasks_count {fix['old_tasks_count']} -> {fix['tasks_count']}, "
+                f"completed_tasks_count {fix['old_completed_tasks_count']} -> {fix['completed_tasks_count']}"
+            )
+
+        action = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{action} {len(fixes)} drifted categories'))
@@ -0,0 +1,29 @@
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from api.local_channel_server import LocalChannelServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local Redis-protocol pub/sub stand-in for the chat channel layer (tests / load tests only)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=6390)
+
+    def handle(self, *args, **options):
+        server = LocalChannelServer(options['host'], options['port'])
+
+        async def run():
+            await server.start()
+            self.stdout.write(self.style.SUCCESS(
+                f'Local channel server listening on {server.url} '
+                f'(set CHANNEL_LAYER_URL={server.url})'
+            ))
+            await server.serve_forever()
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            self.stdout.write(f'Stopped. published={server.published} delivered={server.delivered}')
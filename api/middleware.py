@@ -3,12 +3,13 @@ from channels.db import database_sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth import get_user_model
+from api.services import auth_cache
 
 @database_sync_to_async
 def get_user(token_key):
     try:
         # This will verify the token and raise an exception if invalid
-        access_token = AccessToken(token_key)
+        access_token = auth_cache.get_validated_token(token_key, AccessToken)
         
         # Get the user ID from the token payload
         user_id = access_token.get('user_id')
@@ -17,22 +18,21 @@ def get_user(token_key):
             return AnonymousUser()
         
         # Thử custom user model trước vì chúng ta biết user_id có dạng chuỗi
-        from api.models.user import User as CustomUser
-        try:
-            user = CustomUser.objects.get(user_id=user_id)
-            print(f"✅ WebSocket authenticated as user: {user_id}")
+        # Dùng chung cache user với CustomJWTAuthentication (có sẵn enterprise)
+        user = auth_cache.get_user(user_id)
+        if user is not None:
             return user
-        except CustomUser.DoesNotExist:
-            # Thử tìm trong model mặc định (thường không cần thiết)
-            try:
-                User = get_user_model()
-                # Chỉ thử tìm bằng id nếu user_id là số
-                if isinstance(user_id, (int, float)) or (isinstance(user_id, str) and user_id.isdigit()):
-                    return User.objects.get(id=user_id)
-                return AnonymousUser()
-            except Exception:
-                return AnonymousUser()
-                
+
+        # Thử tìm trong model mặc định (thường không cần thiết)
+        try:
+            User = get_user_model()
+            # Chỉ thử tìm bằng id nếu user_id là số
+            if isinstance(user_id, (int, float)) or (isinstance(user_id, str) and user_id.isdigit()):
+                return User.objects.get(id=user_id)
+            return AnonymousUser()
+        except Exception:
+            return AnonymousUser()
+            
     except Exception as e:
         print(f"Token authentication error: {str(e)}")
         return AnonymousUser()
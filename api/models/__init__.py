@@ -13,10 +13,12 @@
 # from .team import Team
 # from .team_user import TeamUser
 # from .project_user import ProjectUser 
+from api.models.id_sequence import IdSequence
 from api.models.enterprise import Enterprise
 from api.models.user import User
 from api.models.project import Project
 from api.models.task import Task
+from api.models.task_tombstone import TaskTombstone
 from api.models.team import Team
 from api.models.team_user import TeamUser
 from api.models.project_user import ProjectUser
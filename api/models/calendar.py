@@ -25,4 +25,11 @@ class Calendar(models.Model):
         return self.title
 
     class Meta:
-        db_table = 'api_calendar'
\ No newline at end of file
+        db_table = 'api_calendar'
+        indexes = [
+            # Sự kiện theo user / project (user_id, project_id là CharField nên không có index khóa ngoại)
+            models.Index(fields=['user_id', 'start'], name='cal_user_start_idx'),
+            models.Index(fields=['project_id', 'start'], name='cal_project_start_idx'),
+            # Sự kiện sắp tới (start__range)
+            models.Index(fields=['start'], name='cal_start_idx'),
+        ]
\ No newline at end of file
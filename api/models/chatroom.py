@@ -23,6 +23,15 @@ class ChatRoomParticipant(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     joined_at = models.DateTimeField(auto_now_add=True)
     role = models.CharField(max_length=50, default='member')
+    # Con trỏ "đã đọc" riêng của từng thành viên: mọi tin nhắn gửi sau last_read_at là chưa đọc
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    last_read_message = models.ForeignKey(
+        'Message',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
     
     class Meta:
         db_table = 'api_chatroomparticipant'
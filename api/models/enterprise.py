@@ -1,5 +1,6 @@
 # api/models/enterprise.py
 from django.db import models
+from api.services.id_allocator import next_id
 
 class Enterprise(models.Model):
     enterprise_id = models.CharField(primary_key=True, max_length=50)  # Thay đổi từ EnterpriseID (AutoField) thành enterprise_id (CharField)
@@ -14,17 +15,7 @@ class Enterprise(models.Model):
     def save(self, *args, **kwargs):
         # Tạo enterprise_id định dạng 'ent-{id}' nếu chưa được thiết lập
         if not self.enterprise_id:
-            # Tìm enterprise_id lớn nhất trong database
-            last_enterprise = Enterprise.objects.all().order_by('-enterprise_id').first()
-            if last_enterprise:
-                # Tách số từ 'ent-X' và tăng lên 1
-                try:
-                    last_id = int(last_enterprise.enterprise_id.split('-')[1])
-                    self.enterprise_id = f'ent-{last_id + 1}'
-                except (IndexError, ValueError):
-                    self.enterprise_id = 'ent-1'
-            else:
-                self.enterprise_id = 'ent-1'
+            self.enterprise_id = next_id(Enterprise, 'ent')
         
         super().save(*args, **kwargs)
 
@@ -0,0 +1,18 @@
+# api/models/id_sequence.py
+from django.db import models
+
+
+class IdSequence(models.Model):
+    """
+    Bộ đếm cho các ID dạng '<prefix>-<n>' (task-1, prj-1, prju-1, ...).
+    Mỗi prefix là một dòng, next_value là số đầu tiên chưa được cấp phát.
+    """
+    prefix = models.CharField(primary_key=True, max_length=20)
+    next_value = models.BigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.prefix}: {self.next_value}'
+
+    class Meta:
+        db_table = 'api_idsequence'
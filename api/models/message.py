@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from .user import User
 from .chatroom import ChatRoom  # Import ChatRoom model instead of redefining it
 
@@ -7,12 +8,17 @@ class Message(models.Model):
     content = models.TextField(null=True, blank=True)
     attachment_url = models.CharField(max_length=255, null=True, blank=True)
     attachment_type = models.CharField(max_length=50, null=True, blank=True)
-    is_read = models.BooleanField(default=False)
-    sent_at = models.DateTimeField(auto_now_add=True)
+    is_read = models.BooleanField(default=False)  # Cũ, dùng ChatRoomParticipant.last_read_at thay thế
+    # default thay cho auto_now_add: chế độ ghi trễ (write-behind) gán sent_at lúc nhận tin, trước khi bulk_create
+    sent_at = models.DateTimeField(default=timezone.now, editable=False)
     chatroom = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='messages')
     receiver = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='received_messages')
     sent_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     
     class Meta:
         db_table = 'api_message'
-        ordering = ['sent_at']
\ No newline at end of file
+        ordering = ['sent_at']
+        indexes = [
+            # Đếm tin chưa đọc, lấy tin mới nhất và phân trang keyset (sent_at, message_id) theo phòng
+            models.Index(fields=['chatroom', 'sent_at', 'message_id'], name='msg_room_sent_idx'),
+        ]
\ No newline at end of file
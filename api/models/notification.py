@@ -30,3 +30,7 @@ class Notification(models.Model):
 
     class Meta:
         db_table = 'api_notification'
+        indexes = [
+            # NotificationViewSet: thông báo của user, mới nhất trước
+            models.Index(fields=['sent_to', '-sent_date'], name='notif_sent_to_date_idx'),
+        ]
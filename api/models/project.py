@@ -2,6 +2,7 @@
 from django.db import models
 from api.models.user import User
 from django.utils import timezone
+from api.services.id_allocator import next_id
 
 class Project(models.Model):
     STATUS_CHOICES = [
@@ -38,23 +39,7 @@ class Project(models.Model):
     def save(self, *args, **kwargs):
         # Tự động tạo project_id nếu chưa có
         if not self.project_id:
-            # Lấy tất cả project_id hiện có từ database
-            existing_ids = Project.objects.values_list('project_id', flat=True)
-            
-            # Tìm số lớn nhất từ các project_id hiện có
-            max_id = 0
-            for pid in existing_ids:
-                try:
-                    # Tách số từ 'prj-X'
-                    id_num = int(pid.split('-')[1])
-                    if id_num > max_id:
-                        max_id = id_num
-                except (IndexError, ValueError):
-                    continue
-            
-            # Tạo project_id mới
-            self.project_id = f'prj-{max_id + 1}'
-            
+            self.project_id = next_id(Project, 'prj')
             print(f"Tạo project_id mới: {self.project_id}")
         
         super().save(*args, **kwargs)
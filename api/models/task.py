@@ -1,8 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from api.models.user import User
 from api.models.project import Project
 from api.models.task_category import TaskCategory
-from django.db import connection
+from api.services.id_allocator import next_id
+from api.services import task_counters
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -54,43 +55,56 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Ghi nhớ category/status lúc load để tính delta cho bộ đếm của category
+        if 'category_id' in instance.__dict__ and 'status' in instance.__dict__:
+            instance._counter_state = task_counters.counter_state(instance)
+        # Project lúc load: chuyển task sang project khác thì project cũ cần tombstone (delta sync)
+        if 'project_id' in instance.__dict__:
+            instance._loaded_project_id = instance.project_id
+        return instance
+
     def save(self, *args, **kwargs):
+        created = self._state.adding
+
         # Tạo task_id định dạng 'task-{id}' nếu chưa được thiết lập
         if not self.task_id:
-            # Truy vấn trực tiếp để tìm ID lớn nhất từ tất cả task_id
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT MAX(CAST(SUBSTRING(task_id, 6) AS UNSIGNED)) FROM api_task")
-                result = cursor.fetchone()[0]
-                
-                # Nếu không có kết quả (bảng trống) hoặc lỗi, bắt đầu từ 1
-                if result is None:
-                    next_id = 1
-                else:
-                    next_id = result + 1
-                    
-                self.task_id = f'task-{next_id}'
-                print(f"Tạo task_id mới: {self.task_id}")
+            self.task_id = next_id(Task, 'task')
+            print(f"Tạo task_id mới: {self.task_id}")
 
         # Cập nhật category_name nếu có category
-        if self.category and not self.category_name:
+        if self.category_id and not self.category_name:
             self.category_name = self.category.name
             
         # Nếu trạng thái là Done thì set progress = 100
         if self.status == 'Done' and self.progress != 100:
             self.progress = 100
-            
-        super().save(*args, **kwargs)
 
-        # Cập nhật lại số lượng task trong category
-        if self.category:
-            total_tasks = Task.objects.filter(category=self.category).count()
-            completed_tasks = Task.objects.filter(category=self.category, status='Done').count()
-            self.category.tasks_count = total_tasks
-            self.category.completed_tasks_count = completed_tasks
-            self.category.save()
+        update_fields = kwargs.get('update_fields')
+        counters_affected = update_fields is None or bool({'status', 'category', 'category_id'} & set(update_fields))
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            # Cập nhật số lượng task trong category bằng delta (+1/-1)
+            if counters_affected:
+                task_counters.task_saved(self, created, getattr(self, '_counter_state', None))
+                self._counter_state = task_counters.counter_state(self)
 
     def __str__(self):
         return self.task_name
 
     class Meta:
-        db_table = 'api_task'
\ No newline at end of file
+        db_table = 'api_task'
+        indexes = [
+            # TaskViewSet: task của project (lọc thêm status) sắp theo -created_at
+            models.Index(fields=['project', 'created_at'], name='task_project_created_idx'),
+            models.Index(fields=['project', 'status', 'created_at'], name='task_project_status_idx'),
+            # Task của user (get_user_tasks, pending, overdue): lọc status, sắp / so sánh due_date
+            models.Index(fields=['assignee', 'status', 'due_date'], name='task_assignee_status_idx'),
+            # Delta sync (GET /api/tasks/changes/): task của project có updated_at sau watermark
+            # (InnoDB tự thêm khóa chính task_id vào cuối index, dùng làm tiebreaker)
+            models.Index(fields=['project', 'updated_at'], name='task_project_updated_idx'),
+        ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 # api/models/task_category.py
 from django.db import models
 from api.models.project import Project
-from django.db import connection
+from api.services.id_allocator import next_id
 
 class TaskCategory(models.Model):
     id = models.CharField(primary_key=True, max_length=50)
@@ -21,19 +21,8 @@ class TaskCategory(models.Model):
     def save(self, *args, **kwargs):
         # Tự động tạo id nếu chưa có
         if not self.id:
-            # Sử dụng truy vấn SQL trực tiếp để lấy ID lớn nhất
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT MAX(CAST(SUBSTRING(id, 5) AS UNSIGNED)) FROM api_taskcategory")
-                result = cursor.fetchone()[0]
-                
-                # Nếu không có kết quả hoặc lỗi, bắt đầu từ 1
-                if result is None:
-                    next_id = 1
-                else:
-                    next_id = result + 1
-                    
-                self.id = f'cat-{next_id}'
-                print(f"Tạo task category id mới: {self.id}")
+            self.id = next_id(TaskCategory, 'cat')
+            print(f"Tạo task category id mới: {self.id}")
         
         super().save(*args, **kwargs)
 
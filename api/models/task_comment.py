@@ -2,6 +2,7 @@
 from django.db import models
 from api.models.user import User
 from api.models.task import Task
+from api.services.id_allocator import next_id
 
 class TaskComment(models.Model):
     id = models.CharField(primary_key=True, max_length=50)
@@ -31,15 +32,7 @@ class TaskComment(models.Model):
     def save(self, *args, **kwargs):
         # Tự động tạo id nếu chưa có
         if not self.id:
-            last_comment = TaskComment.objects.all().order_by('-id').first()
-            if last_comment:
-                try:
-                    last_id = int(last_comment.id.split('-')[1])
-                    self.id = f'comment-{last_id + 1}'
-                except (IndexError, ValueError):
-                    self.id = 'comment-1'
-            else:
-                self.id = 'comment-1'
+            self.id = next_id(TaskComment, 'comment')
         
         super().save(*args, **kwargs)
 
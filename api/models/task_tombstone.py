@@ -0,0 +1,26 @@
+# api/models/task_tombstone.py
+from django.db import models
+from django.utils import timezone
+
+
+class TaskTombstone(models.Model):
+    """
+    Dấu vết task đã bị xóa khỏi một project (xóa hẳn hoặc chuyển sang project khác),
+    để delta sync (GET /api/tasks/changes/) báo cho client xóa task khỏi bản sao của nó.
+    Ghi bởi signal của Task; xóa bớt bằng `python manage.py prune_task_tombstones`.
+    """
+    task_id = models.CharField(max_length=50)
+    # Không dùng ForeignKey: project có thể đã bị xóa
+    project_id = models.CharField(max_length=50)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.task_id} ({self.project_id}) @ {self.deleted_at}'
+
+    class Meta:
+        db_table = 'api_tasktombstone'
+        indexes = [
+            models.Index(fields=['project_id', 'deleted_at'], name='tombstone_project_deleted_idx'),
+            # Xóa tombstone cũ
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
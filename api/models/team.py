@@ -2,6 +2,7 @@
 from django.db import models
 from api.models.user import User
 from api.models.project import Project
+from api.services.id_allocator import next_id
 
 class Team(models.Model):
     team_id = models.CharField(primary_key=True, max_length=50)
@@ -26,15 +27,7 @@ class Team(models.Model):
     def save(self, *args, **kwargs):
         # Tự động tạo team_id nếu chưa có
         if not self.team_id:
-            last_team = Team.objects.all().order_by('-team_id').first()
-            if last_team:
-                try:
-                    last_id = int(last_team.team_id.split('-')[1])
-                    self.team_id = f'team-{last_id + 1}'
-                except (IndexError, ValueError):
-                    self.team_id = 'team-1'
-            else:
-                self.team_id = 'team-1'
+            self.team_id = next_id(Team, 'team')
         
         super().save(*args, **kwargs)
 
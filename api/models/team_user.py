@@ -2,6 +2,7 @@
 from django.db import models
 from api.models.user import User
 from api.models.team import Team
+from api.services.id_allocator import next_id
 
 class TeamUser(models.Model):
     ROLE_CHOICES = [
@@ -33,15 +34,7 @@ class TeamUser(models.Model):
     def save(self, *args, **kwargs):
         # Tự động tạo id nếu chưa có
         if not self.id:
-            last_team_user = TeamUser.objects.all().order_by('-id').first()
-            if last_team_user:
-                try:
-                    last_id = int(last_team_user.id.split('-')[1])
-                    self.id = f'teamuser-{last_id + 1}'
-                except (IndexError, ValueError):
-                    self.id = 'teamuser-1'
-            else:
-                self.id = 'teamuser-1'
+            self.id = next_id(TeamUser, 'teamuser')
                 
         # Nếu role_in_team là Lead, cập nhật leader của team
         if self.role_in_team == 'Lead':
@@ -1,7 +1,8 @@
 # models/user.py
-import bcrypt
 from django.db import models
 from api.models.enterprise import Enterprise
+from api.services import password_hashing
+from api.services.id_allocator import next_id
 
 class User(models.Model):
     ROLE_CHOICES = [
@@ -39,35 +40,31 @@ class User(models.Model):
 
     def set_password(self, raw_password):
         """
-        Mã hóa mật khẩu gốc và lưu vào `password`.
+        Mã hóa mật khẩu gốc (cost PASSWORD_BCRYPT_ROUNDS) và lưu vào `password`.
+        Chạy trong pool băm mật khẩu; PasswordHashingBusy nếu pool quá tải.
         """
-        salt = bcrypt.gensalt(rounds=12)
-        self.password = bcrypt.hashpw(raw_password.encode('utf-8'), salt).decode('utf-8')
+        self.password = password_hashing.hash_password(raw_password)
 
     def check_password(self, raw_password):
         """
         Kiểm tra mật khẩu người dùng nhập vào với mật khẩu đã băm.
         """
-        return bcrypt.checkpw(raw_password.encode('utf-8'), self.password.encode('utf-8'))
+        return password_hashing.check_password(raw_password, self.password)
+
+    async def aset_password(self, raw_password):
+        self.password = await password_hashing.ahash_password(raw_password)
+
+    async def acheck_password(self, raw_password):
+        return await password_hashing.acheck_password(raw_password, self.password)
+
+    def password_needs_rehash(self):
+        return password_hashing.needs_rehash(self.password)
 
     def save(self, *args, **kwargs):
         # Tạo user_id định dạng 'user-{id}' nếu chưa được thiết lập
         if not self.user_id:
-            # Truy vấn trực tiếp để tìm ID lớn nhất từ tất cả user_id
-            from django.db import connection
-            
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT MAX(CAST(SUBSTRING(user_id, 6) AS UNSIGNED)) FROM api_user")
-                result = cursor.fetchone()[0]
-                
-                # Nếu không có kết quả (bảng trống) hoặc lỗi, bắt đầu từ 1
-                if result is None:
-                    next_id = 1
-                else:
-                    next_id = result + 1
-                    
-                self.user_id = f'user-{next_id}'
-                print(f"Tạo user_id mới: {self.user_id}")
+            self.user_id = next_id(User, 'user')
+            print(f"Tạo user_id mới: {self.user_id}")
         
         # Đảm bảo created_at luôn có giá trị
         if not self.created_at:
@@ -0,0 +1,221 @@
+# api/pagination.py
+"""
+Phân trang mặc định cho mọi viewset (REST_FRAMEWORK['DEFAULT_PAGINATION_CLASS']).
+
+Keyset (cursor): trang sau lọc theo cột sắp xếp (WHERE created_at < ...) thay vì OFFSET,
+nên trang thứ 1000 vẫn nhanh như trang đầu và không bị lệch khi có bản ghi mới.
+
+    GET /api/tasks/?page_size=20           -> {"next": ..., "previous": ..., "results": [...]}
+    GET /api/tasks/?cursor=eyJwIjogWy...   -> trang tiếp theo (dùng nguyên link "next")
+    GET /api/tasks/?count=true             -> thêm "count" (tổng số bản ghi, tốn thêm 1 COUNT(*))
+
+Thứ tự: ?ordering= / view.ordering (nếu view có OrderingFilter) > view.pagination_ordering >
+order_by của queryset > Meta.ordering của model > -created_at > -pk; luôn thêm pk để thứ tự ổn định.
+
+Cursor chứa giá trị của MỌI cột sắp xếp của dòng biên và trang sau lọc theo cả bộ
+(status, pk) > (s, k) như task_board / task_sync, nên cột có nhiều giá trị trùng
+(?ordering=status, priority...) vẫn phân trang đúng (CursorPagination của DRF chỉ lưu
+cột đầu và dùng OFFSET cho các dòng trùng, bị chặn ở offset_cutoff = 1000).
+
+Cột nullable (vd. ?ordering=-due_date) được sắp thêm theo cờ <cột>_is_null trước chính cột đó,
+để cursor không bỏ qua các dòng NULL: NULL luôn xếp cuối khi tăng dần, đầu khi giảm dần, với
+mọi kiểu cột. Sắp theo biểu thức nên DB không dùng được index của cột đó (sort thêm một bước).
+"""
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from django.db.models import Case, IntegerField, Q, Value, When
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_PARAM = 'count'
+NULL_FLAG_SUFFIX = '_is_null'
+
+
+def _model_field(queryset, name):
+    try:
+        return queryset.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Annotation (vd. tasks_count) hoặc tên không phải cột
+        return None
+
+
+def _nullable_field(queryset, name):
+    field = _model_field(queryset, name)
+    if field is not None and getattr(field, 'concrete', False) and field.null and not field.is_relation:
+        return field
+    return None
+
+
+def _encode_value(value):
+    if isinstance(value, models.Model):
+        return _encode_value(value.pk)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+class KeysetPagination(CursorPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = None
+        ordering_filters = [backend for backend in getattr(view, 'filter_backends', []) if hasattr(backend, 'get_ordering')]
+        if ordering_filters:
+            # Gọi thẳng filter: ?ordering= hoặc view.ordering, None nếu không có
+            # (super() sẽ rơi về CursorPagination.ordering = '-created', không phải cột của model)
+            ordering = ordering_filters[0]().get_ordering(request, queryset, view)
+        if not ordering:
+            ordering = self._default_ordering(queryset, view)
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        ordering = [field for field in ordering if isinstance(field, str) and '__' not in field and field != '?']
+        if not ordering:
+            ordering = ['-pk']
+        pk_names = {'pk', queryset.model._meta.pk.name}
+        if not any(field.lstrip('-') in pk_names for field in ordering):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return tuple(key for field in ordering for key in self._sort_keys(queryset, field))
+
+    def _sort_keys(self, queryset, ordering_field):
+        """Cột nullable: thêm cờ <cột>_is_null (cùng chiều) trước cột (xem _annotate_null_flags)."""
+        name = ordering_field.lstrip('-')
+        if _nullable_field(queryset, name) is None:
+            return [ordering_field]
+        return [ordering_field.replace(name, name + NULL_FLAG_SUFFIX), ordering_field]
+
+    def _annotate_null_flags(self, queryset, ordering):
+        flags = {}
+        for field_name in ordering:
+            name = field_name.lstrip('-')
+            if name.endswith(NULL_FLAG_SUFFIX) and _model_field(queryset, name) is None:
+                column = name[:-len(NULL_FLAG_SUFFIX)]
+                flags[name] = Case(When(**{f'{column}__isnull': True}, then=Value(1)), default=Value(0),
+                                   output_field=IntegerField())
+        return queryset.annotate(**flags) if flags else queryset
+
+    def _default_ordering(self, queryset, view):
+        if getattr(view, 'pagination_ordering', None):
+            return list(view.pagination_ordering)
+        if queryset.query.order_by:
+            return list(queryset.query.order_by)
+        if queryset.model._meta.ordering:
+            return list(queryset.model._meta.ordering)
+        field_names = {field.name for field in queryset.model._meta.concrete_fields}
+        if 'created_at' in field_names:
+            return ['-created_at']
+        return ['-pk']
+
+    # ----- Cursor -----
+
+    def _decode_position(self, request):
+        """Returns: (giá trị các cột của dòng biên hoặc None, reverse)"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = data['p'], bool(data.get('r'))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list) or len(position) != len(self.ordering)
+                or not all(value is None or isinstance(value, (str, int, float, bool)) for value in position)):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _encode_cursor(self, instance, reverse):
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(instance, dict):
+            position = [_encode_value(instance[name]) for name in names]
+        else:
+            position = [_encode_value(getattr(instance, name)) for name in names]
+        data = {'p': position, 'r': 1} if reverse else {'p': position}
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _after(self, position, reverse):
+        """Dòng đứng sau `position` theo self.ordering (trước nếu reverse): so sánh cả bộ giá trị."""
+        condition, equal = Q(), {}
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            # Các dòng cùng cờ _is_null = 1 đều NULL ở cột này: không có dòng nào "lớn hơn"
+            if value is not None:
+                condition |= Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': value})
+                equal[name] = value
+            else:
+                equal[f'{name}__isnull'] = True
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        position, reverse = self._decode_position(request)
+
+        # Cột sắp xếp phải được load để tạo cursor (queryset có thể đã .only() bởi sparse fieldset)
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            columns = [field.lstrip('-') for field in self.ordering]
+            queryset = queryset.only(*loaded, *[name for name in columns if name != 'pk' and _model_field(queryset, name)])
+        queryset = self._annotate_null_flags(queryset, self.ordering)
+
+        self.count = None
+        if request.query_params.get(COUNT_PARAM, '').lower() in ('1', 'true', 'yes'):
+            self.count = queryset.count()
+
+        if reverse:
+            queryset = queryset.order_by(*[field[1:] if field.startswith('-') else '-' + field for field in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self._after(position, reverse))
+            except (ValueError, TypeError, ValidationError):
+                # Giá trị trong cursor không đúng kiểu cột
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {'next': self.get_next_link(), 'previous': self.get_previous_link()}
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response
@@ -1,6 +1,8 @@
 from django.urls import re_path
-from .consumers import ChatConsumer
+from .consumers import ChatConsumer, UserConsumer
 
 websocket_urlpatterns = [
     re_path(r'^ws/chat/(?P<room_name>[^/]+)/$', ChatConsumer.as_asgi()),
+    # Một socket cho mỗi user: subscribe nhiều phòng / project, nhận thông báo
+    re_path(r'^ws/user/$', UserConsumer.as_asgi()),
 ]
\ No newline at end of file
@@ -2,16 +2,18 @@ from rest_framework import serializers
 from api.models.chatroom import ChatRoom, ChatRoomParticipant
 from api.models.user import User
 from api.serializers.user_serializer import UserSerializer
+from api.services.chat_read_cursor import unread_count
 
 class ChatRoomParticipantSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     
     class Meta:
         model = ChatRoomParticipant
-        fields = ['id', 'user', 'joined_at', 'role']
+        fields = ['id', 'user', 'joined_at', 'role', 'last_read_at', 'last_read_message']
 
 class ChatRoomSerializer(serializers.ModelSerializer):
-    participants = serializers.SerializerMethodField()
+    # Dùng dữ liệu đã prefetch nếu có (danh sách phòng)
+    participants = ChatRoomParticipantSerializer(source='chatroomparticipant_set', many=True, read_only=True)
     last_message = serializers.SerializerMethodField()
     unread_count = serializers.SerializerMethodField()
     
@@ -20,12 +22,11 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         fields = ['chatroom_id', 'name', 'type', 'related_project', 'related_team_id', 
                  'created_at', 'participants', 'last_message', 'unread_count']
     
-    def get_participants(self, obj):
-        participants = ChatRoomParticipant.objects.filter(chatroom=obj)
-        return ChatRoomParticipantSerializer(participants, many=True).data
-    
     def get_last_message(self, obj):
         from api.serializers.message_serializer import MessageSerializer
+        if hasattr(obj, '_last_message'):
+            last_message = obj._last_message
+            return MessageSerializer(last_message).data if last_message else None
         try:
             last_message = obj.messages.latest('sent_at')
             return MessageSerializer(last_message).data
@@ -33,5 +34,7 @@ class ChatRoomSerializer(serializers.ModelSerializer):
             return None
     
     def get_unread_count(self, obj):
+        if hasattr(obj, 'annotated_unread_count'):
+            return obj.annotated_unread_count
         user = self.context.get('request').user
-        return obj.messages.filter(is_read=False).exclude(sent_by=user).count()
\ No newline at end of file
+        return unread_count(obj.chatroom_id, user)
\ No newline at end of file
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from api.models.message import Message
 from api.serializers.user_serializer import UserSerializer
+from api.sparse_fields import SparseFieldsetMixin
 
-class MessageSerializer(serializers.ModelSerializer):
+class MessageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     sent_by = UserSerializer(read_only=True)
     receiver = UserSerializer(read_only=True)
     
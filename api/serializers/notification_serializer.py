@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from api.models import Notification
+from api.sparse_fields import SparseFieldsetMixin
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = '__all__'
\ No newline at end of file
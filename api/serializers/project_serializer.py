@@ -4,9 +4,10 @@ from api.models.project import Project
 from api.models.project_user import ProjectUser
 from api.models.user import User
 from api.serializers.user_serializer import UserSerializer
+from api.sparse_fields import SparseFieldsetMixin
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     members = serializers.SerializerMethodField()
     manager = UserSerializer(read_only=True)  # Hiển thị thông tin đầy đủ của manager
     manager_id = serializers.CharField(write_only=True, required=False)  # Trường để nhập manager_id
@@ -25,6 +26,9 @@ class ProjectSerializer(serializers.ModelSerializer):
             'created_at': {'read_only': True},
             'updated_at': {'read_only': True}
         }
+        # ?fields= / ?expand= (xem api/sparse_fields.py): members chỉ có khi được yêu cầu
+        expandable_fields = {'members': ('project_members',)}
+        computed_fields = {'members_count': ()}
 
     def get_members_count(self, obj):
         """Đếm số lượng members"""
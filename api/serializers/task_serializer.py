@@ -1,11 +1,12 @@
 # api/serializers/task_serializer.py
-from datetime import timezone
 from rest_framework import serializers
 from api.models.task import Task
 from api.models.user import User
 from api.models.project import Project
 from api.models.task_category import TaskCategory
 from api.serializers.user_serializer import UserSerializer
+from api.services.lookup_memo import lookup_memo
+from api.sparse_fields import SparseFieldsetMixin
 
 class TaskCategorySimpleSerializer(serializers.ModelSerializer):
     """Simple serializer cho TaskCategory (tránh circular import)"""
@@ -19,7 +20,7 @@ class ProjectSimpleSerializer(serializers.ModelSerializer):
         model = Project
         fields = ['project_id', 'project_name']
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Read-only fields (cho output)
     assignee = UserSerializer(read_only=True)
     category_info = TaskCategorySimpleSerializer(source='category', read_only=True)
@@ -53,29 +54,34 @@ class TaskSerializer(serializers.ModelSerializer):
             'created_at': {'read_only': True},
             'updated_at': {'read_only': True},
         }
+        # Key thêm trong to_representation -> cột cần load (?fields=, xem api/sparse_fields.py)
+        computed_fields = {
+            'is_overdue': (), 'days_remaining': (),
+            'start_date_formatted': ('start_date',), 'due_date_formatted': ('due_date',),
+        }
+    
+    def _memo(self):
+        return lookup_memo(self.context)
+    
+    def _get_assignee(self, assignee_id):
+        # Kèm enterprise vì response có assignee.enterprise
+        return self._memo().get(User.objects.select_related('enterprise'), assignee_id)
     
     def validate_assignee_id(self, value):
         """Validate assignee exists"""
-        if value and value.strip():
-            try:
-                User.objects.get(user_id=value)
-            except User.DoesNotExist:
-                raise serializers.ValidationError(f"User with id '{value}' does not exist")
+        if value and value.strip() and self._get_assignee(value) is None:
+            raise serializers.ValidationError(f"User with id '{value}' does not exist")
         return value
     
     def validate_project_id(self, value):
         """Validate project exists"""
-        try:
-            Project.objects.get(project_id=value)
-        except Project.DoesNotExist:
+        if self._memo().get(Project, value) is None:
             raise serializers.ValidationError(f"Project with id '{value}' does not exist")
         return value
     
     def validate_category_id(self, value):
         """Validate category exists"""
-        try:
-            TaskCategory.objects.get(id=value)
-        except TaskCategory.DoesNotExist:
+        if self._memo().get(TaskCategory, value) is None:
             raise serializers.ValidationError(f"Category with id '{value}' does not exist")
         return value
     
@@ -83,16 +89,13 @@ class TaskSerializer(serializers.ModelSerializer):
         """Cross-field validation"""
         # Ensure category belongs to the project
         if 'category_id' in attrs and 'project_id' in attrs:
-            try:
-                category = TaskCategory.objects.get(id=attrs['category_id'])
-                project = Project.objects.get(project_id=attrs['project_id'])
-                
-                if category.project_id != project.project_id:
-                    raise serializers.ValidationError({
-                        'category_id': 'Category must belong to the specified project'
-                    })
-            except (TaskCategory.DoesNotExist, Project.DoesNotExist):
-                pass  # Will be caught by individual field validators
+            category = self._memo().get(TaskCategory, attrs['category_id'])
+            project = self._memo().get(Project, attrs['project_id'])
+            # Không tồn tại: đã báo lỗi ở validator của từng field
+            if category and project and category.project_id != project.project_id:
+                raise serializers.ValidationError({
+                    'category_id': 'Category must belong to the specified project'
+                })
         
         # Validate dates
         if 'start_date' in attrs and 'due_date' in attrs:
@@ -111,23 +114,21 @@ class TaskSerializer(serializers.ModelSerializer):
         
         print(f"Assignee ID: {assignee_id}, Project ID: {project_id}, Category ID: {category_id}")
         
+        # Đã được load khi validate (lookup memo của request)
         assignee = None
         if assignee_id and assignee_id.strip():
-            try:
-                assignee = User.objects.get(user_id=assignee_id)
-            except User.DoesNotExist:
+            assignee = self._get_assignee(assignee_id)
+            if assignee is None:
                 print(f"User with ID '{assignee_id}' does not exist")
                 raise serializers.ValidationError(f"User with ID '{assignee_id}' does not exist")
         
-        try:
-            project = Project.objects.get(project_id=project_id)
-        except Project.DoesNotExist:
+        project = self._memo().get(Project, project_id)
+        if project is None:
             print(f"Project with ID '{project_id}' does not exist")
             raise serializers.ValidationError(f"Project with ID '{project_id}' does not exist")
         
-        try:
-            category = TaskCategory.objects.get(id=category_id)
-        except TaskCategory.DoesNotExist:
+        category = self._memo().get(TaskCategory, category_id)
+        if category is None:
             print(f"Category with ID '{category_id}' does not exist")
             raise serializers.ValidationError(f"Category with ID '{category_id}' does not exist")
         
@@ -146,50 +147,105 @@ class TaskSerializer(serializers.ModelSerializer):
         if 'assignee_id' in validated_data:
             assignee_id = validated_data.pop('assignee_id')
             if assignee_id and assignee_id.strip():
-                instance.assignee = User.objects.get(user_id=assignee_id)
+                instance.assignee = self._get_assignee(assignee_id)
             else:
                 instance.assignee = None
         
         # Handle project update
         if 'project_id' in validated_data:
             project_id = validated_data.pop('project_id')
-            instance.project = Project.objects.get(project_id=project_id)
+            instance.project = self._memo().get(Project, project_id)
         
         # Handle category update
         if 'category_id' in validated_data:
             category_id = validated_data.pop('category_id')
-            instance.category = TaskCategory.objects.get(id=category_id)
+            instance.category = self._memo().get(TaskCategory, category_id)
         
         # Update other fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
         # Auto-update status based on progress
+        self.sync_status_with_progress(instance)
+        
+        instance.save()
+        return instance
+
+    @staticmethod
+    def sync_status_with_progress(instance):
         if instance.progress == 100 and instance.status != 'Done':
             instance.status = 'Done'
         elif instance.progress < 100 and instance.status == 'Done':
             instance.status = 'In Progress'
-        
-        instance.save()
-        return instance
     
     def to_representation(self, instance):
         """Customize the output representation"""
         data = super().to_representation(instance)
         
         # Add computed fields
-        data['is_overdue'] = instance.is_overdue() if hasattr(instance, 'is_overdue') else False
-        data['days_remaining'] = instance.days_remaining() if hasattr(instance, 'days_remaining') else None
+        if self.wants('is_overdue'):
+            data['is_overdue'] = instance.is_overdue() if hasattr(instance, 'is_overdue') else False
+        if self.wants('days_remaining'):
+            data['days_remaining'] = instance.days_remaining() if hasattr(instance, 'days_remaining') else None
         
         # Format dates for frontend
-        if data.get('start_date'):
+        if self.wants('start_date_formatted') and instance.start_date:
             data['start_date_formatted'] = instance.start_date.strftime('%Y-%m-%d')
-        if data.get('due_date'):
+        if self.wants('due_date_formatted') and instance.due_date:
             data['due_date_formatted'] = instance.due_date.strftime('%Y-%m-%d')
             
         return data
 
 
+class BulkTaskSerializer(TaskSerializer):
+    """
+    Một phần tử của POST/PATCH /api/tasks/bulk/ (xem api/services/task_bulk.py).
+    User / Project / TaskCategory của cả lô đã được load sẵn vào lookup memo bằng in_bulk,
+    nên các validator không truy vấn DB cho từng task.
+    """
+
+    def validate(self, attrs):
+        # Khi sửa (PATCH) so với project / category hiện tại của task
+        project_id = attrs.get('project_id', getattr(self.instance, 'project_id', None))
+        category_id = attrs.get('category_id', getattr(self.instance, 'category_id', None))
+        category = self._memo().get(TaskCategory, category_id)
+        if ('project_id' in attrs or 'category_id' in attrs) and category and category.project_id != project_id:
+            raise serializers.ValidationError({
+                'category_id': 'Category must belong to the specified project'
+            })
+
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        due_date = attrs.get('due_date', getattr(self.instance, 'due_date', None))
+        if start_date and due_date and start_date > due_date:
+            raise serializers.ValidationError({
+                'due_date': 'Due date must be after start date'
+            })
+        return attrs
+
+
+class BoardAssigneeSerializer(serializers.ModelSerializer):
+    """Assignee rút gọn cho thẻ trên board"""
+    class Meta:
+        model = User
+        fields = ['user_id', 'full_name', 'avatar']
+
+
+class BoardTaskSerializer(serializers.ModelSerializer):
+    """
+    Thẻ task trên kanban board (GET /api/projects/{id}/board/).
+    Không có project_info (cả board cùng một project) và category chỉ có id / tên.
+    """
+    assignee = BoardAssigneeSerializer(read_only=True)
+    
+    class Meta:
+        model = Task
+        fields = [
+            'task_id', 'task_name', 'status', 'priority', 'start_date', 'due_date',
+            'progress', 'category_id', 'category_name', 'assignee', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class UserTasksSerializer(serializers.Serializer):
     """Serializer để lấy tasks của user cụ thể"""
     user_id = serializers.CharField(required=True)
@@ -264,34 +320,3 @@ def get_user_tasks(user_id, **filters):
         return serializer.get_user_tasks()
     else:
         raise ValueError(f"Invalid parameters: {serializer.errors}")
-
-
-def get_user_task_summary(user_id):
-    """
-    Lấy summary về tasks của user
-    
-    Returns:
-        Dict với thông tin tổng quan về tasks
-    """
-    try:
-        user = User.objects.get(user_id=user_id)
-    except User.DoesNotExist:
-        raise ValueError(f"User with id '{user_id}' does not exist")
-    
-    tasks = Task.objects.filter(assignee=user)
-    
-    summary = {
-        'user_id': user_id,
-        'user_name': f"{user.first_name} {user.last_name}".strip(),
-        'total_tasks': tasks.count(),
-        'completed_tasks': tasks.filter(status='Done').count(),
-        'in_progress_tasks': tasks.filter(status='In Progress').count(),
-        'pending_tasks': tasks.filter(status='Pending').count(),
-        'overdue_tasks': tasks.filter(
-            due_date__lt=timezone.now().date(),
-            status__in=['Pending', 'In Progress']
-        ).count() if hasattr(tasks.first(), 'due_date') else 0,
-        'high_priority_tasks': tasks.filter(priority='High', status__in=['Pending', 'In Progress']).count(),
-    }
-    
-    return summary
\ No newline at end of file
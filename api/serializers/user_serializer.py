@@ -1,10 +1,22 @@
 # api/serializers/user_serializer.py
 from rest_framework import serializers
+from rest_framework.exceptions import Throttled
 from api.models.user import User
 from api.models.enterprise import Enterprise
 from api.serializers.enterprise_serializer import EnterpriseSerializer
+from api.services.password_hashing import PasswordHashingBusy
+from api.sparse_fields import SparseFieldsetMixin
 
-class UserSerializer(serializers.ModelSerializer):
+
+def _set_password(user, raw_password):
+    # Pool băm mật khẩu đầy (vd. đợt đăng nhập dồn dập) -> 429 thay vì chờ
+    try:
+        user.set_password(raw_password)
+    except PasswordHashingBusy:
+        raise Throttled(wait=1, detail='Password hashing is busy, please retry.')
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     enterprise = EnterpriseSerializer(read_only=True)  # Chỉ đọc
     enterprise_id = serializers.CharField(write_only=True, required=False)  # Thêm trường này để nhận ID
     
@@ -43,7 +55,7 @@ class UserSerializer(serializers.ModelSerializer):
         
         # Tạo user
         user = User(enterprise=enterprise, **validated_data)
-        user.set_password(raw_password)
+        _set_password(user, raw_password)
         user.save()
 
         return user
@@ -60,7 +72,7 @@ class UserSerializer(serializers.ModelSerializer):
         # Xử lý password nếu được cung cấp
         password = validated_data.pop('password', None)
         if password:
-            instance.set_password(password)
+            _set_password(instance, password)
         
         # Cập nhật các trường khác
         for attr, value in validated_data.items():
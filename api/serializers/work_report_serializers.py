@@ -6,9 +6,11 @@ from api.models.task import Task
 from api.models.work_report import WorkReport
 from api.serializers.user_serializer import UserSerializer
 from api.serializers.project_serializer import ProjectSerializer
+from api.services.lookup_memo import lookup_memo
+from api.sparse_fields import SparseFieldsetMixin
 
 
-class WorkReportSerializer(serializers.ModelSerializer):
+class WorkReportSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     # Hiển thị thông tin đầy đủ khi read
     user = UserSerializer(read_only=True)
     project = ProjectSerializer(read_only=True)
@@ -31,6 +33,8 @@ class WorkReportSerializer(serializers.ModelSerializer):
             'created_at': {'read_only': True},
             'updated_at': {'read_only': True}
         }
+        # ?fields= / ?expand= (xem api/sparse_fields.py)
+        expandable_fields = {'tasks': ('tasks',)}
 
     def get_tasks(self, obj):
         """Lấy danh sách tasks với thông tin đầy đủ"""
@@ -92,6 +96,17 @@ class WorkReportSerializer(serializers.ModelSerializer):
         # Gọi parent method với data đã được xử lý
         return super().to_internal_value(processed_data)
 
+    def _get_tasks(self, task_ids):
+        """Task theo thứ tự task_ids, load bằng một in_bulk (lookup memo của request)"""
+        found = lookup_memo(self.context).get_many(Task, task_ids)
+        for task_id in task_ids:
+            if task_id not in found:
+                print(f"✗ Task not found: {task_id}")
+                raise serializers.ValidationError({
+                    'task_ids': f'Task với ID "{task_id}" không tồn tại'
+                })
+        return list(found.values())
+
     def create(self, validated_data):
         """Tạo work report mới với debug chi tiết"""
         print(f"=== CREATING WORK REPORT ===")
@@ -101,45 +116,35 @@ class WorkReportSerializer(serializers.ModelSerializer):
         user_id = validated_data.pop('user_id', None)
         user_instance = None
         if user_id:
-            try:
-                user_instance = User.objects.get(user_id=user_id)
-                validated_data['user'] = user_instance
-                print(f"✓ User found: {user_instance.user_id} - {getattr(user_instance, 'full_name', 'N/A')}")
-            except User.DoesNotExist:
+            user_instance = lookup_memo(self.context).get(User, user_id)
+            if user_instance is None:
                 print(f"✗ User not found: {user_id}")
                 raise serializers.ValidationError({
                     'user_id': f'User với ID "{user_id}" không tồn tại'
                 })
+            validated_data['user'] = user_instance
+            print(f"✓ User found: {user_instance.user_id} - {getattr(user_instance, 'full_name', 'N/A')}")
 
         # 2. Xử lý project_id
         project_id = validated_data.pop('project_id', None)
         project_instance = None
         if project_id:
-            try:
-                project_instance = Project.objects.get(project_id=project_id)
-                validated_data['project'] = project_instance
-                print(f"✓ Project found: {project_instance.project_id} - {project_instance.project_name}")
-            except Project.DoesNotExist:
+            project_instance = lookup_memo(self.context).get(Project, project_id)
+            if project_instance is None:
                 print(f"✗ Project not found: {project_id}")
                 raise serializers.ValidationError({
                     'project_id': f'Project với ID "{project_id}" không tồn tại'
                 })
+            validated_data['project'] = project_instance
+            print(f"✓ Project found: {project_instance.project_id} - {project_instance.project_name}")
 
         # 3. Xử lý task_ids
         task_ids = validated_data.pop('task_ids', None)
         tasks_to_add = []
         if task_ids:
             print(f"Processing tasks: {task_ids}")
-            for task_id in task_ids:
-                try:
-                    task = Task.objects.get(task_id=task_id)
-                    tasks_to_add.append(task)
-                    print(f"✓ Task found: {task.task_id} - {getattr(task, 'task_name', 'N/A')}")
-                except Task.DoesNotExist:
-                    print(f"✗ Task not found: {task_id}")
-                    raise serializers.ValidationError({
-                        'task_ids': f'Task với ID "{task_id}" không tồn tại'
-                    })
+            tasks_to_add = self._get_tasks(task_ids)
+            print(f"✓ Tasks found: {[task.task_id for task in tasks_to_add]}")
 
         # 4. Tạo ID tự động nếu không có
         if 'id' not in validated_data or not validated_data['id']:
@@ -169,38 +174,29 @@ class WorkReportSerializer(serializers.ModelSerializer):
         # 1. Xử lý user_id
         user_id = validated_data.pop('user_id', None)
         if user_id:
-            try:
-                instance.user = User.objects.get(user_id=user_id)
-                print(f"✓ Updated user: {instance.user.user_id}")
-            except User.DoesNotExist:
+            user = lookup_memo(self.context).get(User, user_id)
+            if user is None:
                 raise serializers.ValidationError({
                     'user_id': f'User với ID "{user_id}" không tồn tại'
                 })
+            instance.user = user
+            print(f"✓ Updated user: {instance.user.user_id}")
 
         # 2. Xử lý project_id
         project_id = validated_data.pop('project_id', None)
         if project_id:
-            try:
-                instance.project = Project.objects.get(project_id=project_id)
-                print(f"✓ Updated project: {instance.project.project_id}")
-            except Project.DoesNotExist:
+            project = lookup_memo(self.context).get(Project, project_id)
+            if project is None:
                 raise serializers.ValidationError({
                     'project_id': f'Project với ID "{project_id}" không tồn tại'
                 })
+            instance.project = project
+            print(f"✓ Updated project: {instance.project.project_id}")
 
         # 3. Xử lý task_ids
         task_ids = validated_data.pop('task_ids', None)
         if task_ids is not None:
-            tasks = []
-            for task_id in task_ids:
-                try:
-                    task = Task.objects.get(task_id=task_id)
-                    tasks.append(task)
-                    print(f"✓ Task found for update: {task.task_id}")
-                except Task.DoesNotExist:
-                    raise serializers.ValidationError({
-                        'task_ids': f'Task với ID "{task_id}" không tồn tại'
-                    })
+            tasks = self._get_tasks(task_ids)
             instance.tasks.set(tasks)
             print(f"✓ Updated {len(tasks)} tasks")
 
@@ -240,7 +236,7 @@ class WorkReportListSerializer(WorkReportSerializer):
     user = serializers.SerializerMethodField()
     
     class Meta(WorkReportSerializer.Meta):
-        pass
+        expandable_fields = {'tasks': ('tasks',), 'project': ('project',), 'user': ('user',)}
 
     def get_project(self, obj):
         """Chỉ trả về thông tin cơ bản của project"""
@@ -0,0 +1 @@
+# api/services/__init__.py
@@ -0,0 +1,182 @@
+# api/services/auth_cache.py
+"""
+Cache xác thực cho HTTP (CustomJWTAuthentication) và WebSocket (TokenAuthMiddleware).
+
+- Token: raw JWT -> token đã kiểm tra chữ ký, giữ tối đa AUTH_CACHE_TTL giây và không quá hạn exp.
+- User: user_id -> snapshot các cột của User (+ Enterprise), dựng lại thành model instance
+  mỗi lần dùng nên request này sửa user không ảnh hưởng request khác.
+
+Cả hai là LRU trong process, giới hạn AUTH_CACHE_MAX_SIZE phần tử. Bật AUTH_CACHE_USE_SHARED
+để dùng thêm Django cache (Redis/Memcached) làm tầng thứ hai cho snapshot user.
+User bị xóa khỏi cache khi được lưu / xóa (api/signals.py); ở các worker khác entry hết hạn theo TTL.
+Khóa trong cache chung có kèm version: invalidate_all_users() đổi version nên mọi snapshot
+cũ trong cache chung bị bỏ qua cùng lúc ở mọi worker.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.models.enterprise import Enterprise
+from api.models.user import User
+
+SHARED_CACHE_KEY = 'auth_user:{version}:{user_id}'
+SHARED_VERSION_KEY = 'auth_user:version'
+
+# Bộ đếm của process, xem GET /api/realtime/stats/
+AUTH_CACHE_STATS = {
+    'token_hits': 0,
+    'token_misses': 0,
+    'user_hits': 0,
+    'user_shared_hits': 0,
+    'user_misses': 0,
+    'invalidations': 0,
+}
+
+
+def _ttl():
+    return getattr(settings, 'AUTH_CACHE_TTL', 60)
+
+
+def _max_size():
+    return getattr(settings, 'AUTH_CACHE_MAX_SIZE', 10000)
+
+
+class LRUCache:
+    """LRU có TTL, an toàn khi dùng từ nhiều thread (worker WSGI / thread pool của ASGI)."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_tokens = LRUCache(_max_size())
+_users = LRUCache(_max_size())
+
+
+def get_validated_token(raw_token, validate):
+    """validate(raw_token) chỉ được gọi khi token chưa có trong cache."""
+    key = raw_token.decode('utf-8') if isinstance(raw_token, bytes) else raw_token
+    token = _tokens.get(key)
+    if token is not None:
+        AUTH_CACHE_STATS['token_hits'] += 1
+        return token
+
+    AUTH_CACHE_STATS['token_misses'] += 1
+    token = validate(raw_token)
+    ttl = _ttl()
+    exp = token.get('exp') if hasattr(token, 'get') else None
+    if exp:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        _tokens.set(key, token, ttl)
+    return token
+
+
+def _snapshot(user):
+    values = {field.attname: getattr(user, field.attname) for field in User._meta.concrete_fields}
+    enterprise = User.enterprise.field.get_cached_value(user, None)
+    if enterprise is not None:
+        enterprise = {field.attname: getattr(enterprise, field.attname) for field in Enterprise._meta.concrete_fields}
+    return values, enterprise
+
+
+def _restore(snapshot):
+    values, enterprise_values = snapshot
+    user = User.from_db('default', list(values), list(values.values()))
+    if enterprise_values is not None:
+        enterprise = Enterprise.from_db('default', list(enterprise_values), list(enterprise_values.values()))
+        User.enterprise.field.set_cached_value(user, enterprise)
+    return user
+
+
+def _shared_version():
+    version = cache.get(SHARED_VERSION_KEY)
+    if version is None:
+        # Chưa có hoặc bị evict: giá trị mới, không trùng version cũ
+        cache.add(SHARED_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(SHARED_VERSION_KEY)
+    return version
+
+
+def _shared_key(user_id):
+    return SHARED_CACHE_KEY.format(version=_shared_version(), user_id=user_id)
+
+
+def get_user(user_id):
+    """User theo user_id (kèm enterprise), None nếu không tồn tại."""
+    snapshot = _users.get(user_id)
+    if snapshot is not None:
+        AUTH_CACHE_STATS['user_hits'] += 1
+        return _restore(snapshot)
+
+    use_shared = getattr(settings, 'AUTH_CACHE_USE_SHARED', False)
+    if use_shared:
+        shared_key = _shared_key(user_id)
+        snapshot = cache.get(shared_key)
+        if snapshot is not None:
+            AUTH_CACHE_STATS['user_shared_hits'] += 1
+            _users.set(user_id, snapshot, _ttl())
+            return _restore(snapshot)
+
+    AUTH_CACHE_STATS['user_misses'] += 1
+    user = User.objects.select_related('enterprise').filter(user_id=user_id).first()
+    if user is None:
+        return None
+    snapshot = _snapshot(user)
+    _users.set(user_id, snapshot, _ttl())
+    if use_shared:
+        cache.set(shared_key, snapshot, _ttl())
+    return user
+
+
+def invalidate_user(user_id):
+    AUTH_CACHE_STATS['invalidations'] += 1
+    _users.delete(user_id)
+    if getattr(settings, 'AUTH_CACHE_USE_SHARED', False):
+        cache.delete(_shared_key(user_id))
+
+
+def invalidate_all_users():
+    # Enterprise đổi: snapshot nào cũng có thể chứa enterprise cũ
+    AUTH_CACHE_STATS['invalidations'] += 1
+    _users.clear()
+    if getattr(settings, 'AUTH_CACHE_USE_SHARED', False):
+        cache.set(SHARED_VERSION_KEY, time.time_ns(), None)
+
+
+def cache_sizes():
+    return {'tokens': len(_tokens), 'users': len(_users)}
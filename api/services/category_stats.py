@@ -0,0 +1,81 @@
+# api/services/category_stats.py
+"""
+Thống kê task theo category của một project trong MỘT câu truy vấn
+(COUNT có điều kiện + GROUP BY), có cache theo project.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from api.models.task import Task
+from api.models.task_category import TaskCategory
+
+CACHE_KEY = 'category_stats:{project_id}'
+
+
+def _status_key(status):
+    # 'In Progress' -> 'in_progress'
+    return status.lower().replace(' ', '_')
+
+
+def _cache_timeout():
+    return getattr(settings, 'CATEGORY_STATS_CACHE_TIMEOUT', 60)
+
+
+def compute_project_category_stats(project_id):
+    """
+    Tính thống kê cho tất cả category của project.
+
+    Returns:
+        List dict theo từng category: số task theo status, tỉ lệ hoàn thành, số task quá hạn
+    """
+    today = timezone.now().date()
+    annotations = {
+        f'count_{_status_key(value)}': Count('tasks', filter=Q(tasks__status=value))
+        for value, _ in Task.STATUS_CHOICES
+    }
+    rows = TaskCategory.objects.filter(project_id=project_id).values('id', 'name').annotate(
+        total=Count('tasks'),
+        overdue=Count('tasks', filter=Q(tasks__due_date__lt=today) & ~Q(tasks__status='Done')),
+        **annotations
+    ).order_by('created_at')
+
+    result = []
+    for row in rows:
+        stats = {_status_key(value): row[f'count_{_status_key(value)}'] for value, _ in Task.STATUS_CHOICES}
+        total = row['total']
+        result.append({
+            'id': row['id'],
+            'name': row['name'],
+            'tasks_count': total,
+            'completed_tasks_count': stats['done'],
+            'completion_rate': round(stats['done'] * 100 / total, 2) if total else 0.0,
+            'overdue_count': row['overdue'],
+            'stats': stats,
+        })
+    return result
+
+
+def get_project_category_stats(project_id, use_cache=True):
+    """Lấy thống kê category của project, ưu tiên từ cache."""
+    if not use_cache:
+        return compute_project_category_stats(project_id)
+
+    key = CACHE_KEY.format(project_id=project_id)
+    result = cache.get(key)
+    if result is None:
+        result = compute_project_category_stats(project_id)
+        cache.set(key, result, _cache_timeout())
+    return result
+
+
+def invalidate_project_stats(project_id):
+    """
+    Xóa cache thống kê của project (gọi khi task/category thay đổi).
+    Xóa sau khi transaction commit: xóa sớm hơn thì request khác có thể đọc dữ liệu cũ
+    (chưa commit) và ghi lại vào cache.
+    """
+    if project_id:
+        transaction.on_commit(lambda: cache.delete(CACHE_KEY.format(project_id=project_id)))
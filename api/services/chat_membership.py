@@ -0,0 +1,69 @@
+# api/services/chat_membership.py
+"""
+Cache kết quả kiểm tra quyền vào phòng chat khi mở WebSocket, theo (user_id, chatroom_id).
+
+Khi reconnect hàng loạt (sau deploy), mỗi connect chỉ đọc cache thay vì 2 câu truy vấn.
+Cache bị xóa khi ChatRoomParticipant được thêm / xóa (xem api/signals.py), TTL là lưới an toàn.
+NO_ROOM không được cache: phòng có thể được tạo ngay sau đó (khóa theo từng user nên không
+xóa được khi ChatRoom được tạo).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
+
+from api.models.chatroom import ChatRoom, ChatRoomParticipant
+
+CACHE_KEY = 'chat_membership:{user_id}:{chatroom_id}'
+
+# Kết quả kiểm tra
+MEMBER = 'member'
+NOT_MEMBER = 'not_member'
+NO_ROOM = 'no_room'
+
+
+def normalize_chatroom_id(room_name):
+    """Chấp nhận cả "chat_XXX", "chat-XXX" và "XXX", trả về chatroom_id dạng "chat-XXX"."""
+    if room_name.startswith('chat_'):
+        return room_name.replace('chat_', 'chat-', 1)
+    if room_name.startswith('chat-'):
+        return room_name
+    return f'chat-{room_name}'
+
+
+def _cache_timeout():
+    return getattr(settings, 'CHAT_MEMBERSHIP_CACHE_TIMEOUT', 300)
+
+
+def _lookup(user_id, chatroom_id):
+    """Một câu truy vấn: phòng có tồn tại không và user có trong phòng không."""
+    is_member = ChatRoom.objects.filter(chatroom_id=chatroom_id).annotate(
+        is_member=Exists(ChatRoomParticipant.objects.filter(chatroom=OuterRef('pk'), user_id=user_id))
+    ).values_list('is_member', flat=True).first()
+    if is_member is None:
+        return NO_ROOM
+    return MEMBER if is_member else NOT_MEMBER
+
+
+def cached_room_access(user_id, chatroom_id):
+    """Chỉ đọc cache (không truy vấn DB); None nếu chưa có."""
+    return cache.get(CACHE_KEY.format(user_id=user_id, chatroom_id=chatroom_id))
+
+
+def get_room_access(user_id, chatroom_id, use_cache=True):
+    """
+    Returns:
+        MEMBER, NOT_MEMBER hoặc NO_ROOM
+    """
+    if use_cache:
+        access = cached_room_access(user_id, chatroom_id)
+        if access is not None:
+            return access
+
+    access = _lookup(user_id, chatroom_id)
+    if access != NO_ROOM:
+        cache.set(CACHE_KEY.format(user_id=user_id, chatroom_id=chatroom_id), access, _cache_timeout())
+    return access
+
+
+def invalidate_membership(user_id, chatroom_id):
+    cache.delete(CACHE_KEY.format(user_id=user_id, chatroom_id=chatroom_id))
@@ -0,0 +1,176 @@
+# api/services/chat_messages.py
+"""
+Ghi tin nhắn chat từ WebSocket.
+
+Mỗi kết nối giữ một MessageWriter: phòng và người gửi đã được kiểm tra lúc connect
+nên không cần truy vấn lại; tin nhắn được tạo theo khóa ngoại (chatroom_id, sent_by_id)
+và payload broadcast được dựng trực tiếp -> mỗi tin nhắn chỉ tốn 1 câu INSERT.
+
+Chế độ ghi trễ (settings.CHAT_WRITE_BEHIND): tin nhắn được gán ID + sent_at và broadcast
+ngay, MessageBuffer gom lại rồi bulk_create sau CHAT_WRITE_BEHIND_FLUSH_MS hoặc khi đủ
+CHAT_WRITE_BEHIND_BATCH_SIZE tin; luôn flush khi socket ngắt kết nối và khi process thoát.
+Đánh đổi: tin đã broadcast có thể chưa có trong DB trong vài chục ms (hoặc mất nếu process bị kill).
+"""
+import atexit
+import asyncio
+import uuid
+import weakref
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from api.models.message import Message
+from api.models.user import User
+from api.serializers.user_serializer import UserSerializer
+
+_sent_at_field = serializers.DateTimeField()
+
+
+def new_message_id():
+    return f"msg-{str(uuid.uuid4())[:8]}"
+
+
+class MessageWriter:
+    def __init__(self, chatroom_id, sender):
+        self.chatroom_id = chatroom_id
+        self.sender = sender
+        self._sender_payload = None
+        # receiver_id -> dữ liệu UserSerializer (None nếu user không tồn tại)
+        self._receiver_payloads = {}
+
+    @property
+    def sender_payload(self):
+        if self._sender_payload is None:
+            self._sender_payload = UserSerializer(self.sender).data
+        return self._sender_payload
+
+    def is_warm(self, receiver_id=None):
+        """True nếu build() không cần truy vấn DB (payload người gửi / người nhận đã có)."""
+        return self._sender_payload is not None and (not receiver_id or receiver_id in self._receiver_payloads)
+
+    def warm(self, receiver_id=None):
+        self.sender_payload
+        self.receiver_payload(receiver_id)
+
+    def receiver_payload(self, receiver_id):
+        if not receiver_id:
+            return None
+        if receiver_id not in self._receiver_payloads:
+            receiver = User.objects.select_related('enterprise').filter(user_id=receiver_id).first()
+            self._receiver_payloads[receiver_id] = UserSerializer(receiver).data if receiver else None
+        return self._receiver_payloads[receiver_id]
+
+    def build(self, content, receiver_id=None):
+        """Tạo Message (chưa lưu) và payload giống MessageSerializer."""
+        receiver = self.receiver_payload(receiver_id)
+        message = Message(
+            message_id=new_message_id(),
+            content=content,
+            chatroom_id=self.chatroom_id,
+            sent_by_id=self.sender.user_id,
+            receiver_id=receiver['user_id'] if receiver else None,
+            sent_at=timezone.now()
+        )
+        payload = {
+            'message_id': message.message_id,
+            'content': message.content,
+            'attachment_url': None,
+            'attachment_type': None,
+            'is_read': False,
+            'sent_at': _sent_at_field.to_representation(message.sent_at),
+            'chatroom': self.chatroom_id,
+            'sent_by': self.sender_payload,
+            'receiver': receiver,
+        }
+        return message, payload
+
+    def save(self, content, receiver_id=None):
+        """Lưu một tin nhắn (1 INSERT) và trả về payload để broadcast."""
+        message, payload = self.build(content, receiver_id)
+        message.save(force_insert=True)
+        return payload
+
+
+def _bulk_insert(messages):
+    try:
+        Message.objects.bulk_create(messages)
+    except Exception as e:
+        # Một tin lỗi (vd. phòng vừa bị xóa) không được làm mất cả lô
+        print(f"⚠️ Chat write-behind bulk insert failed ({len(messages)} messages): {str(e)}")
+        for message in messages:
+            try:
+                message.save(force_insert=True)
+            except Exception as e:
+                print(f"⚠️ Dropped chat message {message.message_id}: {str(e)}")
+
+
+class MessageBuffer:
+    """Bộ đệm ghi trễ dùng chung cho mọi socket trên cùng một event loop."""
+
+    def __init__(self, flush_interval, batch_size):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = []
+        self._timer = None
+        self._inflight = set()
+
+    def add(self, message):
+        self._pending.append(message)
+        if len(self._pending) >= self.batch_size:
+            self._schedule_write()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.flush_interval, self._schedule_write)
+
+    def _schedule_write(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return None
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(database_sync_to_async(_bulk_insert)(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        return task
+
+    async def flush(self):
+        """Ghi hết tin đang chờ và đợi các lô đang ghi dở."""
+        self._schedule_write()
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight))
+
+    def flush_sync(self):
+        # Dùng khi process thoát: event loop có thể đã dừng
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            _bulk_insert(batch)
+
+
+_buffers = weakref.WeakKeyDictionary()
+
+
+def get_message_buffer():
+    """MessageBuffer của event loop hiện tại, hoặc None nếu không bật CHAT_WRITE_BEHIND."""
+    if not getattr(settings, 'CHAT_WRITE_BEHIND', False):
+        return None
+    loop = asyncio.get_running_loop()
+    buffer = _buffers.get(loop)
+    if buffer is None:
+        buffer = MessageBuffer(
+            getattr(settings, 'CHAT_WRITE_BEHIND_FLUSH_MS', 50) / 1000,
+            getattr(settings, 'CHAT_WRITE_BEHIND_BATCH_SIZE', 100)
+        )
+        _buffers[loop] = buffer
+    return buffer
+
+
+@atexit.register
+def _flush_on_exit():
+    for buffer in list(_buffers.values()):
+        buffer.flush_sync()
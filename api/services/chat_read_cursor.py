@@ -0,0 +1,80 @@
+# api/services/chat_read_cursor.py
+"""
+Trạng thái "đã đọc" của chat theo con trỏ riêng cho từng thành viên
+(ChatRoomParticipant.last_read_at) thay vì cờ is_read dùng chung trên Message.
+
+- Đánh dấu đã đọc: một câu UPDATE trên đúng một dòng participant.
+- Đếm chưa đọc: một câu COUNT theo khoảng sent_at > last_read_at (index chatroom + sent_at).
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Count, DateTimeField, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.models.chatroom import ChatRoomParticipant
+from api.models.message import Message
+
+# Thành viên chưa đọc lần nào: mọi tin nhắn đều tính là chưa đọc
+NEVER_READ = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def mark_read(chatroom_id, user_id, message_id=None):
+    """
+    Dời con trỏ đã đọc của user trong phòng tới message_id (hoặc tới hiện tại).
+    Con trỏ chỉ tiến lên, không bao giờ lùi lại.
+
+    Returns:
+        (last_read_at, last_read_message_id)
+    """
+    read_at = None
+    if message_id:
+        read_at = Message.objects.filter(
+            chatroom_id=chatroom_id, message_id=message_id
+        ).values_list('sent_at', flat=True).first()
+    if read_at is None:
+        read_at = timezone.now()
+        message_id = None
+
+    changes = {'last_read_at': read_at}
+    if message_id:
+        changes['last_read_message_id'] = message_id
+
+    ChatRoomParticipant.objects.filter(
+        chatroom_id=chatroom_id, user_id=user_id
+    ).filter(
+        Q(last_read_at__isnull=True) | Q(last_read_at__lt=read_at)
+    ).update(**changes)
+    return read_at, message_id
+
+
+def unread_count(chatroom_id, user):
+    """Số tin nhắn chưa đọc của user trong một phòng."""
+    last_read_at = ChatRoomParticipant.objects.filter(
+        chatroom_id=chatroom_id, user=user
+    ).values_list('last_read_at', flat=True).first()
+    return Message.objects.filter(
+        chatroom_id=chatroom_id, sent_at__gt=last_read_at or NEVER_READ
+    ).exclude(sent_by=user).count()
+
+
+def annotate_unread_count(queryset, user, name='annotated_unread_count'):
+    """Annotate số tin chưa đọc của user cho queryset ChatRoom (subquery, không N+1)."""
+    last_read = ChatRoomParticipant.objects.filter(
+        chatroom=OuterRef('pk'), user=user
+    ).values('last_read_at')[:1]
+
+    unread = Message.objects.filter(
+        chatroom=OuterRef('pk'), sent_at__gt=OuterRef('my_last_read_at')
+    ).exclude(sent_by=user).order_by().values('chatroom').annotate(
+        total=Count('pk')
+    ).values('total')
+
+    return queryset.annotate(
+        my_last_read_at=Coalesce(
+            Subquery(last_read, output_field=DateTimeField()),
+            Value(NEVER_READ, output_field=DateTimeField())
+        )
+    ).annotate(**{
+        name: Coalesce(Subquery(unread, output_field=IntegerField()), 0)
+    })
@@ -0,0 +1,104 @@
+# api/services/id_allocator.py
+"""
+Cấp phát ID dạng '<prefix>-<n>' cho các model (task-1, prj-1, prju-1, cat-1, ...).
+
+Thay vì quét MAX() trên cả bảng mỗi lần insert, mỗi process giữ trước một
+block số từ bảng api_idsequence rồi cấp phát dần trong bộ nhớ. Hai worker
+luôn nhận hai block khác nhau nên không bao giờ trùng ID.
+"""
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+
+from api.models.id_sequence import IdSequence
+
+_lock = threading.Lock()
+# prefix -> [số tiếp theo, số kết thúc (không bao gồm)]
+_blocks = {}
+
+
+def _block_size():
+    return max(1, int(getattr(settings, 'ID_SEQUENCE_BLOCK_SIZE', 20)))
+
+
+def _initial_value(model, prefix):
+    """
+    Giá trị khởi tạo cho prefix mới: quét ID hiện có MỘT lần duy nhất
+    để tiếp tục đánh số sau dữ liệu cũ.
+    """
+    pk_name = model._meta.pk.attname
+    existing_ids = model.objects.filter(
+        **{f'{pk_name}__startswith': f'{prefix}-'}
+    ).values_list(pk_name, flat=True)
+
+    max_num = 0
+    for existing_id in existing_ids.iterator():
+        try:
+            max_num = max(max_num, int(existing_id[len(prefix) + 1:]))
+        except ValueError:
+            continue
+    return max_num + 1
+
+
+def _reserve(model, prefix, count):
+    """Giữ chỗ các số [start, start + count) trong bảng bộ đếm, trả về start."""
+    with transaction.atomic():
+        sequence = IdSequence.objects.select_for_update().filter(prefix=prefix).first()
+        if sequence is None:
+            try:
+                with transaction.atomic():
+                    sequence = IdSequence.objects.create(
+                        prefix=prefix,
+                        next_value=_initial_value(model, prefix)
+                    )
+            except IntegrityError:
+                # Worker khác vừa tạo dòng này
+                sequence = IdSequence.objects.select_for_update().get(prefix=prefix)
+
+        start = sequence.next_value
+        sequence.next_value = start + count
+        sequence.save(update_fields=['next_value', 'updated_at'])
+    return start
+
+
+def allocate_ids(model, prefix, count=1):
+    """
+    Cấp phát `count` ID liên tiếp cho model.
+
+    Args:
+        model: class model dùng để khởi tạo bộ đếm lần đầu
+        prefix: tiền tố ID, ví dụ 'task'
+        count: số lượng ID cần cấp
+
+    Returns:
+        List các ID dạng '<prefix>-<n>'
+    """
+    if count <= 0:
+        return []
+
+    if connection.in_atomic_block:
+        # Đang nằm trong transaction của caller: nếu transaction bị rollback thì
+        # bộ đếm cũng rollback, nên không được giữ block trong bộ nhớ.
+        start = _reserve(model, prefix, count)
+        return [f'{prefix}-{n}' for n in range(start, start + count)]
+
+    ids = []
+    with _lock:
+        block = _blocks.get(prefix)
+        while len(ids) < count:
+            if block is None or block[0] >= block[1]:
+                size = max(_block_size(), count - len(ids))
+                start = _reserve(model, prefix, size)
+                block = [start, start + size]
+                _blocks[prefix] = block
+
+            take = min(count - len(ids), block[1] - block[0])
+            ids.extend(f'{prefix}-{n}' for n in range(block[0], block[0] + take))
+            block[0] += take
+    return ids
+
+
+def next_id(model, prefix):
+    """Cấp phát một ID mới cho model, ví dụ next_id(Task, 'task') -> 'task-42'."""
+    return allocate_ids(model, prefix, 1)[0]
@@ -0,0 +1,84 @@
+# api/services/lookup_memo.py
+"""
+Identity map theo request cho các đối tượng được serializer tra theo ID
+(assignee_id, project_id, category_id, task_ids...).
+
+validate_<field>(), validate(), create() / update() và các serializer khác trong
+cùng request dùng chung một LookupMemo, nên mỗi đối tượng chỉ được load tối đa
+một lần; danh sách ID được load bằng một truy vấn in_bulk cho các ID chưa có.
+
+    memo = lookup_memo(self.context)
+    project = memo.get(Project, project_id)         # None nếu không tồn tại
+    tasks = memo.get_many(Task, task_ids)           # dict task_id -> Task (bỏ ID không tồn tại)
+
+Memo gắn vào request (context['request']); không có request thì gắn vào context.
+Kết quả "không tồn tại" cũng được nhớ. Chỉ dùng cho đối tượng liên quan (chỉ đọc),
+không dùng cho đối tượng đang được sửa.
+"""
+from django.db.models import QuerySet
+
+_ATTR = '_lookup_memo'
+
+
+def _split(model_or_queryset):
+    if isinstance(model_or_queryset, QuerySet):
+        return model_or_queryset.model, model_or_queryset
+    return model_or_queryset, model_or_queryset._default_manager.all()
+
+
+class LookupMemo:
+    def __init__(self):
+        # model -> {pk: object hoặc None}
+        self._objects = {}
+
+    def _cache(self, model):
+        return self._objects.setdefault(model, {})
+
+    def get(self, model_or_queryset, pk):
+        """Đối tượng có khóa chính `pk`, hoặc None. Queryset dùng để thêm select_related nếu cần."""
+        if pk in (None, ''):
+            return None
+        return self.get_many(model_or_queryset, [pk]).get(pk)
+
+    def get_many(self, model_or_queryset, pks):
+        """Dict pk -> đối tượng cho các pk tồn tại; các pk chưa có trong memo được load bằng một in_bulk."""
+        model, queryset = _split(model_or_queryset)
+        cache = self._cache(model)
+        pks = [pk for pk in dict.fromkeys(pks) if pk not in (None, '')]
+
+        missing = [pk for pk in pks if pk not in cache]
+        if missing:
+            found = queryset.in_bulk(missing)
+            for pk in missing:
+                cache[pk] = found.get(pk)
+
+        return {pk: cache[pk] for pk in pks if cache[pk] is not None}
+
+    def prime(self, objects):
+        """Thêm các đối tượng đã load sẵn (vd. kết quả in_bulk của thao tác hàng loạt)."""
+        for obj in objects:
+            self._cache(type(obj))[obj.pk] = obj
+
+    def forget(self, model, pk=None):
+        """Bỏ một đối tượng (hoặc cả model) khỏi memo, vd. sau khi nó bị sửa / xóa."""
+        if pk is None:
+            self._objects.pop(model, None)
+        else:
+            self._cache(model).pop(pk, None)
+
+
+def lookup_memo(context):
+    """LookupMemo dùng chung cho request của serializer context (tạo mới nếu chưa có)."""
+    request = context.get('request') if context is not None else None
+    # Gắn vào HttpRequest: mọi rest_framework Request bọc cùng request đều thấy
+    holder = getattr(request, '_request', request)
+    if holder is None:
+        if context is None:
+            return LookupMemo()
+        return context.setdefault(_ATTR, LookupMemo())
+
+    memo = getattr(holder, _ATTR, None)
+    if memo is None:
+        memo = LookupMemo()
+        setattr(holder, _ATTR, memo)
+    return memo
@@ -0,0 +1,77 @@
+# api/services/message_history.py
+"""
+Phân trang lịch sử tin nhắn theo keyset (sent_at, message_id), dùng chung cho
+REST (ChatRoomViewSet.messages) và WebSocket (ChatConsumer, type 'load_history').
+"""
+from django.db.models import Q
+
+from api.models.message import Message
+from api.serializers.message_serializer import MessageSerializer
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_limit(value):
+    """Chuyển limit từ query/payload sang int trong khoảng [1, MAX_LIMIT]."""
+    if value in (None, ''):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _anchor(chatroom_id, message_id):
+    sent_at = Message.objects.filter(
+        chatroom_id=chatroom_id, message_id=message_id
+    ).values_list('sent_at', flat=True).first()
+    if sent_at is None:
+        raise ValueError(f"Message '{message_id}' not found in chatroom '{chatroom_id}'")
+    return sent_at, message_id
+
+
+def get_message_history(chatroom_id, before=None, after=None, limit=DEFAULT_LIMIT):
+    """
+    Lấy một trang tin nhắn của phòng, luôn trả về theo thứ tự thời gian tăng dần.
+
+    Args:
+        before: message_id - lấy các tin CŨ hơn tin này (cuộn lên)
+        after: message_id - lấy các tin MỚI hơn tin này (đồng bộ tiếp)
+        limit: số tin tối đa
+        Không có before/after: lấy `limit` tin mới nhất.
+
+    Returns:
+        Dict {'results', 'has_more', 'before', 'after'}; 'before'/'after' là
+        message_id dùng làm con trỏ cho trang kế tiếp.
+    """
+    queryset = Message.objects.filter(chatroom_id=chatroom_id).select_related(
+        'sent_by__enterprise', 'receiver__enterprise'
+    )
+
+    if after:
+        sent_at, message_id = _anchor(chatroom_id, after)
+        queryset = queryset.filter(
+            Q(sent_at__gt=sent_at) | Q(sent_at=sent_at, message_id__gt=message_id)
+        ).order_by('sent_at', 'message_id')
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+    else:
+        if before:
+            sent_at, message_id = _anchor(chatroom_id, before)
+            queryset = queryset.filter(
+                Q(sent_at__lt=sent_at) | Q(sent_at=sent_at, message_id__lt=message_id)
+            )
+        rows = list(queryset.order_by('-sent_at', '-message_id')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        rows.reverse()
+
+    return {
+        'results': MessageSerializer(rows, many=True).data,
+        'has_more': has_more,
+        'before': rows[0].message_id if rows else before,
+        'after': rows[-1].message_id if rows else after,
+    }
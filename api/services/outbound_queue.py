@@ -0,0 +1,124 @@
+# api/services/outbound_queue.py
+"""
+Hàng đợi gửi có giới hạn cho từng WebSocket, bảo vệ server khỏi client chậm.
+
+Handler của consumer không await send() trực tiếp mà đưa frame vào OutboundQueue;
+một task riêng gửi dần ra socket. Khi client không đọc kịp (server ASGI có backpressure,
+vd. uvicorn), hàng đợi dài ra:
+
+- vượt CHAT_SEND_QUEUE_HIGH_WATER: bỏ frame ưu tiên thấp (typing, ...) - cả frame mới lẫn frame đang chờ
+- vượt CHAT_SEND_QUEUE_MAX, hoặc ở trên high-water lâu hơn CHAT_SLOW_CONSUMER_GRACE giây:
+  đóng kết nối (code 4009), client kết nối lại và tải bù qua load_history
+"""
+import asyncio
+import time
+import weakref
+from collections import deque
+
+from django.conf import settings
+
+SLOW_CONSUMER_CLOSE_CODE = 4009
+
+# Bộ đếm của process, xem GET /api/realtime/stats/
+QUEUE_STATS = {
+    'enqueued': 0,
+    'sent': 0,
+    'dropped_low_priority': 0,
+    'evicted': 0,
+}
+
+_live_queues = weakref.WeakSet()
+
+
+class OutboundQueue:
+    def __init__(self, send, close, high_water=None, max_size=None, grace=None):
+        self._send = send
+        self._close = close
+        self.high_water = high_water or getattr(settings, 'CHAT_SEND_QUEUE_HIGH_WATER', 100)
+        self.max_size = max_size or getattr(settings, 'CHAT_SEND_QUEUE_MAX', 500)
+        self.grace = grace if grace is not None else getattr(settings, 'CHAT_SLOW_CONSUMER_GRACE', 10)
+        # (kwargs cho send(), low_priority)
+        self._items = deque()
+        self._drainer = None
+        self._over_since = None
+        self.closed = False
+        _live_queues.add(self)
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, message, low_priority=False):
+        if self.closed:
+            return
+        if len(self._items) >= self.high_water:
+            if low_priority:
+                QUEUE_STATS['dropped_low_priority'] += 1
+                return
+            self._drop_low_priority()
+
+        self._items.append((message, low_priority))
+        QUEUE_STATS['enqueued'] += 1
+        self._check_limits()
+        if self._drainer is None and not self.closed:
+            self._drainer = asyncio.ensure_future(self._drain())
+
+    def _drop_low_priority(self):
+        kept = deque(item for item in self._items if not item[1])
+        QUEUE_STATS['dropped_low_priority'] += len(self._items) - len(kept)
+        self._items = kept
+
+    def _check_limits(self):
+        depth = len(self._items)
+        if depth < self.high_water:
+            self._over_since = None
+            return
+        now = time.monotonic()
+        if self._over_since is None:
+            self._over_since = now
+        if depth >= self.max_size or now - self._over_since >= self.grace:
+            self.evict()
+
+    def evict(self):
+        """Client quá chậm: bỏ hàng đợi và đóng kết nối."""
+        if self.closed:
+            return
+        QUEUE_STATS['evicted'] += 1
+        print(f"⚠️ Closing slow WebSocket consumer ({len(self._items)} frames queued)")
+        self.stop()
+        asyncio.ensure_future(self._close(SLOW_CONSUMER_CLOSE_CODE))
+
+    def stop(self):
+        self.closed = True
+        self._items.clear()
+        if self._drainer is not None:
+            self._drainer.cancel()
+            self._drainer = None
+
+    async def _drain(self):
+        try:
+            while self._items:
+                message, _ = self._items.popleft()
+                await self._send(message)
+                QUEUE_STATS['sent'] += 1
+            self._over_since = None
+        except Exception as e:
+            # Socket đã đóng phía server ASGI: không gửi tiếp
+            print(f"⚠️ WebSocket send failed: {str(e)}")
+            self.closed = True
+            self._items.clear()
+        finally:
+            if self._drainer is asyncio.current_task():
+                self._drainer = None
+
+
+def queue_depths():
+    """Độ sâu hàng đợi hiện tại của các kết nối trong process."""
+    depths = sorted(len(queue) for queue in list(_live_queues) if not queue.closed)
+    if not depths:
+        return {'connections': 0, 'total': 0, 'max': 0, 'p95': 0}
+    return {
+        'connections': len(depths),
+        'total': sum(depths),
+        'max': depths[-1],
+        'p95': depths[min(len(depths) - 1, int(len(depths) * 0.95))],
+    }
@@ -0,0 +1,146 @@
+# api/services/password_hashing.py
+"""
+Băm / kiểm tra mật khẩu bcrypt trong một thread pool riêng, có giới hạn.
+
+bcrypt nhả GIL khi tính nên thread là đủ (không cần process pool); pool chỉ có
+PASSWORD_HASH_WORKERS thread nên một đợt đăng nhập dồn dập không chiếm hết CPU của
+các request khác. Tối đa PASSWORD_HASH_QUEUE_SIZE việc được chờ thêm; vượt quá thì
+từ chối ngay (PasswordHashingBusy -> view trả 429) thay vì để worker xếp hàng.
+
+Hash có cost khác PASSWORD_BCRYPT_ROUNDS được băm lại sau khi đăng nhập thành công
+(xem LoginView), nên đổi cost chỉ cần sửa settings.
+
+ahash_password() / acheck_password() dùng trong view async (chạy dưới ASGI): await
+kết quả của pool thay vì giữ một thread chờ .result().
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from django.conf import settings
+
+# Bộ đếm của process, xem GET /api/realtime/stats/
+HASH_STATS = {
+    'hashed': 0,
+    'checked': 0,
+    'rejected': 0,
+    'rehashed': 0,
+}
+
+_lock = threading.Lock()
+_executor = None
+_pending = 0
+
+
+class PasswordHashingBusy(Exception):
+    """Hàng đợi băm mật khẩu đã đầy."""
+
+
+def _workers():
+    return getattr(settings, 'PASSWORD_HASH_WORKERS', 4)
+
+
+def _queue_size():
+    return getattr(settings, 'PASSWORD_HASH_QUEUE_SIZE', 32)
+
+
+def _rounds():
+    return getattr(settings, 'PASSWORD_BCRYPT_ROUNDS', 12)
+
+
+def _get_executor():
+    # Tạo khi dùng lần đầu (sau khi gunicorn/daphne fork worker)
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix='password-hash')
+    return _executor
+
+
+def _release(future=None):
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _submit(fn, *args):
+    global _pending
+    with _lock:
+        # Đang chạy (tối đa số worker) + đang chờ (tối đa queue size)
+        if _pending >= _workers() + _queue_size():
+            HASH_STATS['rejected'] += 1
+            raise PasswordHashingBusy()
+        _pending += 1
+        executor = _get_executor()
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        _release()
+        raise
+    # Giải phóng chỗ khi bcrypt chạy xong, kể cả khi người chờ đã bỏ đi (request bị hủy)
+    future.add_done_callback(_release)
+    return future
+
+
+def _run(fn, *args):
+    return _submit(fn, *args).result()
+
+
+async def _arun(fn, *args):
+    return await asyncio.wrap_future(_submit(fn, *args))
+
+
+def _hash(raw_password, rounds):
+    return bcrypt.hashpw(raw_password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check(raw_password, hashed):
+    return bcrypt.checkpw(raw_password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def hash_password(raw_password, rounds=None):
+    HASH_STATS['hashed'] += 1
+    return _run(_hash, raw_password, rounds or _rounds())
+
+
+def check_password(raw_password, hashed):
+    HASH_STATS['checked'] += 1
+    try:
+        return _run(_check, raw_password, hashed)
+    except ValueError:
+        # Hash trong DB không phải bcrypt (dữ liệu cũ / lỗi)
+        return False
+
+
+async def ahash_password(raw_password, rounds=None):
+    HASH_STATS['hashed'] += 1
+    return await _arun(_hash, raw_password, rounds or _rounds())
+
+
+async def acheck_password(raw_password, hashed):
+    HASH_STATS['checked'] += 1
+    try:
+        return await _arun(_check, raw_password, hashed)
+    except ValueError:
+        return False
+
+
+def needs_rehash(hashed):
+    """True nếu hash không dùng cost PASSWORD_BCRYPT_ROUNDS (dạng $2b$12$...)."""
+    try:
+        return int(hashed.split('$')[2]) != _rounds()
+    except (AttributeError, IndexError, ValueError):
+        return True
+
+
+def pool_status():
+    return {'workers': _workers(), 'queue_size': _queue_size(), 'pending': _pending}
+
+
+def reset_pool():
+    """Dựng lại pool theo settings hiện tại (dùng trong benchmark)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
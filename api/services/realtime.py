@@ -0,0 +1,101 @@
+# api/services/realtime.py
+"""
+Tên group của channel layer và các hàm đẩy sự kiện realtime từ code đồng bộ (view, signal).
+
+- chat_<chatroom_id>: mọi socket đang xem phòng chat (/ws/chat/<room>/ và /ws/user/)
+- chat_<chatroom_id>__<user_id>: socket /ws/chat/<room>/ của một user, nhận tín hiệu WebRTC gửi đích danh
+- user_<user_id>: socket /ws/user/ của user, nhận thông báo
+- project_<project_id>: socket /ws/user/ đã subscribe project, nhận sự kiện task
+"""
+import re
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+
+from api.models.project import Project
+from api.models.project_user import ProjectUser
+
+
+def chat_group(chatroom_id):
+    return f'chat_{chatroom_id}'
+
+
+def participant_group(chatroom_id, user_id):
+    # Channel layer là nơi lưu ánh xạ participant -> channel_name, dùng được khi chạy nhiều worker.
+    # user_id có thể do client gửi lên: bỏ ký tự không hợp lệ trong tên group
+    return re.sub(r'[^a-zA-Z0-9_.-]', '_', f'chat_{chatroom_id}__{user_id}')[:99]
+
+
+def user_group(user_id):
+    return f'user_{user_id}'
+
+
+def project_group(project_id):
+    return f'project_{project_id}'
+
+
+def publish(group, event):
+    """group_send sau khi transaction commit; lỗi channel layer chỉ log, không làm hỏng request."""
+    def send():
+        layer = get_channel_layer()
+        if layer is None:
+            return
+        try:
+            async_to_sync(layer.group_send)(group, event)
+        except Exception as e:
+            print(f"⚠️ Realtime publish to {group} failed: {str(e)}")
+
+    transaction.on_commit(send)
+
+
+def publish_many(events):
+    """Như publish() cho danh sách (group, event), gửi trong một lần chuyển sang event loop (thao tác hàng loạt)."""
+    events = list(events)
+    if not events:
+        return
+
+    async def send_all(layer):
+        for group, event in events:
+            try:
+                await layer.group_send(group, event)
+            except Exception as e:
+                print(f"⚠️ Realtime publish to {group} failed: {str(e)}")
+
+    def send():
+        layer = get_channel_layer()
+        if layer is not None:
+            async_to_sync(send_all)(layer)
+
+    transaction.on_commit(send)
+
+
+def task_event(task, action):
+    """Sự kiện gửi cho group project_<id> khi task được tạo / sửa / xóa."""
+    return {
+        'type': 'task_event',
+        'action': action,
+        'project_id': task.project_id,
+        'task': {
+            'task_id': task.task_id,
+            'task_name': task.task_name,
+            'status': task.status,
+            'priority': task.priority,
+            'progress': task.progress,
+            'assignee_id': task.assignee_id,
+            'category_id': task.category_id,
+            'due_date': task.due_date.isoformat() if task.due_date else None,
+            'updated_at': task.updated_at.isoformat() if task.updated_at else None,
+        },
+    }
+
+
+def has_project_access(user, project_id):
+    """Admin, manager của project hoặc thành viên (ProjectUser) mới nhận được sự kiện task."""
+    if getattr(user, 'role', '') == 'Admin':
+        return Project.objects.filter(project_id=project_id).exists()
+    return Project.objects.filter(project_id=project_id).filter(
+        Q(manager_id=user.user_id) |
+        Exists(ProjectUser.objects.filter(project=OuterRef('pk'), user_id=user.user_id))
+    ).exists()
@@ -0,0 +1,103 @@
+# api/services/task_board.py
+"""
+Kanban board của project: N task đầu của mọi cột status và tổng số task của từng cột
+trong MỘT truy vấn (thay vì gọi danh sách task một lần cho mỗi status):
+
+    SELECT ... FROM (
+        SELECT task.*, assignee.*,
+               ROW_NUMBER() OVER (PARTITION BY status ORDER BY created_at DESC, task_id DESC) AS board_row,
+               COUNT(*) OVER (PARTITION BY status) AS column_total
+        FROM api_task LEFT JOIN api_user ... WHERE project_id = %s
+    ) WHERE board_row <= N
+
+Cột sâu được tải thêm theo cursor riêng của cột (keyset theo created_at, task_id), dùng
+index task_project_status_idx (project, status, created_at).
+"""
+import base64
+import json
+
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils.dateparse import parse_datetime
+
+from api.models.task import Task
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Thứ tự trong một cột (giống phân trang mặc định của /api/tasks/)
+ORDERING = ('-created_at', '-task_id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(task):
+    position = [task.created_at.isoformat(), task.task_id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = parse_datetime(created_at)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if created_at is None or not isinstance(task_id, str):
+        raise InvalidCursor('Invalid cursor')
+    return created_at, task_id
+
+
+def board_queryset(project_id, assignee_id=None, category_id=None, priority=None):
+    """Task của board (đã lọc), kèm assignee để serialize không cần truy vấn thêm."""
+    queryset = Task.objects.filter(project_id=project_id).select_related('assignee')
+    if assignee_id:
+        queryset = queryset.filter(assignee_id=assignee_id)
+    if category_id:
+        queryset = queryset.filter(category_id=category_id)
+    if priority:
+        queryset = queryset.filter(priority=priority)
+    return queryset
+
+
+def get_board_columns(queryset, limit=DEFAULT_LIMIT):
+    """
+    Returns:
+        List cột theo Task.STATUS_CHOICES: {'status', 'total', 'tasks' (list Task), 'next_cursor'}
+    """
+    partition = {'partition_by': [F('status')]}
+    rows = queryset.annotate(
+        board_row=Window(RowNumber(), order_by=[F(field[1:]).desc() for field in ORDERING], **partition),
+        # Tính trên mọi task của cột, trước khi lọc board_row
+        column_total=Window(Count('pk'), **partition),
+    ).filter(board_row__lte=limit).order_by('status', 'board_row')
+
+    columns = {value: {'status': value, 'total': 0, 'tasks': [], 'next_cursor': None}
+               for value, _ in Task.STATUS_CHOICES}
+    for task in rows:
+        column = columns.setdefault(task.status, {'status': task.status, 'total': 0, 'tasks': [], 'next_cursor': None})
+        column['total'] = task.column_total
+        column['tasks'].append(task)
+
+    for column in columns.values():
+        if column['total'] > len(column['tasks']):
+            column['next_cursor'] = encode_cursor(column['tasks'][-1])
+    return list(columns.values())
+
+
+def get_column_page(queryset, status, cursor=None, limit=DEFAULT_LIMIT):
+    """
+    Trang tiếp theo của một cột.
+
+    Returns:
+        (list Task, next_cursor hoặc None)
+    """
+    queryset = queryset.filter(status=status)
+    if cursor:
+        created_at, task_id = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, task_id__lt=task_id))
+
+    tasks = list(queryset.order_by(*ORDERING)[:limit + 1])
+    if len(tasks) > limit:
+        return tasks[:limit], encode_cursor(tasks[limit - 1])
+    return tasks, None
@@ -0,0 +1,208 @@
+# api/services/task_bulk.py
+"""
+Tạo / sửa task hàng loạt (POST/PATCH /api/tasks/bulk/).
+
+Cả lô được kiểm tra trước với một truy vấn in_bulk cho mỗi model liên quan
+(User, Project, TaskCategory, Task; nạp vào lookup memo của request), ID được cấp một lần cho cả lô, rồi ghi bằng
+bulk_create / bulk_update trong một transaction. Task.save() không được gọi nên
+các việc của nó được làm một lần cho cả lô: bộ đếm của category (một UPDATE cho
+mỗi category bị ảnh hưởng), xóa cache thống kê project, chỉ mục tìm kiếm và sự kiện realtime.
+
+Có lỗi ở bất kỳ phần tử nào thì không ghi gì cả.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from api.models.project import Project
+from api.models.task import Task
+from api.models.task_category import TaskCategory
+from api.models.user import User
+from api.serializers.task_serializer import BulkTaskSerializer, TaskSerializer
+from api.services import task_counters, task_search, task_sync
+from api.services.category_stats import invalidate_project_stats
+from api.services.id_allocator import allocate_ids
+from api.services.lookup_memo import lookup_memo
+from api.services.realtime import project_group, publish_many, task_event
+
+BATCH_SIZE = 500
+# Trường input -> tên field của model cho bulk_update
+_UPDATE_FIELDS = {'assignee_id': 'assignee', 'project_id': 'project', 'category_id': 'category'}
+
+
+class BulkTaskError(Exception):
+    """errors: list lỗi theo thứ tự phần tử ({} cho phần tử hợp lệ), giống ListSerializer.errors."""
+
+    def __init__(self, errors):
+        super().__init__('Invalid tasks')
+        self.errors = errors
+
+
+def _ids(items, key):
+    return {item[key] for item in items if isinstance(item, dict) and isinstance(item.get(key), str) and item[key]}
+
+
+def _load_related(items, memo, tasks=()):
+    # Gồm cả quan hệ hiện tại của các task được sửa (để validate và serialize kết quả)
+    user_ids = _ids(items, 'assignee_id') | {task.assignee_id for task in tasks if task.assignee_id}
+    project_ids = _ids(items, 'project_id') | {task.project_id for task in tasks}
+    category_ids = _ids(items, 'category_id') | {task.category_id for task in tasks if task.category_id}
+    # Kèm enterprise để serialize kết quả (UserSerializer) không cần truy vấn thêm
+    memo.get_many(User.objects.select_related('enterprise'), user_ids)
+    memo.get_many(Project, project_ids)
+    memo.get_many(TaskCategory, category_ids)
+
+
+def _attach_related(task, memo):
+    # Gắn đối tượng đã load sẵn để truy cập task.assignee / project / category không phải truy vấn
+    if task.assignee_id:
+        task.assignee = memo.get(User, task.assignee_id)
+    task.project = memo.get(Project, task.project_id)
+    if task.category_id:
+        task.category = memo.get(TaskCategory, task.category_id)
+
+
+def _validate(items, context, tasks=None):
+    results, errors = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            results.append(None)
+            errors.append({'non_field_errors': ['Expected an object']})
+            continue
+        instance = None
+        if tasks is not None:
+            task_id = item.get('task_id')
+            if not isinstance(task_id, str) or not task_id:
+                results.append(None)
+                errors.append({'task_id': ['A valid task_id string is required']})
+                continue
+            instance = tasks.get(task_id)
+            if instance is None:
+                results.append(None)
+                errors.append({'task_id': [f"Task with id '{task_id}' does not exist"]})
+                continue
+        serializer = BulkTaskSerializer(instance, data=item, partial=tasks is not None, context=context)
+        if serializer.is_valid():
+            results.append(serializer.validated_data)
+            errors.append({})
+        else:
+            results.append(None)
+            errors.append(serializer.errors)
+    if any(errors):
+        raise BulkTaskError(errors)
+    return results
+
+
+def _apply_relations(task, data, memo):
+    if 'assignee_id' in data:
+        assignee_id = data.pop('assignee_id')
+        task.assignee = memo.get(User, assignee_id) if assignee_id and assignee_id.strip() else None
+    if 'project_id' in data:
+        task.project = memo.get(Project, data.pop('project_id'))
+    if 'category_id' in data:
+        task.category = memo.get(TaskCategory, data.pop('category_id'))
+    for attr, value in data.items():
+        setattr(task, attr, value)
+
+
+def _prepare_save(task):
+    # Những gì Task.save() làm trước khi ghi
+    if task.category_id and not task.category_name:
+        task.category_name = task.category.name
+    if task.status == 'Done' and task.progress != 100:
+        task.progress = 100
+
+
+def _after_write(tasks, action, deltas, project_ids):
+    for category_id, (total, completed) in deltas.items():
+        task_counters.apply_delta(category_id, total, completed)
+    for project_id in project_ids:
+        invalidate_project_stats(project_id)
+    task_search.index_tasks(tasks)
+    publish_many((project_group(task.project_id), task_event(task, action)) for task in tasks)
+
+
+def bulk_create_tasks(items, context=None):
+    """Tạo task từ list dict (như body của POST /api/tasks/), trả về list Task đã lưu."""
+    context = dict(context or {})
+    memo = lookup_memo(context)
+    _load_related(items, memo)
+    validated = _validate(items, context)
+
+    tasks = []
+    for data in validated:
+        task = Task(progress=0)
+        _apply_relations(task, dict(data), memo)
+        _prepare_save(task)
+        tasks.append(task)
+
+    deltas = defaultdict(lambda: [0, 0])
+    for task in tasks:
+        category_id, is_done = task_counters.counter_state(task)
+        if category_id:
+            deltas[category_id][0] += 1
+            deltas[category_id][1] += int(is_done)
+
+    with transaction.atomic():
+        for task, task_id in zip(tasks, allocate_ids(Task, 'task', len(tasks))):
+            task.task_id = task_id
+        Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+        for task in tasks:
+            task._counter_state = task_counters.counter_state(task)
+        _after_write(tasks, 'created', deltas, {task.project_id for task in tasks})
+    return tasks
+
+
+def bulk_update_tasks(items, context=None):
+    """Sửa task theo list dict có task_id (các trường khác như PATCH /api/tasks/{id}/), trả về list Task."""
+    task_ids = _ids(items, 'task_id')
+    context = dict(context or {})
+    memo = lookup_memo(context)
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update().in_bulk(task_ids) if task_ids else {}
+        _load_related(items, memo, tasks.values())
+        for task in tasks.values():
+            _attach_related(task, memo)
+        validated = _validate(items, context, tasks=tasks)
+
+        now = timezone.now()
+        updated, fields = {}, {'updated_at', 'status', 'progress', 'category_name'}
+        project_ids = set()
+        for item, data in zip(items, validated):
+            task = tasks[item['task_id']]
+            # Project cũ và mới đều cần xóa cache thống kê
+            project_ids.add(task.project_id)
+            fields.update(_UPDATE_FIELDS.get(name, name) for name in data)
+            # Cùng thứ tự với TaskSerializer.update() + Task.save()
+            _apply_relations(task, dict(data), memo)
+            TaskSerializer.sync_status_with_progress(task)
+            _prepare_save(task)
+            task.updated_at = now
+            project_ids.add(task.project_id)
+            # Cùng task xuất hiện nhiều lần: giữ lần sửa cuối
+            updated[task.task_id] = task
+
+        deltas = defaultdict(lambda: [0, 0])
+        for task in updated.values():
+            old_category_id, was_done = getattr(task, '_counter_state', (None, False))
+            category_id, is_done = task_counters.counter_state(task)
+            if old_category_id:
+                deltas[old_category_id][0] -= 1
+                deltas[old_category_id][1] -= int(was_done)
+            if category_id:
+                deltas[category_id][0] += 1
+                deltas[category_id][1] += int(is_done)
+            task._counter_state = (category_id, is_done)
+
+        tasks = list(updated.values())
+        Task.objects.bulk_update(tasks, sorted(fields), batch_size=BATCH_SIZE)
+        # Như signal post_save: task chuyển project để lại tombstone ở project cũ (delta sync)
+        moved = [(task.task_id, task._loaded_project_id) for task in tasks
+                 if getattr(task, '_loaded_project_id', task.project_id) != task.project_id]
+        if moved:
+            task_sync.record_tombstones(moved)
+        for task in tasks:
+            task._loaded_project_id = task.project_id
+        _after_write(tasks, 'updated', {key: value for key, value in deltas.items() if any(value)}, project_ids)
+    return tasks
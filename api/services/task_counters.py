@@ -0,0 +1,123 @@
+# api/services/task_counters.py
+"""
+Duy trì tasks_count / completed_tasks_count của TaskCategory theo kiểu tăng/giảm
+(+1/-1 bằng F()) thay vì đếm lại toàn bộ task của category sau mỗi lần lưu.
+"""
+from django.db.models import Count, F, Q
+
+from api.models.task_category import TaskCategory
+
+DONE_STATUS = 'Done'
+
+
+def counter_state(task):
+    """Trạng thái của task có ảnh hưởng tới bộ đếm: (category_id, đã xong hay chưa)."""
+    return task.category_id, task.status == DONE_STATUS
+
+
+def apply_delta(category_id, total=0, completed=0):
+    """Cộng delta vào bộ đếm của một category bằng một câu UPDATE duy nhất."""
+    if not category_id or (not total and not completed):
+        return
+    TaskCategory.objects.filter(id=category_id).update(
+        tasks_count=F('tasks_count') + total,
+        completed_tasks_count=F('completed_tasks_count') + completed
+    )
+
+
+def task_saved(task, created, previous=None):
+    """
+    Cập nhật bộ đếm sau khi task được lưu.
+
+    Args:
+        task: Task vừa lưu
+        created: True nếu là task mới
+        previous: counter_state() lúc task được load từ DB, None nếu không rõ
+    """
+    category_id, is_done = counter_state(task)
+
+    if created:
+        apply_delta(category_id, 1, int(is_done))
+        return
+
+    if previous is None:
+        # Không biết trạng thái cũ (instance không load từ DB) -> đếm lại category hiện tại
+        recount_category(category_id)
+        return
+
+    old_category_id, was_done = previous
+    if old_category_id == category_id:
+        apply_delta(category_id, 0, int(is_done) - int(was_done))
+    else:
+        # Chuyển category: trừ ở category cũ, cộng ở category mới
+        apply_delta(old_category_id, -1, -int(was_done))
+        apply_delta(category_id, 1, int(is_done))
+
+
+def task_deleted(task):
+    """Trừ bộ đếm khi task bị xóa."""
+    category_id, is_done = getattr(task, '_counter_state', None) or counter_state(task)
+    apply_delta(category_id, -1, -int(is_done))
+
+
+def recount_category(category_id):
+    """Đếm lại chính xác bộ đếm của một category."""
+    if not category_id:
+        return
+    from api.models.task import Task
+
+    counts = Task.objects.filter(category_id=category_id).aggregate(
+        total=Count('pk'),
+        completed=Count('pk', filter=Q(status=DONE_STATUS))
+    )
+    TaskCategory.objects.filter(id=category_id).update(
+        tasks_count=counts['total'],
+        completed_tasks_count=counts['completed']
+    )
+
+
+def reconcile_category_counters(project_id=None, dry_run=False):
+    """
+    Sửa sai lệch bộ đếm của các category bằng một lần GROUP BY duy nhất.
+
+    Returns:
+        List các dict {'id', 'tasks_count', 'completed_tasks_count', 'old_...'} đã sửa
+    """
+    from api.models.task import Task
+
+    tasks = Task.objects.filter(category__isnull=False)
+    categories = TaskCategory.objects.all()
+    if project_id:
+        tasks = tasks.filter(category__project_id=project_id)
+        categories = categories.filter(project_id=project_id)
+
+    actual = {
+        row['category']: (row['total'], row['completed'])
+        for row in tasks.values('category').annotate(
+            total=Count('pk'),
+            completed=Count('pk', filter=Q(status=DONE_STATUS))
+        ).order_by()
+    }
+
+    drifted = []
+    fixes = []
+    for category in categories.only('id', 'tasks_count', 'completed_tasks_count'):
+        total, completed = actual.get(category.id, (0, 0))
+        if category.tasks_count == total and category.completed_tasks_count == completed:
+            continue
+        fixes.append({
+            'id': category.id,
+            'old_tasks_count': category.tasks_count,
+            'old_completed_tasks_count': category.completed_tasks_count,
+            'tasks_count': total,
+            'completed_tasks_count': completed,
+        })
+        category.tasks_count = total
+        category.completed_tasks_count = completed
+        drifted.append(category)
+
+    if drifted and not dry_run:
+        TaskCategory.objects.bulk_update(
+            drifted, ['tasks_count', 'completed_tasks_count'], batch_size=500
+        )
+    return fixes
@@ -0,0 +1,407 @@
+# api/services/task_search.py
+"""
+Tìm kiếm task theo task_name / description bằng chỉ mục full-text thay vì
+icontains (quét toàn bảng trên cột TEXT mỗi lần gõ phím).
+
+    filter_queryset(Task.objects.all(), 'thiết kế api')  # ?search= của /api/tasks/
+    search(queryset, 'thiết kế ap', limit=20)             # GET /api/tasks/search/?q= (xếp hạng)
+
+Từ khóa được tách thành từ (không phân biệt hoa thường, bỏ dấu); mọi từ phải có
+trong task, từ cuối cùng được khớp theo tiền tố (gợi ý khi đang gõ).
+
+Backend (settings.TASK_SEARCH_BACKEND):
+- 'mysql': FULLTEXT INDEX task_fulltext_idx (task_name, description), MATCH ... AGAINST
+  IN BOOLEAN MODE (collation *_ci không phân biệt dấu). MySQL tự cập nhật chỉ mục khi ghi. Tạo chỉ mục bằng
+  `python manage.py task_search_index`. Từ ngắn hơn innodb_ft_min_token_size (3)
+  bị bỏ qua, trừ từ cuối (khớp tiền tố).
+- 'memory': chỉ mục đảo ngược trong bộ nhớ của process (SQLite / test / dev), dựng lại
+  từ DB ở lần tìm đầu tiên và được cập nhật qua signal của Task (api/signals.py).
+  Mỗi process có chỉ mục riêng: chỉ dùng khi một process ghi task.
+- 'icontains': quét bảng như trước, không dùng chỉ mục.
+- 'auto' (mặc định): 'mysql' nếu DB là MySQL, ngược lại 'memory'.
+"""
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from api.models.task import Task
+
+FULLTEXT_INDEX = 'task_fulltext_idx'
+# Trọng số của một lần xuất hiện trong task_name so với trong description
+NAME_WEIGHT = 3
+# Tiền tố ngắn hơn thì khớp nguyên từ (tiền tố 1 ký tự khớp gần hết từ điển)
+MIN_PREFIX_LENGTH = 2
+MYSQL_MIN_TOKEN_SIZE = 3
+# Số task_id mỗi lần lọc theo queryset khi xếp hạng bằng chỉ mục bộ nhớ
+CHUNK_SIZE = 1000
+# Chỉ mục bộ nhớ: khớp nhiều task hơn thì ?search= giao với task_id của queryset
+# thay vì WHERE task_id IN (...) với cả tập (xem _filter_matching)
+MAX_FILTER_IDS = 5000
+
+_WORD = re.compile(r'\w+')
+
+
+def fold(text):
+    """Chữ thường, bỏ dấu tiếng Việt ('Thiết kế' -> 'thiet ke')."""
+    text = unicodedata.normalize('NFKD', (text or '').lower()).replace('đ', 'd')
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    return _WORD.findall(fold(text))
+
+
+def _terms(query):
+    """(các từ khớp nguyên từ, tiền tố của từ cuối hoặc None)."""
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return [], None
+    last = terms[-1]
+    if len(last) < MIN_PREFIX_LENGTH:
+        return terms, None
+    return terms[:-1], last
+
+
+class MemoryIndex:
+    """Chỉ mục đảo ngược: từ -> {task_id: trọng số}."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        self._documents = {}
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self.built = False
+
+    def build(self):
+        with self._lock:
+            self._postings, self._documents = {}, {}
+            rows = Task.objects.values_list('task_id', 'task_name', 'description').order_by().iterator(chunk_size=5000)
+            for task_id, name, description in rows:
+                self._add(task_id, name, description)
+            self._vocabulary_dirty = True
+            self.built = True
+
+    def _add(self, task_id, name, description):
+        weights = {}
+        for token in tokenize(name):
+            weights[token] = weights.get(token, 0) + NAME_WEIGHT
+        for token in tokenize(description):
+            weights[token] = weights.get(token, 0) + 1
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary_dirty = True
+            postings[task_id] = weight
+        self._documents[task_id] = tuple(weights)
+
+    def _remove(self, task_id):
+        for token in self._documents.pop(task_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(task_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def update(self, task_id, name, description):
+        with self._lock:
+            self._remove(task_id)
+            self._add(task_id, name, description)
+
+    def remove(self, task_id):
+        with self._lock:
+            self._remove(task_id)
+
+    def _expand(self, prefix):
+        # Các từ trong từ điển bắt đầu bằng prefix (từ điển được sắp xếp, tìm bằng bisect)
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\uffff')
+        return self._vocabulary[start:end]
+
+    def _groups(self, query):
+        # Mỗi từ của query -> các từ trong chỉ mục khớp với nó (từ cuối: mọi từ cùng tiền tố)
+        exact, prefix = _terms(query)
+        groups = [[term] for term in exact]
+        if prefix is not None:
+            groups.append(self._expand(prefix))
+        return groups
+
+    def _match(self, groups):
+        # Task chứa mọi từ: giao các tập, tập nhỏ nhất trước
+        matches = []
+        for tokens in groups:
+            ids = set()
+            for token in tokens:
+                ids.update(self._postings.get(token, ()))
+            matches.append(ids)
+        matches.sort(key=len)
+        result = matches[0]
+        for ids in matches[1:]:
+            if not result:
+                break
+            result = result & ids
+        return result
+
+    def ids(self, query):
+        """Tập task_id khớp mọi từ của query (không xếp hạng)."""
+        with self._lock:
+            if not self.built:
+                self.build()
+            groups = self._groups(query)
+            return self._match(groups) if groups else set()
+
+    def search(self, query, limit=None):
+        """List (task_id, điểm tf-idf) khớp mọi từ của query, điểm giảm dần (tối đa limit phần tử)."""
+        with self._lock:
+            if not self.built:
+                self.build()
+            groups = self._groups(query)
+            if not groups:
+                return []
+            matched = self._match(groups)
+            total = max(len(self._documents), 1)
+            scores = dict.fromkeys(matched, 0.0)
+            for tokens in groups:
+                if len(tokens) == 1:
+                    postings = self._postings.get(tokens[0], {})
+                    idf = math.log(1 + total / max(len(postings), 1))
+                    for task_id in matched:
+                        scores[task_id] += postings[task_id] * idf
+                    continue
+                # Các từ cùng tiền tố: lấy điểm cao nhất
+                best = {}
+                for token in tokens:
+                    postings = self._postings[token]
+                    idf = math.log(1 + total / len(postings))
+                    for task_id in matched.intersection(postings):
+                        score = postings[task_id] * idf
+                        if score > best.get(task_id, 0):
+                            best[task_id] = score
+                for task_id, score in best.items():
+                    scores[task_id] += score
+
+        key = lambda item: (-item[1], item[0])
+        if limit is not None and limit < len(scores):
+            return heapq.nsmallest(limit, scores.items(), key=key)
+        return sorted(scores.items(), key=key)
+
+    def size(self):
+        with self._lock:
+            return {'tasks': len(self._documents), 'terms': len(self._postings)}
+
+
+_memory_index = MemoryIndex()
+
+
+def backend():
+    name = getattr(settings, 'TASK_SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        return 'mysql' if connection.vendor == 'mysql' else 'memory'
+    return name
+
+
+def memory_index():
+    return _memory_index
+
+
+def reset():
+    """Bỏ chỉ mục bộ nhớ (dựng lại ở lần tìm sau), vd. sau khi xóa task bằng SQL trực tiếp."""
+    global _memory_index
+    _memory_index = MemoryIndex()
+
+
+# ----- MySQL FULLTEXT -----
+
+def _boolean_query(query):
+    exact, prefix = _terms(query)
+    terms = [f'+{term}' for term in exact if len(term) >= MYSQL_MIN_TOKEN_SIZE]
+    if prefix is not None:
+        terms.append(f'+{prefix}*')
+    return ' '.join(terms)
+
+
+def _match_sql():
+    table = connection.ops.quote_name(Task._meta.db_table)
+    return f'MATCH ({table}.`task_name`, {table}.`description`) AGAINST (%s IN BOOLEAN MODE)'
+
+
+def _icontains(queryset, query):
+    return queryset.filter(Q(task_name__icontains=query) | Q(description__icontains=query))
+
+
+def fulltext_index_exists():
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM information_schema.statistics '
+            'WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s LIMIT 1',
+            [Task._meta.db_table, FULLTEXT_INDEX]
+        )
+        return cursor.fetchone() is not None
+
+
+# Kiểm tra index một lần mỗi process (None = chưa kiểm tra)
+_fulltext_ready = None
+
+
+def fulltext_ready():
+    """
+    FULLTEXT index đã có chưa. Thiếu index thì MATCH ... AGAINST lỗi 1191 nên tìm kiếm
+    dùng icontains cho tới khi chạy `manage.py task_search_index` và khởi động lại process.
+    """
+    global _fulltext_ready
+    if _fulltext_ready is None:
+        _fulltext_ready = fulltext_index_exists()
+        if not _fulltext_ready:
+            print(f"⚠️ FULLTEXT index {FULLTEXT_INDEX} chưa có, tìm task bằng icontains "
+                  f"(chạy: python manage.py task_search_index)")
+    return _fulltext_ready
+
+
+def ensure_fulltext_index():
+    """Tạo FULLTEXT INDEX trên MySQL nếu chưa có. Returns: True nếu vừa tạo."""
+    global _fulltext_ready
+    if fulltext_index_exists():
+        _fulltext_ready = True
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON {connection.ops.quote_name(Task._meta.db_table)} '
+            f'(task_name, description)'
+        )
+    _fulltext_ready = True
+    return True
+
+
+# ----- API -----
+
+def _filter_matching(queryset, task_ids):
+    """
+    queryset giới hạn trong tập task_ids (rất lớn): quét task_id của queryset theo từng đoạn,
+    giao với tập khớp rồi lọc theo phía nhỏ hơn (IN các task khớp hoặc NOT IN các task
+    không khớp, tối đa nửa số task của queryset), nên vẫn đúng ngữ nghĩa của chỉ mục
+    (bỏ dấu, tiền tố, nguyên từ).
+    """
+    hits, misses = [], []
+    for task_id in queryset.order_by().values_list('task_id', flat=True).iterator(chunk_size=CHUNK_SIZE):
+        (hits if task_id in task_ids else misses).append(task_id)
+    if not hits:
+        return queryset.none()
+    if not misses:
+        return queryset
+    if len(hits) <= len(misses):
+        return queryset.filter(task_id__in=hits)
+    return queryset.exclude(task_id__in=misses)
+
+
+def filter_queryset(queryset, query):
+    """Lọc queryset Task theo từ khóa (giữ nguyên thứ tự của queryset)."""
+    if not tokenize(query):
+        # Chỉ có dấu câu / ký tự không phải chữ: không khớp task nào
+        return queryset.none()
+    if backend() == 'mysql':
+        boolean_query = _boolean_query(query)
+        if not boolean_query or not fulltext_ready():
+            # Chỉ có từ ngắn hơn min token size (FULLTEXT không tìm được) hoặc chưa có index
+            return _icontains(queryset, query)
+        return queryset.filter(RawSQL(_match_sql(), [boolean_query], output_field=BooleanField()))
+    if backend() == 'memory':
+        task_ids = _memory_index.ids(query)
+        if not task_ids:
+            return queryset.none()
+        if len(task_ids) <= MAX_FILTER_IDS:
+            return queryset.filter(task_id__in=task_ids)
+        return _filter_matching(queryset, task_ids)
+    return _icontains(queryset, query)
+
+
+def search(queryset, query, limit=20):
+    """
+    Task khớp từ khóa theo độ liên quan giảm dần.
+
+    Returns:
+        List Task (tối đa limit), mỗi task có thêm thuộc tính search_rank
+    """
+    if not tokenize(query):
+        return []
+    if backend() == 'mysql':
+        boolean_query = _boolean_query(query)
+        if boolean_query and fulltext_ready():
+            # MATCH trong WHERE để dùng FULLTEXT index, MATCH trong SELECT là điểm liên quan
+            queryset = queryset.filter(RawSQL(_match_sql(), [boolean_query], output_field=BooleanField()))
+            return list(queryset.annotate(search_rank=RawSQL(_match_sql(), [boolean_query], output_field=FloatField()))
+                        .order_by('-search_rank', 'task_id')[:limit])
+    if backend() != 'memory':
+        tasks = list(_icontains(queryset, query).order_by('task_id')[:limit])
+        for task in tasks:
+            task.search_rank = None
+        return tasks
+
+    # Xếp hạng bằng chỉ mục. Thường chỉ cần vài đoạn đầu; xếp hạng toàn bộ khi filter
+    # của queryset loại gần hết các task khớp
+    candidates = max(limit * 5, CHUNK_SIZE)
+    ranked = _memory_index.search(query, limit=candidates)
+    results = _collect(queryset, ranked, limit)
+    if len(results) < limit and len(ranked) == candidates:
+        rest = _memory_index.search(query)[candidates:]
+        results += _collect(queryset, rest, limit - len(results))
+    return results
+
+
+def _collect(queryset, ranked, limit):
+    # Lấy theo từng đoạn các task còn thỏa điều kiện của queryset, giữ thứ tự xếp hạng
+    results = []
+    for start in range(0, len(ranked), CHUNK_SIZE):
+        chunk = ranked[start:start + CHUNK_SIZE]
+        found = queryset.order_by().in_bulk([task_id for task_id, _ in chunk])
+        for task_id, score in chunk:
+            task = found.get(task_id)
+            if task is not None:
+                task.search_rank = round(score, 4)
+                results.append(task)
+                if len(results) >= limit:
+                    return results
+    return results
+
+
+def index_tasks(tasks):
+    """Cập nhật chỉ mục bộ nhớ sau khi task được lưu (sau commit). MySQL tự cập nhật."""
+    if backend() != 'memory':
+        return
+    rows = [(task.task_id, task.task_name, task.description) for task in tasks]
+
+    def update():
+        index = _memory_index
+        # Chưa dựng thì lần dựng đầu tiên sẽ đọc từ DB
+        if index.built:
+            for row in rows:
+                index.update(*row)
+
+    transaction.on_commit(update)
+
+
+def remove_tasks(task_ids):
+    if backend() != 'memory':
+        return
+    task_ids = list(task_ids)
+
+    def remove():
+        index = _memory_index
+        if index.built:
+            for task_id in task_ids:
+                index.remove(task_id)
+
+    transaction.on_commit(remove)
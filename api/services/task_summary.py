@@ -0,0 +1,58 @@
+# api/services/task_summary.py
+"""
+Tổng hợp task theo user bằng MỘT câu truy vấn COUNT có điều kiện,
+dùng được cho một user hoặc cả danh sách user (dashboard của team).
+"""
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from api.models.user import User
+
+OPEN_STATUSES = ['Todo', 'In Progress', 'Review']
+
+
+def get_task_summaries(user_ids):
+    """
+    Lấy summary task cho nhiều user trong một round trip.
+
+    Args:
+        user_ids: list ID của user
+
+    Returns:
+        Dict user_id -> summary. User không tồn tại sẽ không có trong kết quả.
+    """
+    user_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+    if not user_ids:
+        return {}
+
+    today = timezone.now().date()
+    is_open = Q(assigned_tasks__status__in=OPEN_STATUSES)
+
+    rows = User.objects.filter(user_id__in=user_ids).values('user_id', 'full_name').annotate(
+        total_tasks=Count('assigned_tasks'),
+        completed_tasks=Count('assigned_tasks', filter=Q(assigned_tasks__status='Done')),
+        in_progress_tasks=Count('assigned_tasks', filter=Q(assigned_tasks__status='In Progress')),
+        pending_tasks=Count('assigned_tasks', filter=Q(assigned_tasks__status='Todo')),
+        overdue_tasks=Count('assigned_tasks', filter=is_open & Q(assigned_tasks__due_date__lt=today)),
+        high_priority_tasks=Count('assigned_tasks', filter=is_open & Q(assigned_tasks__priority='High')),
+    ).order_by()
+
+    summaries = {}
+    for row in rows:
+        user_id = row.pop('user_id')
+        full_name = row.pop('full_name')
+        summaries[user_id] = {'user_id': user_id, 'user_name': full_name or '', **row}
+    return summaries
+
+
+def get_user_task_summary(user_id):
+    """
+    Lấy summary về tasks của một user
+
+    Returns:
+        Dict với thông tin tổng quan về tasks
+    """
+    summary = get_task_summaries([user_id]).get(user_id)
+    if summary is None:
+        raise ValueError(f"User with id '{user_id}' does not exist")
+    return summary
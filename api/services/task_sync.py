@@ -0,0 +1,172 @@
+# api/services/task_sync.py
+"""
+Delta sync task của một project: client gửi lại cursor của lần trước và chỉ nhận task
+được tạo / sửa sau đó cùng ID các task đã bị xóa (tombstone), thay vì tải lại cả project.
+
+    GET /api/tasks/changes/?project_id=prj-1                  -> lần đầu: toàn bộ task (theo trang)
+    GET /api/tasks/changes/?project_id=prj-1&cursor=<cursor>  -> thay đổi sau cursor
+    GET /api/tasks/changes/?project_id=prj-1&updated_since=2025-01-01T00:00:00Z
+
+Hai luồng (Task theo (updated_at, task_id), TaskTombstone theo (deleted_at, id)) được trộn
+theo thời gian và cắt ở `limit` phần tử, nên mỗi trang là một khoảng thời gian liền mạch:
+client áp dụng `tasks` rồi `deleted`, lặp lại với `cursor` mới khi `has_more`. Một task
+không bao giờ nằm ở cả hai: tombstone cũ hơn lần sửa cuối của task trong trang bị bỏ
+(vd. task chuyển sang project khác rồi quay lại).
+
+Chỉ trả thay đổi cũ hơn now - TASK_SYNC_LAG giây: updated_at được gán trước khi transaction
+commit, nên một thay đổi mới hơn có thể chưa nhìn thấy được và sẽ bị bỏ qua nếu watermark
+vượt qua nó. Tombstone được giữ TASK_TOMBSTONE_RETENTION_DAYS ngày; cursor cũ hơn thì
+client phải tải lại từ đầu (SyncCursorExpired).
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.models.task import Task
+from api.models.task_tombstone import TaskTombstone
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 1000
+
+
+class InvalidSyncCursor(ValueError):
+    pass
+
+
+class SyncCursorExpired(Exception):
+    pass
+
+
+def _lag():
+    return timedelta(seconds=getattr(settings, 'TASK_SYNC_LAG', 2))
+
+
+def _retention():
+    return timedelta(days=getattr(settings, 'TASK_TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def encode_cursor(task_mark, tombstone_mark):
+    data = {
+        'u': [task_mark[0].isoformat(), task_mark[1]] if task_mark else None,
+        'd': [tombstone_mark[0].isoformat(), tombstone_mark[1]],
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def _parse_mark(value):
+    """Thời điểm trong cursor; cursor sửa tay có thể không có múi giờ -> coi là giờ của TIME_ZONE."""
+    moment = parse_datetime(value)
+    if moment is not None and settings.USE_TZ and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def decode_cursor(cursor):
+    """Returns: (watermark của task hoặc None, watermark của tombstone)"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        task_mark = None
+        if data['u'] is not None:
+            task_mark = (_parse_mark(data['u'][0]), str(data['u'][1]))
+        tombstone_mark = (_parse_mark(data['d'][0]), int(data['d'][1]))
+    except (ValueError, TypeError, KeyError, IndexError):
+        raise InvalidSyncCursor('Invalid cursor')
+    if (task_mark and task_mark[0] is None) or tombstone_mark[0] is None:
+        raise InvalidSyncCursor('Invalid cursor')
+    return task_mark, tombstone_mark
+
+
+def record_tombstones(pairs):
+    """Ghi tombstone cho các cặp (task_id, project_id) bị xóa khỏi project."""
+    now = timezone.now()
+    TaskTombstone.objects.bulk_create([
+        TaskTombstone(task_id=task_id, project_id=project_id, deleted_at=now) for task_id, project_id in pairs
+    ])
+
+
+def prune_tombstones():
+    """Xóa tombstone cũ hơn thời gian giữ. Returns: số dòng đã xóa."""
+    deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=timezone.now() - _retention()).delete()
+    return deleted
+
+
+def get_changes(project_id, cursor=None, updated_since=None, limit=DEFAULT_LIMIT):
+    """
+    Returns:
+        Dict: tasks (list Task, kèm assignee / project / category), deleted (list task_id),
+        cursor (gửi lại ở lần sau), has_more (còn thay đổi, gọi tiếp ngay với cursor mới)
+
+    Raises:
+        InvalidSyncCursor, SyncCursorExpired
+    """
+    now = timezone.now()
+    upper = now - _lag()
+
+    if cursor:
+        task_mark, tombstone_mark = decode_cursor(cursor)
+    elif updated_since is not None:
+        task_mark, tombstone_mark = (updated_since, ''), (updated_since, 0)
+    else:
+        # Lần đầu: mọi task hiện có, không cần tombstone trước đó
+        task_mark, tombstone_mark = None, (upper, 0)
+
+    if tombstone_mark[0] < now - _retention():
+        raise SyncCursorExpired('Cursor expired, a full resync is required')
+
+    tasks = Task.objects.filter(project_id=project_id, updated_at__lte=upper)
+    if task_mark:
+        tasks = tasks.filter(Q(updated_at__gt=task_mark[0]) | Q(updated_at=task_mark[0], task_id__gt=task_mark[1]))
+    tasks = list(
+        tasks.select_related('assignee__enterprise', 'project', 'category')
+        .order_by('updated_at', 'task_id')[:limit + 1]
+    )
+
+    tombstones = list(
+        TaskTombstone.objects.filter(project_id=project_id, deleted_at__lte=upper)
+        .filter(Q(deleted_at__gt=tombstone_mark[0]) | Q(deleted_at=tombstone_mark[0], id__gt=tombstone_mark[1]))
+        .order_by('deleted_at', 'id')[:limit + 1]
+    )
+
+    # Trộn theo thời gian và cắt ở limit: mọi thay đổi trước điểm cắt đều có trong trang này
+    merged = sorted(
+        [(task.updated_at, 0, task) for task in tasks] + [(tombstone.deleted_at, 1, tombstone) for tombstone in tombstones],
+        key=lambda item: (item[0], item[1])
+    )
+    has_more = len(merged) > limit
+    page = merged[:limit]
+
+    changed, removed = [], []
+    for _, kind, obj in page:
+        if kind == 0:
+            changed.append(obj)
+            task_mark = (obj.updated_at, obj.task_id)
+        else:
+            removed.append(obj)
+            tombstone_mark = (obj.deleted_at, obj.id)
+
+    # Task chuyển khỏi project rồi quay lại trong cùng trang: bỏ tombstone cũ hơn lần sửa cuối
+    # (watermark vẫn tiến qua nó), để một task không nằm ở cả `tasks` và `deleted`
+    updated_at = {task.task_id: task.updated_at for task in changed}
+    deleted = [
+        tombstone.task_id for tombstone in removed
+        if tombstone.task_id not in updated_at or updated_at[tombstone.task_id] < tombstone.deleted_at
+    ]
+
+    if not has_more:
+        # Đã hết thay đổi tới upper: lần sau bắt đầu từ upper (kể cả khi không có gì thay đổi)
+        if task_mark is None or task_mark[0] < upper:
+            task_mark = (upper, '')
+        if tombstone_mark[0] < upper:
+            tombstone_mark = (upper, 0)
+
+    return {
+        'tasks': changed,
+        'deleted': deleted,
+        'cursor': encode_cursor(task_mark, tombstone_mark),
+        'has_more': has_more,
+    }
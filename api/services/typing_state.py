@@ -0,0 +1,118 @@
+# api/services/typing_state.py
+"""
+Gộp sự kiện "đang gõ" theo (phòng, user) trước khi gửi vào channel layer.
+
+Client gửi typing theo từng phím; server chỉ broadcast khi trạng thái đổi (bắt đầu / dừng gõ),
+nhắc lại "đang gõ" tối đa một lần mỗi CHAT_TYPING_WINDOW giây, và tự gửi "dừng gõ" nếu
+không nhận thêm sự kiện nào trong CHAT_TYPING_TIMEOUT giây (client mất mạng, đóng tab...).
+"""
+import asyncio
+import time
+import weakref
+
+from django.conf import settings
+
+from api.services.realtime import chat_group
+
+# Bộ đếm của process, xem GET /api/realtime/stats/
+TYPING_STATS = {
+    'received': 0,
+    'broadcast': 0,
+    'suppressed': 0,
+    'expired': 0,
+}
+
+
+class _Typing:
+    __slots__ = ('username', 'last_broadcast', 'deadline', 'timer')
+
+    def __init__(self, username):
+        self.username = username
+        self.last_broadcast = 0.0
+        self.deadline = 0.0
+        self.timer = None
+
+
+class TypingTracker:
+    """Trạng thái gõ của các user trên một event loop (dùng chung cho mọi socket)."""
+
+    def __init__(self, channel_layer, window, timeout):
+        self.channel_layer = channel_layer
+        self.window = window
+        self.timeout = timeout
+        # (chatroom_id, user_id) -> _Typing, chỉ chứa user đang gõ
+        self._typing = {}
+
+    async def update(self, chatroom_id, user_id, username, is_typing):
+        TYPING_STATS['received'] += 1
+        key = (chatroom_id, user_id)
+        state = self._typing.get(key)
+        now = time.monotonic()
+
+        if not is_typing:
+            if state is None:
+                TYPING_STATS['suppressed'] += 1
+                return
+            await self.stop(chatroom_id, user_id)
+            return
+
+        if state is None:
+            state = self._typing[key] = _Typing(username)
+        state.deadline = now + self.timeout
+        if state.timer is None:
+            state.timer = asyncio.get_running_loop().call_later(self.timeout, self._check_expired, key)
+
+        if now - state.last_broadcast < self.window:
+            TYPING_STATS['suppressed'] += 1
+            return
+        state.last_broadcast = now
+        await self._broadcast(chatroom_id, user_id, username, True)
+
+    async def stop(self, chatroom_id, user_id):
+        """Gửi "dừng gõ" nếu user đang gõ (khi gửi tin nhắn, ngắt kết nối hoặc hết hạn)."""
+        state = self._typing.pop((chatroom_id, user_id), None)
+        if state is None:
+            return
+        if state.timer is not None:
+            state.timer.cancel()
+        await self._broadcast(chatroom_id, user_id, state.username, False)
+
+    def _check_expired(self, key):
+        state = self._typing.get(key)
+        if state is None:
+            return
+        remaining = state.deadline - time.monotonic()
+        if remaining > 0:
+            # Vẫn còn gõ: hẹn lại thay vì tạo timer mới cho mỗi phím
+            state.timer = asyncio.get_running_loop().call_later(remaining, self._check_expired, key)
+            return
+        state.timer = None
+        TYPING_STATS['expired'] += 1
+        asyncio.ensure_future(self.stop(*key))
+
+    async def _broadcast(self, chatroom_id, user_id, username, is_typing):
+        TYPING_STATS['broadcast'] += 1
+        await self.channel_layer.group_send(chat_group(chatroom_id), {
+            'type': 'typing_indicator',
+            'chatroom_id': chatroom_id,
+            'user_id': user_id,
+            'username': username,
+            'is_typing': is_typing
+        })
+
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def get_typing_tracker(channel_layer):
+    """TypingTracker của event loop hiện tại."""
+    loop = asyncio.get_running_loop()
+    tracker = _trackers.get(loop)
+    if tracker is None:
+        tracker = TypingTracker(
+            channel_layer,
+            getattr(settings, 'CHAT_TYPING_WINDOW', 3),
+            getattr(settings, 'CHAT_TYPING_TIMEOUT', 6)
+        )
+        _trackers[loop] = tracker
+    return tracker
@@ -0,0 +1,104 @@
+# api/services/ws_encoding.py
+"""
+Mã hóa frame WebSocket của chat: JSON (mặc định) hoặc "compact" (MessagePack, binary frame).
+
+Chọn compact bằng subprotocol `chat.compact.v1` (Sec-WebSocket-Protocol) hoặc `?encoding=compact`.
+Cần cài msgpack (có sẵn khi cài channels-redis); không có thì luôn dùng JSON.
+
+Ở chế độ compact mọi frame là map MessagePack với key giống JSON, riêng tin nhắn chat
+(frame "chat_message") được rút gọn thành mảng theo vị trí:
+
+    message = [message_id, content, attachment_url, attachment_type, sent_at (epoch ms),
+               chatroom, sender, receiver]
+    sender / receiver = [user_id, full_name, avatar] hoặc nil
+
+Client gửi lên bằng binary frame MessagePack (map như JSON) hoặc text frame JSON.
+"""
+import json
+from datetime import datetime
+from urllib.parse import parse_qs
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = 'json'
+COMPACT = 'compact'
+COMPACT_SUBPROTOCOL = 'chat.compact.v1'
+
+
+def negotiate(scope):
+    """
+    Returns:
+        (encoding, subprotocol) - subprotocol cần trả lại trong accept() nếu client yêu cầu
+    """
+    if msgpack is None:
+        return JSON, None
+    if COMPACT_SUBPROTOCOL in scope.get('subprotocols', []):
+        return COMPACT, COMPACT_SUBPROTOCOL
+    query = parse_qs(scope.get('query_string', b'').decode('utf-8'))
+    if query.get('encoding', [JSON])[0] == COMPACT:
+        return COMPACT, None
+    return JSON, None
+
+
+def _compact_user(user):
+    if not user:
+        return None
+    return [user.get('user_id'), user.get('full_name'), user.get('avatar')]
+
+
+def _epoch_ms(value):
+    if not value:
+        return None
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+
+
+def compact_message(message):
+    return [
+        message.get('message_id'),
+        message.get('content'),
+        message.get('attachment_url'),
+        message.get('attachment_type'),
+        _epoch_ms(message.get('sent_at')),
+        message.get('chatroom'),
+        _compact_user(message.get('sent_by')),
+        _compact_user(message.get('receiver')),
+    ]
+
+
+def encode(frame, encoding):
+    """Trả về kwargs cho consumer.send(): text_data (JSON) hoặc bytes_data (compact)."""
+    if encoding == COMPACT:
+        if frame.get('type') == 'chat_message':
+            frame = dict(frame, message=compact_message(frame['message']))
+        return {'bytes_data': msgpack.packb(frame, use_bin_type=True)}
+    return {'text_data': json.dumps(frame)}
+
+
+def encode_all(frame):
+    """Mã hóa sẵn một frame cho mọi encoding, một lần cho cả group thay vì mỗi consumer một lần."""
+    frames = {JSON: encode(frame, JSON)}
+    if msgpack is not None:
+        frames[COMPACT] = encode(frame, COMPACT)
+    return frames
+
+
+def decode(text_data=None, bytes_data=None):
+    """Giải mã frame client gửi lên; ValueError nếu không hợp lệ."""
+    if bytes_data is not None:
+        if msgpack is None:
+            raise ValueError('Binary frames are not supported')
+        try:
+            data = msgpack.unpackb(bytes_data, raw=False)
+        except Exception:
+            raise ValueError('Invalid MessagePack frame')
+    else:
+        try:
+            data = json.loads(text_data)
+        except json.JSONDecodeError:
+            raise ValueError('Invalid JSON frame')
+    if not isinstance(data, dict):
+        raise ValueError('Frame must be an object')
+    return data
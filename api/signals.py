@@ -0,0 +1,92 @@
+# api/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from api.models.chatroom import ChatRoomParticipant
+from api.models.enterprise import Enterprise
+from api.models.notification import Notification
+from api.models.task import Task
+from api.models.task_category import TaskCategory
+from api.models.user import User
+from api.serializers.notification_serializer import NotificationSerializer
+from api.services import auth_cache, task_counters, task_search, task_sync
+from api.services.category_stats import invalidate_project_stats
+from api.services.chat_membership import invalidate_membership
+from api.services.realtime import project_group, publish, task_event, user_group
+
+
+@receiver(post_save, sender=Task)
+def task_post_save(sender, instance, created, **kwargs):
+    invalidate_project_stats(instance.project_id)
+    task_search.index_tasks([instance])
+    # Chuyển sang project khác: thống kê của project cũ cũng đổi, và với delta sync
+    # của project cũ, task đã bị xóa
+    loaded_project_id = getattr(instance, '_loaded_project_id', None)
+    if not created and loaded_project_id and loaded_project_id != instance.project_id:
+        invalidate_project_stats(loaded_project_id)
+        task_sync.record_tombstones([(instance.task_id, loaded_project_id)])
+    instance._loaded_project_id = instance.project_id
+    publish(project_group(instance.project_id), task_event(instance, 'created' if created else 'updated'))
+
+
+@receiver(post_delete, sender=Task)
+def task_post_delete(sender, instance, **kwargs):
+    # Bắt cả queryset.delete() lẫn xóa theo cascade, không chỉ Task.delete()
+    task_counters.task_deleted(instance)
+    invalidate_project_stats(instance.project_id)
+    task_search.remove_tasks([instance.task_id])
+    task_sync.record_tombstones([(instance.task_id, instance.project_id)])
+    publish(project_group(instance.project_id), task_event(instance, 'deleted'))
+
+
+@receiver(post_save, sender=TaskCategory)
+@receiver(post_delete, sender=TaskCategory)
+def task_category_changed(sender, instance, **kwargs):
+    invalidate_project_stats(instance.project_id)
+
+
+@receiver(post_save, sender=ChatRoomParticipant)
+def chat_participant_saved(sender, instance, created, **kwargs):
+    # Cập nhật con trỏ đã đọc / role không đổi quyền vào phòng
+    if created:
+        invalidate_membership(instance.user_id, instance.chatroom_id)
+
+
+@receiver(post_delete, sender=ChatRoomParticipant)
+def chat_participant_deleted(sender, instance, **kwargs):
+    invalidate_membership(instance.user_id, instance.chatroom_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    auth_cache.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=Enterprise)
+@receiver(post_delete, sender=Enterprise)
+def enterprise_changed(sender, instance, **kwargs):
+    # Snapshot user trong cache có kèm enterprise
+    auth_cache.invalidate_all_users()
+
+
+def _notification_user_id(notification):
+    # Notification.sent_to là auth.User (get_user_model()) còn /ws/user/ theo api.User.user_id:
+    # hai bảng chỉ chung email
+    email = notification.sent_to.email
+    if not email:
+        return None
+    return User.objects.filter(email=email).values_list('user_id', flat=True).first()
+
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    # Đẩy tới socket /ws/user/ của người nhận
+    if not created:
+        return
+    user_id = _notification_user_id(instance)
+    if user_id:
+        publish(user_group(user_id), {
+            'type': 'notification',
+            'notification': dict(NotificationSerializer(instance).data)
+        })
@@ -0,0 +1,227 @@
+# api/sparse_fields.py
+"""
+Sparse fieldset cho API đọc (GET): client chỉ lấy các trường / quan hệ cần dùng.
+
+    GET /api/tasks/?fields=task_id,task_name,status
+    GET /api/tasks/?fields=task_id,task_name&expand=assignee
+    GET /api/projects/?expand=manager
+
+- `fields`: danh sách trường cấp gốc được trả về (mặc định: tất cả)
+- `expand`: quan hệ lồng nhau được trả về. Khi client dùng `fields` hoặc `expand`,
+  quan hệ (serializer con, Meta.expandable_fields) chỉ có nếu được liệt kê ở một trong hai
+- không có cả hai tham số: response giữ nguyên như cũ
+
+SparseFieldsetMixin (serializer) bỏ các trường không được yêu cầu; SparseFieldsetFilter
+(filter backend) thu hẹp queryset theo các trường còn lại: chỉ select các cột cần
+(.only()), select_related quan hệ được expand và bỏ select/prefetch của quan hệ không dùng.
+
+Meta tùy chọn trên serializer:
+    expandable_fields = {'members': ('project_members',)}  # quan hệ tự định nghĩa -> quan hệ nó đọc
+    computed_fields = {'members_count': ()}  # SerializerMethodField / key thêm trong to_representation -> cột nó đọc
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer, ListSerializer, SerializerMethodField
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _param_set(request, name):
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def requested_fields(request):
+    """
+    Returns:
+        (fields, expand) - fields là None nếu không giới hạn; hoặc None nếu request không dùng sparse fieldset
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = _param_set(request, FIELDS_PARAM)
+    expand = _param_set(request, EXPAND_PARAM)
+    if fields is None and expand is None:
+        return None
+    return fields, expand or set()
+
+
+class SparseFieldsetMixin:
+    """Đặt trước ModelSerializer: class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer)."""
+
+    def _sparse(self):
+        # Chỉ serializer gốc của response, không áp dụng cho serializer lồng nhau
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None
+        return requested_fields(self.context.get('request'))
+
+    def expandable_field_names(self, fields):
+        declared = getattr(self.Meta, 'expandable_fields', {})
+        return {name for name, field in fields.items() if isinstance(field, BaseSerializer) or name in declared}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        sparse = self._sparse()
+        if sparse is None:
+            return fields
+
+        only, expand = sparse
+        expandable = self.expandable_field_names(fields)
+        for name in list(fields):
+            if fields[name].write_only:
+                continue
+            if name in expandable:
+                keep = name in expand or (only is not None and name in only)
+            else:
+                keep = only is None or name in only
+            if not keep:
+                del fields[name]
+        return fields
+
+    def wants(self, name):
+        """Key `name` (vd. trường tính thêm trong to_representation) có được yêu cầu không."""
+        sparse = self._sparse()
+        return sparse is None or sparse[0] is None or name in sparse[0]
+
+
+class _Plan:
+    def __init__(self):
+        self.columns = set()
+        self.select = set()
+        self.relations = set()
+        # False nếu có trường không suy ra được cột / quan hệ -> không dùng .only() / không bỏ prefetch
+        self.columns_known = True
+        self.relations_known = True
+
+
+def _is_forward_relation(model_field):
+    return model_field.is_relation and (model_field.many_to_one or model_field.one_to_one) and model_field.concrete
+
+
+def _plan_serializer(serializer, model, prefix, plan):
+    meta = getattr(serializer, 'Meta', None)
+    expandable = getattr(meta, 'expandable_fields', {})
+    computed = getattr(meta, 'computed_fields', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in computed:
+            plan.columns.update(prefix + column for column in computed[name])
+            continue
+        if name in expandable:
+            # Trường tự định nghĩa (SerializerMethodField...) đọc các quan hệ đã khai báo
+            for relation in expandable[name]:
+                plan.relations.add(prefix + relation)
+            plan.columns_known = False
+            continue
+        if isinstance(field, SerializerMethodField) or field.source == '*':
+            plan.columns_known = plan.relations_known = False
+            continue
+        _plan_source(field, field.source_attrs, model, prefix, plan)
+
+    if isinstance(serializer, SparseFieldsetMixin):
+        # Key không phải field, được thêm trong to_representation
+        for name, columns in computed.items():
+            if name not in serializer.fields and serializer.wants(name):
+                plan.columns.update(prefix + column for column in columns)
+
+
+def _plan_source(field, source_attrs, model, prefix, plan):
+    path = prefix
+    for index, attr in enumerate(source_attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            # property / method của model: không biết nó đọc gì
+            plan.columns_known = plan.relations_known = False
+            return
+        last = index == len(source_attrs) - 1
+
+        if not model_field.is_relation:
+            plan.columns.add(path + attr)
+            return
+        if not _is_forward_relation(model_field):
+            # Quan hệ nhiều (M2M, reverse FK): cần prefetch, không có cột
+            plan.relations.add(path + attr)
+            plan.columns_known = False
+            return
+
+        relation = path + attr
+        plan.relations.add(relation)
+        if last and not isinstance(field, BaseSerializer):
+            # PrimaryKeyRelatedField...: chỉ cần cột khóa ngoại
+            plan.columns.add(relation)
+            return
+        plan.select.add(relation)
+        path = relation + '__'
+        model = model_field.related_model
+
+    if isinstance(field, BaseSerializer):
+        child = field.child if isinstance(field, ListSerializer) else field
+        _plan_serializer(child, model, path, plan)
+
+
+def _select_related_paths(value, prefix=''):
+    if not isinstance(value, dict):
+        return []
+    paths = []
+    for name, children in value.items():
+        paths.append(prefix + name)
+        paths.extend(_select_related_paths(children, prefix + name + '__'))
+    return paths
+
+
+def _lookup_path(lookup):
+    return getattr(lookup, 'prefetch_to', lookup)
+
+
+def _used(path, plan):
+    # Quan hệ `path` có được trường nào đọc tới không
+    return any(relation == path or relation.startswith(path + '__') for relation in plan.relations)
+
+
+def sparse_queryset(queryset, serializer):
+    """Thu hẹp queryset theo các trường còn lại của serializer (đã lọc theo fields / expand)."""
+    plan = _Plan()
+    _plan_serializer(serializer, queryset.model, '', plan)
+
+    existing_select = _select_related_paths(queryset.query.select_related)
+    if plan.relations_known:
+        select = {path for path in existing_select if _used(path, plan)}
+        prefetch = [lookup for lookup in queryset._prefetch_related_lookups if _used(_lookup_path(lookup), plan)]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+    else:
+        select = set(existing_select)
+    select |= plan.select
+    if select:
+        queryset = queryset.select_related(*select)
+
+    if plan.columns_known:
+        columns = set(plan.columns)
+        # Quan hệ đã select_related mà không có cột nào được chọn thì load cả bảng liên quan
+        for path in select:
+            if not any(column.startswith(path + '__') for column in columns):
+                columns.add(path)
+        queryset = queryset.only(*columns)
+    return queryset
+
+
+class SparseFieldsetFilter(BaseFilterBackend):
+    """Filter backend mặc định (REST_FRAMEWORK['DEFAULT_FILTER_BACKENDS'])."""
+
+    def filter_queryset(self, request, queryset, view):
+        if requested_fields(request) is None or not hasattr(view, 'get_serializer'):
+            return queryset
+        serializer = view.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+        return sparse_queryset(queryset, serializer)
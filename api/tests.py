@@ -1,3 +1,261 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+import api.routing
+from api.models import Enterprise, Notification, Project, Task, TaskCategory, User
+from api.services import task_search, task_sync
+from api.services.category_stats import CACHE_KEY, get_project_category_stats
+from api.urls import project_router, router, task_category_router, user_router
+
+
+def _user(enterprise, i):
+    user = User(full_name=f'u{i}', email=f'u{i}@example.com', enterprise=enterprise)
+    user.password = 'x'
+    user.save()
+    return user
+
+
+# Notification.sent_to trỏ tới auth.User (get_user_model()) trong khi request.user là api.User:
+# /api/notifications/ lỗi từ trước, không liên quan tới phân trang
+KNOWN_BROKEN = {'notification-list'}
+
+
+class RouterListEndpointTests(TestCase):
+    """GET danh sách của mọi viewset trong router, không có query param, không được trả 500."""
+
+    @classmethod
+    def setUpTestData(cls):
+        enterprise = Enterprise.objects.create(name='e', address='a', phone_number='1', email='e@example.com')
+        cls.user = _user(enterprise, 1)
+        cls.project = Project.objects.create(project_name='p', start_date=date.today(), manager=cls.user)
+        cls.category = TaskCategory.objects.create(name='c', project=cls.project)
+        Task.objects.create(task_name='t', project=cls.project, category=cls.category, assignee=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _urls(self):
+        """URL danh sách của mọi viewset đã đăng ký (kể cả router lồng nhau)."""
+        values = {
+            'user_pk': self.user.user_id,
+            'project_project_id': self.project.project_id,
+            'category_id': self.category.id,
+        }
+        urls = []
+        for current in (router, user_router, project_router, task_category_router):
+            for pattern in current.urls:
+                if not (pattern.name or '').endswith('-list') or pattern.name in KNOWN_BROKEN:
+                    continue
+                if 'format' in pattern.pattern.regex.groupindex:
+                    continue
+                kwargs = {name: values[name] for name in pattern.pattern.regex.groupindex}
+                urls.append(reverse(pattern.name, kwargs=kwargs))
+        return urls
+
+    def test_list_without_query_params(self):
+        for url in self._urls():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertLess(response.status_code, 500, response.content[:300])
+
+    def test_nullable_ordering_keeps_null_rows(self):
+        Task.objects.create(task_name='due', project=self.project, category=self.category, due_date=date.today())
+        for ordering in ('due_date', '-due_date'):
+            url, seen = f'/api/tasks/?ordering={ordering}&page_size=1', []
+            while url:
+                data = self.client.get(url).json()
+                seen += [task['task_id'] for task in data['results']]
+                url = data['next']
+            with self.subTest(ordering=ordering):
+                self.assertEqual(len(seen), Task.objects.count())
+
+
+    def test_null_sorts_last_ascending_first_descending(self):
+        Task.objects.create(task_name='due', project=self.project, category=self.category, due_date=date.today())
+        TaskCategory.objects.create(name=None, project=self.project)
+        cases = [
+            ('/api/tasks/?fields=task_id,due_date&ordering=', 'due_date'),
+            (f'/api/projects/{self.project.project_id}/task-categories/?ordering=', 'name'),
+        ]
+        for url, field in cases:
+            for ordering, null_index in ((field, -1), ('-' + field, 0)):
+                with self.subTest(ordering=ordering, url=url):
+                    values = [row[field] for row in self.client.get(url + ordering).json()['results']]
+                    self.assertIsNone(values[null_index])
+                    self.assertEqual(values.count(None), 1)
+
+    def test_ordering_with_more_than_1000_ties_reaches_every_row(self):
+        Task.objects.bulk_create([
+            Task(task_id=f'tie-{i:04d}', task_name='t', project=self.project, category=self.category, status='Todo')
+            for i in range(1300)
+        ])
+        total = Task.objects.count()
+        for ordering in ('status', '-priority'):
+            url, seen, pages = f'/api/tasks/?ordering={ordering}&page_size=200&fields=task_id', [], 0
+            while url and pages < 20:
+                data = self.client.get(url).json()
+                last_page = [task['task_id'] for task in data['results']]
+                seen += last_page
+                url, pages = data['next'], pages + 1
+            with self.subTest(ordering=ordering):
+                self.assertEqual(len(seen), total)
+                self.assertEqual(len(set(seen)), total)
+
+                # Quay lại bằng "previous" từ trang cuối
+                back, url = [], data['previous']
+                while url:
+                    data = self.client.get(url).json()
+                    back = [task['task_id'] for task in data['results']] + back
+                    url = data['previous']
+                self.assertEqual(back, seen[:-len(last_page)])
+
+
+@override_settings(TASK_SYNC_LAG=0)
+class TaskSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        enterprise = Enterprise.objects.create(name='e', address='a', phone_number='1', email='e@example.com')
+        cls.user = _user(enterprise, 1)
+        cls.project = Project.objects.create(project_name='p', start_date=date.today())
+        cls.other = Project.objects.create(project_name='p2', start_date=date.today())
+        cls.category = TaskCategory.objects.create(name='c', project=cls.project)
+        cls.other_category = TaskCategory.objects.create(name='c2', project=cls.other)
+
+    def _move(self, task, project, category):
+        task.project, task.category = project, category
+        task.save()
+
+    def test_task_moved_out_and_back_is_not_deleted(self):
+        task = Task.objects.create(task_name='t', project=self.project, category=self.category)
+        cursor = task_sync.get_changes(self.project.project_id)['cursor']
+
+        self._move(task, self.other, self.other_category)
+        self._move(task, self.project, self.category)
+
+        changes = task_sync.get_changes(self.project.project_id, cursor=cursor)
+        self.assertEqual([changed.task_id for changed in changes['tasks']], [task.task_id])
+        self.assertEqual(changes['deleted'], [])
+
+    def test_task_moved_back_and_out_again_is_deleted(self):
+        task = Task.objects.create(task_name='t', project=self.project, category=self.category)
+        cursor = task_sync.get_changes(self.project.project_id)['cursor']
+
+        self._move(task, self.other, self.other_category)
+        self._move(task, self.project, self.category)
+        self._move(task, self.other, self.other_category)
+
+        changes = task_sync.get_changes(self.project.project_id, cursor=cursor)
+        self.assertEqual(changes['tasks'], [])
+        self.assertEqual(set(changes['deleted']), {task.task_id})
+
+    def test_cursor_without_timezone_is_accepted(self):
+        since = timezone.make_naive(timezone.now() - timedelta(minutes=1)).isoformat()
+        task = Task.objects.create(task_name='t', project=self.project, category=self.category)
+        data = {'u': [since, ''], 'd': [since, 0]}
+        cursor = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+        changes = task_sync.get_changes(self.project.project_id, cursor=cursor)
+        self.assertEqual([changed.task_id for changed in changes['tasks']], [task.task_id])
+
+
+@override_settings(TASK_SEARCH_BACKEND='memory')
+class TaskSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        project = Project.objects.create(project_name='p', start_date=date.today())
+        category = TaskCategory.objects.create(name='c', project=project)
+        for name in ('Thiết kế giao diện', 'Thiết kế database', 'thiet lap', 'Kế hoạch', 'Deploy'):
+            Task.objects.create(task_name=name, project=project, category=category)
+
+    def setUp(self):
+        task_search.reset()
+
+    def _names(self, query):
+        return sorted(Task.objects.filter(task_id__in=task_search.filter_queryset(Task.objects.all(), query))
+                      .values_list('task_name', flat=True))
+
+    def test_many_matches_keep_folded_prefix_semantics(self):
+        queries = ('thiet ke', 'thi', 'ke', 'deploy')
+        expected = {query: self._names(query) for query in queries}
+        self.assertEqual(expected['thiet ke'], ['Thiết kế database', 'Thiết kế giao diện'])
+        # Vượt MAX_FILTER_IDS: giao với task_id của queryset, cùng kết quả
+        with mock.patch.object(task_search, 'MAX_FILTER_IDS', 1):
+            for query in queries:
+                with self.subTest(query=query):
+                    self.assertEqual(self._names(query), expected[query])
+
+    def test_query_without_words_matches_nothing(self):
+        self.assertEqual(self._names('!!!'), [])
+
+    @override_settings(TASK_SEARCH_BACKEND='mysql')
+    def test_mysql_without_fulltext_index_falls_back_to_icontains(self):
+        with mock.patch.object(task_search, '_fulltext_ready', None), \
+                mock.patch.object(task_search, 'fulltext_index_exists', return_value=False) as exists:
+            self.assertEqual(self._names('database'), ['Thiết kế database'])
+            results = task_search.search(Task.objects.all(), 'deploy')
+            self.assertEqual([task.task_name for task in results], ['Deploy'])
+            exists.assert_called_once()
+
+
+class _ScopeUser:
+    """Thay TokenAuthMiddleware: gắn sẵn user vào scope."""
+
+    def __init__(self, inner, user):
+        self.inner, self.user = inner, user
+
+    async def __call__(self, scope, receive, send):
+        return await self.inner(dict(scope, user=self.user), receive, send)
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class NotificationSocketTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        enterprise = Enterprise.objects.create(name='e', address='a', phone_number='1', email='e@example.com')
+        cls.user = _user(enterprise, 1)
+        # Notification.sent_to trỏ tới auth.User, cùng email với api.User
+        cls.auth_user = get_user_model().objects.create(username='u1', email=cls.user.email)
+
+    def _notify(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(title='t', message='hello', sent_to=self.auth_user)
+
+    async def test_notification_reaches_user_socket(self):
+        communicator = WebsocketCommunicator(_ScopeUser(URLRouter(api.routing.websocket_urlpatterns), self.user), '/ws/user/')
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual((await communicator.receive_json_from())['type'], 'connection_established')
+
+        await sync_to_async(self._notify)()
+
+        frame = await communicator.receive_json_from(timeout=3)
+        self.assertEqual(frame['type'], 'notification')
+        self.assertEqual(frame['notification']['message'], 'hello')
+        await communicator.disconnect()
+
+
+class CategoryStatsCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(project_name='p', start_date=date.today())
+        cls.category = TaskCategory.objects.create(name='c', project=cls.project)
+
+    def test_cache_is_invalidated_after_commit(self):
+        self.assertEqual(get_project_category_stats(self.project.project_id)[0]['tasks_count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(task_name='t', project=self.project, category=self.category)
+            # Chưa commit: cache cũ vẫn còn, không bị ghi lại từ dữ liệu chưa commit
+            self.assertIsNotNone(cache.get(CACHE_KEY.format(project_id=self.project.project_id)))
+        self.assertEqual(get_project_category_stats(self.project.project_id)[0]['tasks_count'], 1)
@@ -13,6 +13,7 @@ from api.views.auth_check_view import AuthCheckView
 from api.views.chatroom_views import ChatRoomViewSet
 from api.views.message_views import MessageViewSet
 from api.views.register_view import RegisterView
+from api.views.realtime_stats_view import RealtimeStatsView
 from api.views.sendgrid_email import send_password_email
 from .views import check_email
 from api.views import calendar_views as views
@@ -58,6 +59,9 @@ urlpatterns = [
     path('send-password-email/', send_password_email, name='send_password_email'),
     path('check-email/', check_email.check_email_exists, name='check_email_exists'),
 
+    # Bộ đếm WebSocket (typing bị gộp, ...) cho Admin
+    path('realtime/stats/', RealtimeStatsView.as_view(), name='realtime_stats'),
+
     # Calendar API routes
     path('calendar/events', views.events),
     path('calendar/events/project/<str:project_id>', views.get_events_by_project),
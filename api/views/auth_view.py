@@ -1,22 +1,73 @@
+import json
+
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
-from rest_framework.views import APIView
-from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.exceptions import AuthenticationFailed
 from api.models.user import User
-from django.contrib.auth.hashers import check_password
+from api.services.password_hashing import HASH_STATS, PasswordHashingBusy
+
+# Retry-After (giây) khi pool băm mật khẩu đầy
+LOGIN_RETRY_AFTER = 1
+
+
+def _error(detail, status_code):
+    # Cùng dạng lỗi với các APIView của DRF: {"detail": ...}
+    return JsonResponse({'detail': detail}, status=status_code)
+
+
+def _login_data(request):
+    """Body JSON hoặc form; None nếu JSON không hợp lệ."""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return request.POST
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class LoginView(View):
+    """
+    View async (Django View, không phải APIView vì DRF chưa hỗ trợ handler async): dưới ASGI
+    request chờ bcrypt bằng await, không giữ thread nào trong lúc pool băm mật khẩu chạy.
+    """
 
-class LoginView(APIView):
-    def post(self, request):
-        email = request.data.get('email')
-        password = request.data.get('password')
+    async def post(self, request):
+        data = _login_data(request)
+        if data is None:
+            return _error("JSON parse error", status.HTTP_400_BAD_REQUEST)
+        email = data.get('email')
+        password = data.get('password')
         try:
-            user = User.objects.get(email=email)
+            user = await User.objects.aget(email=email)
         except User.DoesNotExist:
-            raise AuthenticationFailed("User not found with this email")
-            
-        if not user.check_password(password):
-            raise AuthenticationFailed("Invalid credentials, please try again")
+            return _error("User not found with this email", status.HTTP_401_UNAUTHORIZED)
+
+        # bcrypt chạy trong pool riêng (api/services/password_hashing.py); pool đầy -> 429
+        try:
+            valid = await user.acheck_password(password or '')
+        except PasswordHashingBusy:
+            response = _error(
+                f"Too many login attempts in progress, please retry. Expected available in {LOGIN_RETRY_AFTER} second.",
+                status.HTTP_429_TOO_MANY_REQUESTS
+            )
+            response['Retry-After'] = str(LOGIN_RETRY_AFTER)
+            return response
+        if not valid:
+            return _error("Invalid credentials, please try again", status.HTTP_401_UNAUTHORIZED)
+
+        # Băm lại theo PASSWORD_BCRYPT_ROUNDS nếu cost đã đổi; pool bận thì để lần đăng nhập sau
+        if user.password_needs_rehash():
+            try:
+                await user.aset_password(password)
+                await user.asave(update_fields=['password'])
+                HASH_STATS['rehashed'] += 1
+            except PasswordHashingBusy:
+                pass
 
         # Create tokens manually to include user_id
         refresh = RefreshToken()
@@ -24,7 +75,7 @@ class LoginView(APIView):
         access_token = refresh.access_token
 
         # Trả về access_token, refresh_token và user info (gồm role)
-        return Response({
+        return JsonResponse({
             'access_token': str(access_token),
             'refresh_token': str(refresh),
             'user': {
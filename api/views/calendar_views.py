@@ -21,13 +21,13 @@ def events(request):
 
 @api_view(['GET'])
 def get_events_by_project(request, project_id):
-    events = Calendar.objects.filter(project_id=project_id)  # hoặc project__id nếu là ForeignKey
+    events = Calendar.objects.filter(project_id=project_id).order_by('start')  # hoặc project__id nếu là ForeignKey
     serializer = CalendarSerializer(events, many=True)
     return Response(serializer.data)
 @api_view(['GET'])
 def get_user_events(request):
     user_id = request.user.user_id  # Giả sử có auth
-    events = Calendar.objects.filter(user_id=user_id)
+    events = Calendar.objects.filter(user_id=user_id).order_by('start')
     serializer = CalendarSerializer(events, many=True)
     print("User object:", request.user)
     print("User type:", type(request.user))
@@ -62,7 +62,7 @@ def get_upcoming_events(request):
     days = int(request.GET.get('days', 7))
     now = timezone.now()
     end_date = now + timedelta(days=days)
-    events = Calendar.objects.filter(start__range=[now, end_date])
+    events = Calendar.objects.filter(start__range=[now, end_date]).order_by('start')
     serializer = CalendarSerializer(events, many=True)
     return Response(serializer.data)
 
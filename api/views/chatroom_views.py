@@ -1,14 +1,47 @@
 import uuid
 
+from django.db.models import OuterRef, Prefetch, Subquery
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
 from api.models.chatroom import ChatRoom, ChatRoomParticipant
+from api.models.message import Message
 from api.models.user import User
 from api.serializers.chatroom_serializer import ChatRoomSerializer
-from api.serializers.message_serializer import MessageSerializer
+from api.services.chat_read_cursor import annotate_unread_count
+from api.services.message_history import get_message_history, parse_limit
+
+
+def with_list_annotations(queryset, user):
+    """
+    Chuẩn bị queryset cho danh sách phòng chat với số truy vấn cố định:
+    participants được prefetch, last_message_id và unread_count được annotate.
+    """
+    last_message = Message.objects.filter(
+        chatroom=OuterRef('pk')
+    ).order_by('-sent_at', '-message_id').values('message_id')[:1]
+    
+    queryset = annotate_unread_count(queryset, user)
+    return queryset.annotate(
+        last_message_id=Subquery(last_message)
+    ).prefetch_related(
+        Prefetch(
+            'chatroomparticipant_set',
+            queryset=ChatRoomParticipant.objects.select_related('user__enterprise')
+        )
+    )
+
+
+def attach_last_messages(chatrooms):
+    """Gắn _last_message cho các phòng đã annotate last_message_id (1 truy vấn)."""
+    message_ids = [room.last_message_id for room in chatrooms if room.last_message_id]
+    messages = Message.objects.select_related(
+        'sent_by__enterprise', 'receiver__enterprise'
+    ).in_bulk(message_ids)
+    for room in chatrooms:
+        room._last_message = messages.get(room.last_message_id)
 
 
 class ChatRoomViewSet(viewsets.ModelViewSet):       
@@ -19,7 +52,23 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        return ChatRoom.objects.filter(participants=user)
+        queryset = ChatRoom.objects.filter(participants=user)
+        if self.action == 'list':
+            queryset = with_list_annotations(queryset, user)
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        chatrooms = list(page if page is not None else queryset)
+        
+        # Tải last_message của tất cả phòng trong một truy vấn
+        attach_last_messages(chatrooms)
+        
+        serializer = self.get_serializer(chatrooms, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
     
     def create(self, request, *args, **kwargs):
         data = request.data
@@ -67,7 +116,18 @@ class ChatRoomViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def messages(self, request, pk=None):
+        """
+        Lịch sử tin nhắn, phân trang theo keyset (sent_at, message_id)
+        URL: GET /api/chatrooms/{id}/messages/?before=<message_id>&after=<message_id>&limit=50
+        """
         chatroom = self.get_object()
-        messages = chatroom.messages.all()
-        serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        try:
+            page = get_message_history(
+                chatroom.chatroom_id,
+                before=request.query_params.get('before'),
+                after=request.query_params.get('after'),
+                limit=parse_limit(request.query_params.get('limit'))
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(page)
@@ -8,6 +8,8 @@ from api.models.user import User  # Thêm import User để validate
 from api.serializers.project_serializer import ProjectSerializer
 from api.serializers.project_member_serializer import AddProjectMemberSerializer
 from api.serializers.project_user_serializer import ProjectUserSerializer
+from api.serializers.task_serializer import BoardTaskSerializer
+from api.services import task_board
 
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all()
@@ -229,6 +231,51 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+    @action(detail=True, methods=['get'])
+    def board(self, request, project_id=None):
+        """
+        Kanban board: N task đầu của mỗi cột status + tổng số task của cột, trong một truy vấn
+        GET /api/projects/{id}/board/?limit=20&assignee_id=&category_id=&priority=
+        Tải thêm một cột: GET /api/projects/{id}/board/?status=Todo&cursor=<next_cursor của cột>
+        """
+        project = self.get_object()
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', task_board.DEFAULT_LIMIT)), 1), task_board.MAX_LIMIT)
+        except ValueError:
+            limit = task_board.DEFAULT_LIMIT
+        
+        queryset = task_board.board_queryset(
+            project.project_id,
+            assignee_id=request.query_params.get('assignee_id'),
+            category_id=request.query_params.get('category_id'),
+            priority=request.query_params.get('priority'),
+        )
+        
+        column_status = request.query_params.get('status')
+        if column_status:
+            try:
+                tasks, next_cursor = task_board.get_column_page(
+                    queryset, column_status, cursor=request.query_params.get('cursor'), limit=limit
+                )
+            except task_board.InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                "status": column_status,
+                "tasks": BoardTaskSerializer(tasks, many=True).data,
+                "next_cursor": next_cursor
+            })
+        
+        columns = task_board.get_board_columns(queryset, limit=limit)
+        for column in columns:
+            column['tasks'] = BoardTaskSerializer(column['tasks'], many=True).data
+        
+        return Response({
+            "project_id": project.project_id,
+            "project_name": project.project_name,
+            "columns": columns
+        })
+    
     def retrieve(self, request, *args, **kwargs):
         """Lấy thông tin chi tiết project"""
         instance = self.get_object()
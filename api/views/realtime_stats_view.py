@@ -0,0 +1,30 @@
+# api/views/realtime_stats_view.py
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.services.auth_cache import AUTH_CACHE_STATS, cache_sizes
+from api.services.password_hashing import HASH_STATS, pool_status
+from api.services.outbound_queue import QUEUE_STATS, queue_depths
+from api.services.typing_state import TYPING_STATS
+
+
+class RealtimeStatsView(APIView):
+    """
+    Bộ đếm của process đang xử lý request (WebSocket, cache xác thực, băm mật khẩu) - chỉ Admin.
+    URL: GET /api/realtime/stats/
+    Khi chạy nhiều worker, mỗi worker có bộ đếm riêng.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if getattr(request.user, 'role', '') != 'Admin':
+            return Response({'error': 'Admin only'}, status=status.HTTP_403_FORBIDDEN)
+
+        return Response({
+            'typing': dict(TYPING_STATS),
+            'send_queues': {**QUEUE_STATS, 'depth': queue_depths()},
+            'auth_cache': {**AUTH_CACHE_STATS, 'size': cache_sizes()},
+            'password_hashing': {**HASH_STATS, 'pool': pool_status()},
+        })
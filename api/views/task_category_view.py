@@ -6,6 +6,7 @@ from api.models.task_category import TaskCategory
 from api.models.task import Task
 from api.serializers.task_category_serializer import TaskCategorySerializer
 from api.serializers.task_serializer import TaskSerializer
+from api.services.category_stats import get_project_category_stats
 
 class TaskCategoryViewSet(viewsets.ModelViewSet):
     queryset = TaskCategory.objects.all()
@@ -117,27 +118,8 @@ class TaskCategoryViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        categories = TaskCategory.objects.filter(project__project_id=project_id)
-        
-        result = []
-        for category in categories:
-            # Lấy số lượng task theo từng trạng thái
-            todo_count = Task.objects.filter(category=category, status='Todo').count()
-            in_progress_count = Task.objects.filter(category=category, status='In Progress').count()
-            review_count = Task.objects.filter(category=category, status='Review').count()
-            done_count = Task.objects.filter(category=category, status='Done').count()
-            
-            result.append({
-                'id': category.id,
-                'name': category.name,
-                'tasks_count': category.tasks_count,
-                'completed_tasks_count': category.completed_tasks_count,
-                'stats': {
-                    'todo': todo_count,
-                    'in_progress': in_progress_count,
-                    'review': review_count,
-                    'done': done_count
-                }
-            })
+        # Một truy vấn GROUP BY cho cả project, có cache (?refresh=true để bỏ qua cache)
+        use_cache = request.query_params.get('refresh', 'false').lower() != 'true'
+        result = get_project_category_stats(project_id, use_cache=use_cache)
             
-        return Response(result) 
\ No newline at end of file
+        return Response(result)
@@ -3,18 +3,21 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from api.models.task import Task
 from api.models.task_comment import TaskComment
 from api.models.task_attachment import TaskAttachment
-from api.models.user import User
 from api.models.project import Project
 
 from api.serializers.task_serializer import TaskSerializer, UserTasksSerializer
+from api.sparse_fields import SparseFieldsetFilter
 from api.serializers.task_comment_serializer import TaskCommentSerializer
 from api.serializers.task_attachment_serializer import TaskAttachmentSerializer
+from api.services.task_summary import get_task_summaries, get_user_task_summary
+from api.services import task_search, task_sync
+from api.services.task_bulk import BulkTaskError, bulk_create_tasks, bulk_update_tasks
 
 
 # Helper functions để lấy tasks theo user
@@ -38,35 +41,13 @@ def get_user_tasks(user_id, **filters):
         raise ValueError(f"Invalid parameters: {serializer.errors}")
 
 
-def get_user_task_summary(user_id):
-    """
-    Lấy summary về tasks của user
-    
-    Returns:
-        Dict với thông tin tổng quan về tasks
-    """
-    try:
-        user = User.objects.get(user_id=user_id)
-    except User.DoesNotExist:
-        raise ValueError(f"User with id '{user_id}' does not exist")
-    
-    tasks = Task.objects.filter(assignee=user)
-    
-    summary = {
-        'user_id': user_id,
-        'user_name': f"{user.first_name} {user.last_name}".strip(),
-        'total_tasks': tasks.count(),
-        'completed_tasks': tasks.filter(status='Done').count(),
-        'in_progress_tasks': tasks.filter(status='In Progress').count(),
-        'pending_tasks': tasks.filter(status='Pending').count(),
-        'overdue_tasks': tasks.filter(
-            due_date__lt=timezone.now().date(),
-            status__in=['Pending', 'In Progress']
-        ).count(),
-        'high_priority_tasks': tasks.filter(priority='High', status__in=['Pending', 'In Progress']).count(),
-    }
-    
-    return summary
+# Số user tối đa cho một lần lấy summary hàng loạt
+MAX_SUMMARY_USERS = 500
+# Số task tối đa cho một lần tạo / sửa hàng loạt
+MAX_BULK_TASKS = 2000
+# Số kết quả mặc định / tối đa của /api/tasks/search/
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
 
 
 class TaskViewSet(viewsets.ModelViewSet):
@@ -76,9 +57,9 @@ class TaskViewSet(viewsets.ModelViewSet):
     permission_classes = []
     
     # Filtering và search
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # ?search= được xử lý trong get_queryset() bằng chỉ mục full-text (api/services/task_search.py)
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, SparseFieldsetFilter]
     filterset_fields = ['status', 'priority', 'assignee__user_id', 'project__project_id', 'category__id']
-    search_fields = ['task_name', 'description']
     ordering_fields = ['created_at', 'due_date', 'priority', 'status', 'progress']
     ordering = ['-created_at']
     
@@ -123,13 +104,10 @@ class TaskViewSet(viewsets.ModelViewSet):
         if category_id and not category_pk:
             queryset = queryset.filter(category__id=category_id)
             
-        # Tìm kiếm theo từ khóa
+        # Tìm kiếm theo từ khóa (chỉ mục full-text)
         search = self.request.query_params.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(task_name__icontains=search) | 
-                Q(description__icontains=search)
-            )
+            queryset = task_search.filter_queryset(queryset, search)
         
         return queryset
     
@@ -159,6 +137,150 @@ class TaskViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
     
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request, *args, **kwargs):
+        """
+        API endpoint tìm task theo độ liên quan (gợi ý khi gõ: từ cuối khớp theo tiền tố)
+        
+        URL: GET /api/tasks/search/?q=thiet ke ap&limit=20
+        Dùng được cùng các filter của danh sách (project_id, status, assignee_id...).
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({
+                'success': False,
+                'error': 'q is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            limit = min(int(request.query_params.get('limit', SEARCH_LIMIT)), MAX_SEARCH_LIMIT)
+        except ValueError:
+            limit = SEARCH_LIMIT
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        tasks = task_search.search(queryset, query, limit=max(limit, 1))
+        results = []
+        for task, data in zip(tasks, self.get_serializer(tasks, many=True).data):
+            data['search_rank'] = task.search_rank
+            results.append(data)
+        
+        return Response({
+            'success': True,
+            'data': {
+                'query': query,
+                'results': results
+            }
+        })
+    
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request, *args, **kwargs):
+        """
+        API endpoint delta sync: task được tạo / sửa và ID task đã bị xóa kể từ lần sync trước
+        
+        URL: GET /api/tasks/changes/?project_id=prj-1                 (lần đầu: toàn bộ task)
+             GET /api/tasks/changes/?project_id=prj-1&cursor=...      (cursor của response trước)
+             GET /api/tasks/changes/?project_id=prj-1&updated_since=2025-01-01T00:00:00Z
+        Khi has_more = true, gọi tiếp ngay với cursor mới. 410: cursor quá cũ, cần tải lại từ đầu.
+        Một task chỉ nằm ở `tasks` hoặc `deleted` của một response, không ở cả hai.
+        """
+        project_id = self.kwargs.get('project_pk') or request.query_params.get('project_id')
+        if not project_id:
+            return Response({
+                'success': False,
+                'error': 'project_id is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        updated_since = request.query_params.get('updated_since')
+        if updated_since:
+            updated_since = parse_datetime(updated_since)
+            if updated_since is None:
+                return Response({
+                    'success': False,
+                    'error': 'updated_since must be an ISO 8601 datetime'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(updated_since):
+                updated_since = timezone.make_aware(updated_since)
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', task_sync.DEFAULT_LIMIT)), 1), task_sync.MAX_LIMIT)
+        except ValueError:
+            limit = task_sync.DEFAULT_LIMIT
+        
+        try:
+            result = task_sync.get_changes(
+                project_id,
+                cursor=request.query_params.get('cursor'),
+                updated_since=updated_since,
+                limit=limit
+            )
+        except task_sync.InvalidSyncCursor as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        except task_sync.SyncCursorExpired as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_410_GONE)
+        
+        result['tasks'] = TaskSerializer(result['tasks'], many=True, context=self.get_serializer_context()).data
+        return Response({
+            'success': True,
+            'data': result
+        })
+    
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        """
+        API endpoint để tạo / sửa nhiều task trong một transaction
+        
+        URL: POST /api/tasks/bulk/   body: [{"task_name": ..., "project_id": ..., "category_id": ...}, ...]
+             PATCH /api/tasks/bulk/  body: [{"task_id": "task-1", "status": "Done"}, ...]
+        Body cũng có thể là {"tasks": [...]}. Lỗi ở bất kỳ task nào thì không ghi gì cả.
+        """
+        items = request.data.get('tasks') if isinstance(request.data, dict) else request.data
+        
+        if not isinstance(items, list) or not items:
+            return Response({
+                'success': False,
+                'error': 'A non-empty list of tasks is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(items) > MAX_BULK_TASKS:
+            return Response({
+                'success': False,
+                'error': f'At most {MAX_BULK_TASKS} tasks per request'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        context = self.get_serializer_context()
+        try:
+            if request.method == 'POST':
+                # Giống create(): project / category từ nested route
+                defaults = {}
+                if self.kwargs.get('project_pk'):
+                    defaults['project_id'] = self.kwargs['project_pk']
+                if self.kwargs.get('category_pk'):
+                    defaults['category_id'] = self.kwargs['category_pk']
+                if defaults:
+                    items = [{**item, **defaults} if isinstance(item, dict) else item for item in items]
+                tasks = bulk_create_tasks(items, context=context)
+                response_status = status.HTTP_201_CREATED
+            else:
+                tasks = bulk_update_tasks(items, context=context)
+                response_status = status.HTTP_200_OK
+        except BulkTaskError as e:
+            return Response({
+                'success': False,
+                'error': 'Invalid tasks',
+                'errors': e.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'data': TaskSerializer(tasks, many=True, context=context).data
+        }, status=response_status)
+    
     # ===============================
     # ORIGINAL ACTIONS (HIỆN TẠI)
     # ===============================
@@ -379,6 +501,52 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'error': 'Internal server error'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['get', 'post'], url_path='summary')
+    def get_users_task_summary(self, request):
+        """
+        API endpoint để lấy summary tasks của nhiều user trong một truy vấn
+        
+        URL: GET /api/tasks/summary/?user_ids=user-1,user-2
+             POST /api/tasks/summary/  body: {"user_ids": ["user-1", "user-2"]}
+        """
+        if request.method == 'POST':
+            if not isinstance(request.data, dict):
+                return Response({
+                    'success': False,
+                    'error': 'Request body must be a JSON object'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            user_ids = request.data.get('user_ids') or []
+        else:
+            user_ids = [uid.strip() for uid in request.query_params.get('user_ids', '').split(',')]
+        
+        if not isinstance(user_ids, list) or not any(user_ids):
+            return Response({
+                'success': False,
+                'error': 'user_ids is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not all(isinstance(uid, str) for uid in user_ids):
+            return Response({
+                'success': False,
+                'error': 'user_ids must be a list of strings'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(user_ids) > MAX_SUMMARY_USERS:
+            return Response({
+                'success': False,
+                'error': f'At most {MAX_SUMMARY_USERS} user_ids per request'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        summaries = get_task_summaries(user_ids)
+        
+        return Response({
+            'success': True,
+            'data': {
+                'summaries': [summaries[uid] for uid in dict.fromkeys(user_ids) if uid in summaries],
+                'not_found': [uid for uid in dict.fromkeys(user_ids) if uid and uid not in summaries]
+            }
+        })
+    
     @action(detail=False, methods=['post'], url_path='user/filter')
     def filter_user_tasks(self, request):
         """
@@ -20,6 +20,9 @@ import dj_database_url
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Nạp file .env vào môi trường (trước khi đọc các biến môi trường bên dưới)
+load_dotenv()
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -116,6 +119,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'api.authentication.CustomJWTAuthentication',  # Use our custom authentication class
     ),
+    # Phân trang keyset cho mọi list (xem api/pagination.py), ?fields= / ?expand= (api/sparse_fields.py)
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    'DEFAULT_FILTER_BACKENDS': ['api.sparse_fields.SparseFieldsetFilter'],
 }
 
 MIDDLEWARE = [
@@ -223,20 +230,82 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache (mặc định trong bộ nhớ của từng process, đổi sang Redis/Memcached khi chạy nhiều worker)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Thời gian cache (giây) cho thống kê category của project
+CATEGORY_STATS_CACHE_TIMEOUT = 60
+
+# Số ID mỗi worker giữ trước từ bảng api_idsequence (xem api/services/id_allocator.py)
+ID_SEQUENCE_BLOCK_SIZE = 20
+
+# Cache (giây) quyền vào phòng chat theo (user, phòng) khi mở WebSocket
+CHAT_MEMBERSHIP_CACHE_TIMEOUT = 300
+
+# Cache xác thực JWT + user cho HTTP và WebSocket (xem api/services/auth_cache.py)
+AUTH_CACHE_TTL = 60
+AUTH_CACHE_MAX_SIZE = 10000
+AUTH_CACHE_USE_SHARED = False
+
+# bcrypt (xem api/services/password_hashing.py): cost khi băm (hash cũ được băm lại khi đăng nhập),
+# số thread băm và số việc được chờ thêm trước khi trả 429
+PASSWORD_BCRYPT_ROUNDS = int(os.getenv('PASSWORD_BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', '32'))
+
+# Tìm kiếm task (xem api/services/task_search.py): 'auto' | 'mysql' (FULLTEXT) | 'memory' | 'icontains'
+TASK_SEARCH_BACKEND = os.getenv('TASK_SEARCH_BACKEND', 'auto')
+
+# Delta sync task (xem api/services/task_sync.py): chỉ trả thay đổi cũ hơn LAG giây (transaction
+# chưa commit), tombstone của task đã xóa được giữ RETENTION_DAYS ngày
+TASK_SYNC_LAG = 2
+TASK_TOMBSTONE_RETENTION_DAYS = 30
+
+# Ghi trễ tin nhắn chat (xem api/services/chat_messages.py): broadcast ngay, bulk_create theo lô
+CHAT_WRITE_BEHIND = os.getenv('CHAT_WRITE_BEHIND', 'False').lower() in ('1', 'true', 'yes')
+CHAT_WRITE_BEHIND_FLUSH_MS = 50
+CHAT_WRITE_BEHIND_BATCH_SIZE = 100
+
+# Sự kiện "đang gõ" (giây): nhắc lại tối đa 1 lần mỗi WINDOW, tự dừng sau TIMEOUT không nhận sự kiện
+CHAT_TYPING_WINDOW = 3
+CHAT_TYPING_TIMEOUT = 6
+
+# Hàng đợi gửi của mỗi WebSocket (số frame): quá HIGH_WATER bỏ typing, quá MAX hoặc
+# ở trên HIGH_WATER lâu hơn GRACE giây thì đóng kết nối của client chậm
+CHAT_SEND_QUEUE_HIGH_WATER = 100
+CHAT_SEND_QUEUE_MAX = 500
+CHAT_SLOW_CONSUMER_GRACE = 10
+
 # Channels configuration
 ASGI_APPLICATION = 'backend.asgi.application'
 
 # Channel layers for WebSocket
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
-}
-
+# - CHANNEL_LAYER_URL=redis://host:6379/0: dùng Redis để group_send tới mọi worker ASGI
+#   (cần pip install channels-redis). Khi test có thể trỏ tới server giả lập:
+#   python manage.py run_local_channel_server
+# - Không đặt: InMemoryChannelLayer, chỉ chạy được một worker cho /ws/chat/
+CHANNEL_LAYER_URL = os.getenv('CHANNEL_LAYER_URL')
+if CHANNEL_LAYER_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': os.getenv('CHANNEL_LAYER_BACKEND', 'channels_redis.pubsub.RedisPubSubChannelLayer'),
+            'CONFIG': {
+                'hosts': [CHANNEL_LAYER_URL],
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
 
 
-# Nạp file .env vào môi trường
-load_dotenv()
 
 # Truy cập các biến môi trường
 SENDGRID_API_KEY = os.getenv("SENDGRID_API_KEY")